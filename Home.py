@@ -1,7 +1,7 @@
 import streamlit as st
-import pandas as pd
-import os
-import subprocess 
+import hmac
+from model_bootstrap import get_bootstrap
+from user_store import get_user_store
 
 # --- Setup Page Config (MUST be at the very top, before any st. function in the body) ---
 # NOTE: This ensures Streamlit detects the multi-page structure from the start.
@@ -12,17 +12,10 @@ st.set_page_config(
     initial_sidebar_state="expanded" # Sidebar hamesha khula rahega
 )
 
-# --- RUN TRAINING SCRIPT FIRST (Self-healing fix) ---
-if not os.path.exists('type_classifier_model.pkl'):
-    try:
-        subprocess.run(["python", "_train_model.py"], check=True)
-        print("INFO: _train_model.py executed successfully to create missing files.")
-    except subprocess.CalledProcessError as e:
-        st.error(f"FATAL ERROR: Model training script failed to run. Error: {e}")
-        st.stop()
-    except FileNotFoundError:
-        st.error("FATAL ERROR: _train_model.py not found in the root directory.")
-        st.stop()
+# --- MODEL BOOTSTRAP (background) ---
+# Trains (if the model files are missing) and loads the model in a background thread (model_bootstrap.py)
+# -> the login page renders immediately; Agent Mode waits for the 'ready' state itself.
+bootstrap = get_bootstrap()
 # ---------------------------------------------------
 
 # --- Configuration & File Path ---
@@ -31,34 +24,18 @@ MANAGER_PASSWORD = "data_master"
 USER_FILE = "registered_users.csv"
 
 # --- Utility Functions ---
-def load_users():
-    if os.path.exists(USER_FILE):
-        return pd.read_csv(USER_FILE)
-    else:
-        # Create a blank DataFrame if file does not exist
-        df = pd.DataFrame(columns=['Username', 'Password'])
-        df.to_csv(USER_FILE, index=False)
-        return df
-
+# Agent accounts: indexed in memory, hashed passwords, append-only registration (see user_store.py)
 def register_user(username, password):
-    df = load_users()
-    if username in df['Username'].values:
-        return False 
-    
-    new_user = pd.DataFrame({'Username': [username], 'Password': [password]})
-    df = pd.concat([df, new_user], ignore_index=True)
-    df.to_csv(USER_FILE, index=False)
-    return True
+    return get_user_store(USER_FILE).register(username, password)
 
 def verify_user(username, password):
-    df = load_users()
     # Check Manager access first
-    if username == MANAGER_USERNAME and password == MANAGER_PASSWORD:
+    if hmac.compare_digest(username.encode(), MANAGER_USERNAME.encode()) and \
+            hmac.compare_digest(password.encode(), MANAGER_PASSWORD.encode()):
         return "Manager"
     
     # Check Registered User access
-    user_match = df[(df['Username'] == username) & (df['Password'] == password)]
-    if not user_match.empty:
+    if get_user_store(USER_FILE).verify(username, password):
         return "Agent"
     
     return None
@@ -68,6 +45,18 @@ def set_page_access(is_manager):
     st.session_state.is_manager = is_manager
     st.session_state.logged_in = True
 
+# Model readiness banner (nothing once the model is ready)
+def show_model_status():
+    status = bootstrap.status()
+    if status['state'] == 'training':
+        st.info(f"⏳ {status['message']} ({status['seconds']:.0f}s so far) You can log in now; "
+                "Agent Mode opens as soon as the model is ready.")
+    elif status['state'] == 'failed':
+        st.error(f"🚫 {status['message']}")
+        if st.button("🔁 Retry Model Setup", key="retry_bootstrap"):
+            bootstrap.start(retry=True)
+            st.rerun()
+
 # Function to display the Home/Login screen
 def show_login_page():
     
@@ -80,6 +69,7 @@ def show_login_page():
         
     st.title(":robot: AI-Powered Telecom Complaint Management")
     st.markdown("### Intelligent Resolution & Data Analytics Platform")
+    show_model_status()
     st.markdown("---")
     
     # ----------------- LOGIN / LOGOUT SECTION -----------------
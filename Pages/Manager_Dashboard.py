@@ -2,23 +2,18 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import os
+import hashlib
 from datetime import datetime
-
-# --- UTILITY FUNCTION (Sentiment Logic copied for display) ---
-def analyze_sentiment(text):
-    text = str(text).lower()
-    negative_words = ['slow', 'not working', 'disconnected', 'high bill', 'overcharged', 'rude', 'unhappy', 'worst', 'bad', 'angry', 'terrible', 'frustrated']
-    positive_words = ['solved', 'fixed', 'thank', 'great', 'happy', 'good', 'satisfied', 'resolved']
-    
-    neg_count = sum(text.count(word) for word in negative_words)
-    pos_count = sum(text.count(word) for word in positive_words)
-    
-    if neg_count > pos_count and neg_count >= 1:
-        return 'Negative'
-    elif pos_count > neg_count and pos_count >= 1:
-        return 'Positive'
-    else:
-        return 'Neutral'
+import math
+from dashboard_data import (DESK_PAGE_SIZE, count_desk_tickets, data_version, geo_drilldown, load_desk_page,
+                            load_kpi_rollups)
+from escalation_queue import EscalationQueue
+from live_aggregator import LiveAggregator
+from model_artifacts import RESOLUTION_MODEL_FILE, artifact_version
+from model_bootstrap import get_bootstrap
+from ticket_store import DB_FILE, get_store
+from ticket_search import MAX_HITS, SearchSyntaxError
+from write_queue import get_write_queue
 
 # --- SECURITY CHECK: Restrict Access (MUST BE AT THE VERY TOP) ---
 if 'logged_in' not in st.session_state or st.session_state.logged_in == False:
@@ -46,35 +41,106 @@ if st.session_state.is_manager == False:
 
 st.set_page_config(page_title="Manager Dashboard - Analytics", layout="wide")
 
+# A first-start training run (model_bootstrap.py) is still writing the seed data -> wait for it
+bootstrap = get_bootstrap()
+if bootstrap.training:
+    status = bootstrap.status()
+    st.info(f"⏳ {status['message']} ({status['seconds']:.0f}s so far) The dashboard opens once the complaint data is ready.")
+    if st.button("🔄 Check Again", type="primary"):
+        st.rerun()
+    st.stop()
+
 # --- UTILITY: Load & Save Data ---
 current_dir = os.path.dirname(__file__)
 parent_dir = os.path.join(current_dir, '..')
-DATA_PATH = os.path.join(parent_dir, 'processed_data_for_dashboard.csv')
-
-def load_data():
+DATA_PATH = os.path.join(parent_dir, 'processed_data_for_dashboard.csv') # Seed data for the store
+DB_PATH = os.path.join(parent_dir, DB_FILE)
+
+# One store object per server process (shared with Agent Mode)
+def get_ticket_store():
+    return get_store(DB_PATH, seed_csv=DATA_PATH)
+
+# Desk pages are fetched from the store one page at a time (filter/sort/limit in SQLite).
+# Cached per store version + view, so widget reruns don't re-query; a real write changes the version.
+@st.cache_data(max_entries=128)
+def load_desk_page_cached(version, status_group, complaint_type, sort, descending, page, search):
+    return load_desk_page(get_ticket_store(), status_group, complaint_type, sort, descending, page, search=search)
+
+@st.cache_data(max_entries=32)
+def count_desk_cached(version, status_group, complaint_type, search):
+    return count_desk_tickets(get_ticket_store(), status_group, complaint_type, search)
+
+# KPI counters come pre-aggregated from the store's rollup tables (a few hundred groups, not every row)
+@st.cache_resource(max_entries=2)
+def load_kpis_cached(version):
+    return load_kpi_rollups(get_ticket_store())
+
+# Drill-down tables (geo cube): small, so cache_data per (version, selection) is fine
+@st.cache_data(max_entries=64)
+def geo_table_cached(version, state, city, complaint_type):
+    return geo_drilldown(get_ticket_store(), state, city, complaint_type)
+
+# One live stream aggregator per server process: fed by every ticket this process writes
+# (store listener) and polls by row_id for tickets written elsewhere. Only the newest rows can
+# fall inside its 30-day window, so the first read is bounded.
+LIVE_LOOKBACK_ROWS = 50_000
+
+@st.cache_resource
+def get_live_aggregator():
+    aggregator = LiveAggregator()
+    store = get_ticket_store()
+    store.add_listener(aggregator.observe)
+    aggregator.catch_up(store, lookback_rows=LIVE_LOOKBACK_ROWS)
+    return aggregator
+
+# Resolution model for the backlog scoring stage (resolution_scores.py); loaded on first use only
+@st.cache_resource(max_entries=1)
+def get_resolution_scorer(model_version):
+    from resolution_scores import ResolutionScorer
+    return ResolutionScorer()
+
+@st.cache_data(max_entries=8)
+def count_unscored_cached(version):
+    return get_ticket_store().count_unscored()
+
+# Near-duplicate incidents (small summary query over ticket_incidents)
+@st.cache_data(max_entries=8)
+def incidents_cached(version):
+    return get_ticket_store().incident_summary(limit=20)
+
+# Escalation queue (heap over the store's escalations table), one per server process
+@st.cache_resource
+def get_escalation_queue():
+    return EscalationQueue(get_ticket_store())
+
+def load_kpis():
     try:
-        df = pd.read_csv(DATA_PATH)
-        # Convert date column for time-series analysis
-        # Using 'Date' column (dd-mm-yyyy) for parsing to avoid issues
-        df['Date_parsed'] = pd.to_datetime(df['Date'], format='%d-%m-%Y', errors='coerce')
-        
-        # Add Sentiment Column if not exists
-        if 'Customer_Sentiment' not in df.columns:
-             df['Customer_Sentiment'] = df['Customer_Complaint'].apply(analyze_sentiment)
-             
-        return df
-    except FileNotFoundError:
-        st.error("Processed Data file not found. Please ensure you have run the '_train_model.py' script successfully to create it.")
+        return load_kpis_cached(data_version(get_ticket_store()))
+    except Exception as e:
+        st.error(f"Dashboard counters could not be loaded. Please ensure you have run the '_train_model.py' script successfully, or try 'python ticket_store.py rebuild-rollups'. Error: {e}")
         st.stop()
 
-def save_data(df):
-    # Remove temporary columns before saving
-    cols_to_drop = ['Date_parsed', 'Customer_Sentiment'] 
-    df_to_save = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
-    df_to_save.to_csv(DATA_PATH, index=False)
-
-# Load Initial Data
-df = load_data()
+def save_data(status_changes):
+    # Delta save: only the edited tickets are updated (by row_id), each with an audit record.
+    # Goes through the single writer (group commit) like Agent Mode's inserts.
+    return get_write_queue(get_ticket_store()).update_status_groups(status_changes, changed_by=st.session_state.get('username'))
+
+def editor_status_changes(editor_key, shown_df):
+    # st.data_editor keeps {row position: {column: new value}} for the cells the user touched
+    # (positions are safe to resolve here: editor_key is tied to the row_ids of shown_df)
+    edited_rows = st.session_state.get(editor_key, {}).get('edited_rows', {})
+    changes = {}
+    for position, edits in edited_rows.items():
+        if 'Status_Group' in edits:
+            row = shown_df.iloc[int(position)]
+            if edits['Status_Group'] != row['Status_Group']:
+                changes[int(row['row_id'])] = edits['Status_Group']
+    return changes
+
+# Load Initial Data (pre-aggregated counters only; ticket rows are paged in by the desk)
+kpis = load_kpis()
+live = get_live_aggregator()
+live.catch_up(get_ticket_store())  # Indexed row_id > last seen read, usually empty
 
 
 # --- SIDEBAR (Aesthetic) ---
@@ -102,22 +168,30 @@ st.markdown("---")
 st.subheader("📅 Today's Live Status")
 
 today_date = pd.to_datetime('today').normalize()
-# Filter data for today based on parsed date
-if 'Date_parsed' in df.columns:
-    df_today = df[df['Date_parsed'] == today_date]
-else:
-    df_today = df # Fallback
+# Arrivals come from the live aggregator (sliding windows), status split from the daily rollup
+live_summary = live.summary()
+daily_counts = kpis['daily']
+today_counts = daily_counts[daily_counts['day'] == today_date].groupby('status_group')['n'].sum()
 
-total_today = len(df_today)
-solved_today = len(df_today[df_today['Status_Group'] == 'Resolved'])
-pending_today = len(df_today[df_today['Status_Group'] == 'Unresolved'])
+total_today = live_summary['today']
+solved_today = int(today_counts.get('Resolved', 0))
+pending_today = int(today_counts.get('Unresolved', 0))
 
 # Metric Cards Container
 with st.container(border=True):
-    t_col1, t_col2, t_col3 = st.columns(3)
+    t_col1, t_col2, t_col3, t_col4 = st.columns(4)
     t_col1.metric("📢 Complaints Received Today", total_today, delta="Live Count")
     t_col2.metric("✅ Solved Today", solved_today, delta_color="normal")
     t_col3.metric("⏳ Pending Today", pending_today, delta_color="inverse")
+    t_col4.metric("⚡ Last 60 Minutes", live_summary['last_hour'], delta=f"{live_summary['this_minute']} this minute")
+
+# Surge alerts: a (category, state) hour well above its own last-24h baseline
+for alert in live.recent_alerts():
+    st.error(f"🚨 Spike detected: {alert['count']} '{alert['complaint_type']}' complaints from "
+             f"{alert['state']} in the hour of {alert['hour']} (baseline {alert['baseline']}/hr).")
+busiest = live.top_keys('hours', n=3)
+if busiest:
+    st.caption("Busiest in the last 48h: " + ", ".join(f"{t} / {s} ({n})" for (t, s), n in busiest))
 
 st.markdown("---")
 
@@ -127,9 +201,11 @@ st.markdown("---")
 st.header("📈 Overall Performance Analytics")
 
 # --- KPIs ---
-total_complaints = len(df)
-resolved_count = len(df[df['Status_Group'] == 'Resolved'])
-unresolved_count = len(df[df['Status_Group'] == 'Unresolved'])
+status_counts = kpis['status'].rename(columns={'status_group': 'Status_Group', 'n': 'Count'})
+status_totals = status_counts.set_index('Status_Group')['Count']
+total_complaints = int(status_totals.sum())
+resolved_count = int(status_totals.get('Resolved', 0))
+unresolved_count = int(status_totals.get('Unresolved', 0))
 resolution_rate = (resolved_count / total_complaints) * 100 if total_complaints > 0 else 0
 
 with st.container(border=True):
@@ -148,13 +224,12 @@ st.header("Deep Dive Analytics")
 chart_col1, chart_col2 = st.columns([1, 1])
 
 # Graph 1: Resolution Status Distribution (Donut Chart)
-status_fig = px.pie(df, names='Status_Group', title='Complaint Resolution Status', hole=0.5,
+status_fig = px.pie(status_counts, names='Status_Group', values='Count', title='Complaint Resolution Status', hole=0.5,
                     color_discrete_map={'Resolved':'#2ECC71', 'Unresolved':'#E74C3C'}, 
                     template="plotly_dark") 
 
 # Graph 2: Top Complaint Types (Bar Chart)
-type_counts = df['Complaint_Type'].value_counts().reset_index()
-type_counts.columns = ['Complaint Type', 'Count']
+type_counts = kpis['type'].rename(columns={'complaint_type': 'Complaint Type', 'n': 'Count'})
 type_fig = px.bar(type_counts, x='Complaint Type', y='Count', 
                   title='Distribution of Complaint Categories', 
                   color='Count', color_continuous_scale=px.colors.sequential.Plasma,
@@ -170,8 +245,8 @@ with chart_col2:
 geo_col, time_col = st.columns(2)
 
 with geo_col:
-    state_counts = df['State'].value_counts().reset_index()
-    state_counts.columns = ['State', 'Total Complaints']
+    state_counts = kpis['state'].rename(columns={'state': 'State', 'n': 'Total Complaints'})
+    state_counts = state_counts[state_counts['State'] != '']  # '' = no state on the ticket
     state_fig = px.bar(state_counts.nlargest(10, 'Total Complaints'), x='State', y='Total Complaints',
                        title='Top 10 States by Complaint Volume',
                        color='Total Complaints', color_continuous_scale=px.colors.sequential.Teal,
@@ -179,47 +254,227 @@ with geo_col:
     st.plotly_chart(state_fig, use_container_width=True)
 
 with time_col:
-    # Ensure Date_month_year is datetime for sorting
-    df['Date_month_year_dt'] = pd.to_datetime(df['Date_month_year'], format='%d-%b-%y', errors='coerce')
-    time_counts = df.set_index('Date_month_year_dt').resample('M').size().reset_index(name='Count')
+    # Daily rollup counts summed per month
+    time_counts = (daily_counts.groupby('day')['n'].sum().resample('ME').sum()
+                   .rename_axis('Date_month_year_dt').reset_index(name='Count'))
     time_fig = px.line(time_counts, x='Date_month_year_dt', y='Count', 
                        title='Monthly Trend of Total Complaints',
                        markers=True,
                        template="plotly_dark")
     st.plotly_chart(time_fig, use_container_width=True)
 
+# Row 3: Geographic Drill-Down (State -> City -> Zip)
+st.subheader("🗺️ Geographic Drill-Down")
+drill_col1, drill_col2, drill_col3 = st.columns(3)
+all_states = state_counts['State'].tolist()  # Already sorted by volume
+drill_state = drill_col1.selectbox("State", ["All States"] + all_states, key="drill_state")
+drill_state = None if drill_state == "All States" else drill_state
+
+drill_city = None
+if drill_state:
+    state_cities = geo_table_cached(data_version(get_ticket_store()), drill_state, None, None)['city'].tolist()
+    drill_city = drill_col2.selectbox("City", ["All Cities"] + state_cities, key="drill_city")
+    drill_city = None if drill_city == "All Cities" else drill_city
+
+drill_type = drill_col3.selectbox("Category", ["All Categories"] + type_counts['Complaint Type'].tolist(), key="drill_type")
+drill_type = None if drill_type == "All Categories" else drill_type
+
+geo_table = geo_table_cached(data_version(get_ticket_store()), drill_state, drill_city, drill_type)
+level_col = geo_table.columns[0]
+level_name = {'state': 'State', 'city': 'City', 'zip_code': 'Zip Code'}[level_col]
+geo_fig = px.bar(geo_table.head(15), x=level_col, y='Total', color='Resolution_Rate',
+                 title=f"Complaints by {level_name}" + (f" in {drill_city or drill_state}" if drill_state else ""),
+                 labels={level_col: level_name, 'Resolution_Rate': 'Resolution %'},
+                 color_continuous_scale=px.colors.sequential.RdBu, range_color=[0, 100],
+                 template="plotly_dark")
+geo_fig.update_xaxes(type='category')  # Zip codes are labels, not numbers
+st.plotly_chart(geo_fig, use_container_width=True)
+st.dataframe(geo_table.rename(columns={level_col: level_name, 'Resolution_Rate': 'Resolution Rate (%)'}),
+             hide_index=True, use_container_width=True)
+
 st.markdown("---") 
 
 # -----------------------------------------------------------
-# 3. INTERACTIVE COMPLAINT MANAGEMENT (Data Editor)
+# 3. ESCALATION QUEUE (Next Ticket)
 # -----------------------------------------------------------
-st.header("📝 Complaint Management Desk")
-st.info("Filter, Review, and Resolve complaints directly here. Changes are saved to the database.")
+st.header("🎯 Next Ticket to Work")
+escalation_queue = get_escalation_queue()
+queue_items = escalation_queue.peek(6)  # Top of the heap: priority -> category -> oldest first
 
-# Filter Options
-filter_status = st.radio("Filter View:", ["All", "Unresolved Only", "Resolved Only"], horizontal=True)
+if not queue_items:
+    st.success("🎉 Escalation queue is empty. No open tickets waiting.")
+else:
+    queue_tickets = get_ticket_store().get_tickets([item['row_id'] for item in queue_items],
+                                                   ['row_id', 'Ticket_#', 'Customer_Complaint', 'State'])
+    next_item, next_ticket = queue_items[0], queue_tickets.iloc[0]
+    priority_badge = {'HIGH': "🔴 HIGH", 'MEDIUM': "🟡 MEDIUM"}
+
+    with st.container(border=True):
+        q_col1, q_col2, q_col3, q_col4 = st.columns(4)
+        q_col1.metric("Ticket ID", next_ticket['Ticket_#'])
+        q_col2.metric("Priority", priority_badge.get(next_item['priority'], next_item['priority']))
+        q_col3.metric("Category", next_item['complaint_type'])
+        q_col4.metric("Open Tickets in Queue", unresolved_count)  # = Unresolved, from the KPI rollup (no COUNT(*))
+        st.markdown(f"**Complaint:** {next_ticket['Customer_Complaint']}")
+        st.caption(f"Waiting since {next_item['queued_at']} · State: {next_ticket['State']}")
+
+        a_col1, a_col2, _ = st.columns([1, 1, 2])
+        if a_col1.button("✅ Resolve & Next", key="queue_resolve", type="primary", use_container_width=True):
+            save_data({next_item['row_id']: 'Resolved'})  # Same delta save + audit as the desk
+            st.rerun()
+        toggle_to = 'MEDIUM' if next_item['priority'] == 'HIGH' else 'HIGH'
+        if a_col2.button(f"↕️ Set priority {toggle_to}", key="queue_reprioritize", use_container_width=True):
+            escalation_queue.reprioritize(next_item['row_id'], toggle_to)
+            st.rerun()
+
+    up_next = queue_tickets.iloc[1:][['Ticket_#', 'Customer_Complaint']].assign(
+        Priority=[priority_badge.get(i['priority'], i['priority']) for i in queue_items[1:]],
+        Category=[i['complaint_type'] for i in queue_items[1:]],
+        Waiting_Since=[i['queued_at'] for i in queue_items[1:]])
+    if len(up_next):
+        st.markdown("**Up next:**")
+        st.dataframe(up_next, hide_index=True, use_container_width=True)
 
-# Filtering Logic
-if filter_status == "Unresolved Only":
-    filtered_df = df[df['Status_Group'] == 'Unresolved']
-elif filter_status == "Resolved Only":
-    filtered_df = df[df['Status_Group'] == 'Resolved']
+st.markdown("---")
+
+# -----------------------------------------------------------
+# 4. DUPLICATE INCIDENTS (near-duplicate tickets grouped at ingestion)
+# -----------------------------------------------------------
+st.header("🧩 Duplicate Incidents")
+incidents = incidents_cached(data_version(get_ticket_store()))
+incident_window = f"{get_ticket_store().incidents.window_hours:g} hours"
+
+if incidents.empty:
+    st.info(f"No near-duplicate complaints linked yet (same text, same zip code, within {incident_window}).")
 else:
-    filtered_df = df
+    st.caption(f"Near-identical complaints from the same zip code within {incident_window} are linked into one incident "
+               "at filing time (tickets without a zip code are never linked).")
+    st.dataframe(
+        incidents[['Ticket_#', 'Customer_Complaint', 'City', 'Zip_code', 'tickets', 'open_tickets']],
+        column_config={
+            'Ticket_#': 'First Ticket',
+            'Customer_Complaint': st.column_config.TextColumn('Complaint', width='large'),
+            'Zip_code': 'Zip Code',
+            'tickets': 'Tickets',
+            'open_tickets': 'Open',
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+    open_incidents = incidents[incidents['open_tickets'] > 0]
+    if len(open_incidents):
+        i_col1, i_col2 = st.columns([3, 1])
+        labels = {f"#{r['Ticket_#']} · {r['Customer_Complaint'][:60]} ({r['open_tickets']} open)": r['incident_id']
+                  for _, r in open_incidents.iterrows()}
+        chosen = i_col1.selectbox("Incident", list(labels), key="incident_pick", label_visibility="collapsed")
+        if i_col2.button("✅ Resolve whole incident", key="incident_resolve", use_container_width=True):
+            members = get_ticket_store().incident_members(labels[chosen], status_group='Unresolved')
+            save_data({row_id: 'Resolved' for row_id in members})  # One delta save, audited per ticket
+            st.rerun()
 
-# Columns to show in editor
-# Adding 'Customer_Sentiment' so manager can see mood
-edit_cols = ['Ticket_#', 'Date', 'Customer_Complaint', 'Customer_Sentiment', 'Complaint_Type', 'Status_Group']
+st.markdown("---")
+
+# -----------------------------------------------------------
+# 5. INTERACTIVE COMPLAINT MANAGEMENT (Data Editor)
+# -----------------------------------------------------------
+st.header("📝 Complaint Management Desk")
+st.info("Filter, Review, and Resolve complaints directly here. Changes are saved to the database.")
+
+# Search (full-text index over complaint text, ticket ID, city and state -> see ticket_search.py)
+search_text = st.text_input(
+    "🔍 Search complaints", key="desk_search",
+    placeholder='e.g.  data cap  ·  "data cap" city:atlanta  ·  billing OR charges  ·  comcast NOT xfinity  ·  ticket:250635'
+).strip()
+
+# Filter Options
+SORT_OPTIONS = {"Newest first": ('date', True), "Oldest first": ('date', False),
+                "Ticket ID (high → low)": ('ticket', True), "Ticket ID (low → high)": ('ticket', False),
+                "Most likely to resolve": ('resolution', True), "Least likely to resolve": ('resolution', False)}
+if search_text:
+    SORT_OPTIONS = {"Best match": ('relevance', False), **SORT_OPTIONS}
+# A new search starts on "Best match"; clearing it goes back to the default sort
+if st.session_state.get('desk_last_search', '') != search_text:
+    st.session_state.desk_last_search = search_text
+    st.session_state.desk_sort = list(SORT_OPTIONS)[0]
+desk_col1, desk_col2, desk_col3 = st.columns([2, 1, 1])
+filter_status = desk_col1.radio("Filter View:", ["All", "Unresolved Only", "Resolved Only"], horizontal=True)
+filter_type = desk_col2.selectbox("Category", ["All Categories"] + type_counts['Complaint Type'].tolist(), key="desk_type")
+sort_label = desk_col3.selectbox("Sort", list(SORT_OPTIONS), key="desk_sort")
+
+status_group = {"Unresolved Only": 'Unresolved', "Resolved Only": 'Resolved'}.get(filter_status)
+complaint_type = None if filter_type == "All Categories" else filter_type
+sort_key, descending = SORT_OPTIONS[sort_label]
+
+# A different view starts again at page 1
+desk_view = (status_group, complaint_type, sort_key, descending, search_text)
+if st.session_state.get('desk_view') != desk_view:
+    st.session_state.desk_view = desk_view
+    st.session_state.desk_page = 1
+
+version = data_version(get_ticket_store())
+try:
+    desk_total = count_desk_cached(version, status_group, complaint_type, search_text)
+except SearchSyntaxError as e:
+    st.warning(f"⚠️ {e}")
+    st.stop()
+total_label = f"{desk_total:,}"
+if search_text and desk_total > MAX_HITS:
+    # A search covers its newest MAX_HITS matches (keeps every search fast at any store size)
+    desk_total, total_label = MAX_HITS, f"{MAX_HITS:,}+"
+    st.caption(f"More than {MAX_HITS:,} tickets match: showing the newest {MAX_HITS:,}. Add words or a filter to narrow the search.")
+n_pages = max(1, math.ceil(desk_total / DESK_PAGE_SIZE))
+st.session_state.desk_page = min(st.session_state.get('desk_page', 1), n_pages)
+page = st.number_input(f"Page (of {n_pages:,} · {total_label} tickets)", min_value=1, max_value=n_pages, key="desk_page")
+
+# Backlog scores are written by the scoring stage, never computed while the page renders;
+# tickets filed since its last run can be scored from here
+unscored = count_unscored_cached(version)
+if unscored:
+    s_col1, s_col2 = st.columns([3, 1])
+    s_col1.caption(f"🧮 {unscored:,} open ticket(s) have no resolution score yet (shown last when sorting by it).")
+    if s_col2.button("🧮 Score new tickets", key="score_backlog", use_container_width=True):
+        from resolution_scores import score_backlog
+        with st.spinner("Scoring open tickets..."):
+            report = score_backlog(get_ticket_store(), get_resolution_scorer(artifact_version(RESOLUTION_MODEL_FILE)))
+        st.session_state.score_report = report
+        st.rerun()
+if st.session_state.get('score_report'):
+    report = st.session_state.pop('score_report')
+    st.success(f"✅ Scored {report['scored']:,} open tickets in {report['seconds']:.2f}s "
+               f"({report['tickets_per_s']:,.0f} tickets/sec).")
+
+# Only this page of tickets is fetched and sent to the browser
+# ('Customer_Sentiment' so manager can see mood)
+shown_df = load_desk_page_cached(version, status_group, complaint_type, sort_key, descending, page, search_text)
+
+# New key after every save (and per page) -> the editor starts clean on the refreshed data.
+# The editor remembers edits by ROW POSITION, so the key also pins the exact tickets shown: if new
+# tickets shift this page between an edit and Save, the editor starts clean instead of applying the
+# edit to whichever ticket now sits at that position (other store writes keep the edits).
+if 'editor_generation' not in st.session_state: st.session_state.editor_generation = 0
+editor_base = f"complaint_editor_{st.session_state.editor_generation}_{'_'.join(map(str, desk_view))}_{page}"
+page_row_ids = hashlib.sha1(','.join(map(str, shown_df['row_id'].tolist())).encode()).hexdigest()[:12]
+editor_key = f"{editor_base}_{page_row_ids}"
+last_base, last_key = st.session_state.get('desk_editor', (None, None))
+if last_base == editor_base and last_key != editor_key and st.session_state.get(last_key, {}).get('edited_rows'):
+    st.warning("⚠️ New tickets arrived and shifted this page before your changes were saved. "
+               "Unsaved status changes were cleared (no ticket was changed); please re-apply them.")
+st.session_state.desk_editor = (editor_base, editor_key)
 
 # DATA EDITOR WIDGET
 edited_df = st.data_editor(
-    filtered_df[edit_cols].sort_values(by='Date', ascending=False), # Show latest first (approx)
+    shown_df,
     column_config={
+        "row_id": None, # Hidden: store key for delta saves
         "Ticket_#": st.column_config.TextColumn("Ticket ID", disabled=True),
         "Date": st.column_config.TextColumn("Date", disabled=True),
         "Customer_Complaint": st.column_config.TextColumn("Complaint Details", width="large", disabled=True),
         "Customer_Sentiment": st.column_config.TextColumn("Mood", width="small", disabled=True),
         "Complaint_Type": st.column_config.TextColumn("Category", disabled=True),
+        "resolution_score": st.column_config.ProgressColumn(
+            "Resolve Chance", min_value=0.0, max_value=1.0, format="percent",
+            help="Predicted probability of resolution (resolution model, open tickets only)."
+        ),
         "Status_Group": st.column_config.SelectboxColumn(
             "Resolution Status",
             options=["Resolved", "Unresolved"],
@@ -230,30 +485,23 @@ edited_df = st.data_editor(
     hide_index=True,
     num_rows="fixed",
     use_container_width=True,
-    key="complaint_editor"
+    key=editor_key
 )
 
 # SAVE BUTTON
 if st.button("💾 Save Status Updates", type="primary"):
     try:
-        # 1. Create a map of Ticket ID to NEW Status from the edited table
-        status_map = dict(zip(edited_df['Ticket_#'].astype(str), edited_df['Status_Group']))
-        
-        # 2. Update the ORIGINAL dataframe using this map
-        df['Ticket_#'] = df['Ticket_#'].astype(str)
-        df['Status_Group'] = df['Ticket_#'].map(status_map).fillna(df['Status_Group'])
-        
-        # 3. Update the detailed 'Status' column too for consistency
-        df.loc[df['Status_Group'] == 'Resolved', 'Status'] = 'Solved'
-        df.loc[df['Status_Group'] == 'Unresolved', 'Status'] = 'Open'
+        # 1. Only the cells the manager actually changed (from the editor's edit state)
+        status_changes = editor_status_changes(editor_key, shown_df)
         
-        # 4. Save back to CSV
-        save_data(df)
+        # 2. Persist just those tickets (Status follows Status_Group: Solved / Open)
+        changed_count = save_data(status_changes)
+        st.session_state.editor_generation += 1
         
-        st.success("✅ Database Updated Successfully! Dashboard will refresh.")
+        st.success(f"✅ Database Updated Successfully! {changed_count} ticket(s) changed. Dashboard will refresh.")
         st.rerun()
         
     except Exception as e:
         st.error(f"Error saving data: {e}")
 
-st.caption("Instructions: Double click on 'Resolution Status' cell to change it from Unresolved to Resolved.")
\ No newline at end of file
+st.caption("Instructions: Double click on 'Resolution Status' cell to change it from Unresolved to Resolved. Save before moving to another page.")
\ No newline at end of file
@@ -1,8 +1,14 @@
 import streamlit as st
-import joblib
-import re
 import pandas as pd
 import os
+from featurize import clean_text # Shared with _train_model.py (same cleaning at train & serve time)
+from model_artifacts import MODEL_FILE, artifact_version
+from model_bootstrap import get_bootstrap
+from prediction_cache import PredictionCache
+from ticket_store import DB_FILE, get_store
+from write_queue import get_write_queue
+from sentiment import SENTIMENT_EMOJI, analyze_sentiment # Shared compiled lexicon engine
+from similar_complaints import SimilarComplaints
 
 # --- SECURITY CHECK: Restrict Access (MUST BE AT THE VERY TOP) ---
 if 'logged_in' not in st.session_state or st.session_state.logged_in == False:
@@ -22,59 +28,91 @@ if 'logged_in' not in st.session_state or st.session_state.logged_in == False:
 
 st.set_page_config(page_title="Agent Mode - Smart Resolution", layout="wide") # Actual page config runs only if secured
 
-# --- Utility Functions (Same) ---
-def analyze_sentiment(text):
-    text = text.lower()
-    negative_words = ['slow', 'not working', 'disconnected', 'high bill', 'overcharged', 'rude', 'unhappy', 'worst', 'bad', 'angry', 'terrible', 'frustrated']
-    positive_words = ['solved', 'fixed', 'thank', 'great', 'happy', 'good', 'satisfied', 'resolved']
-    
-    neg_count = sum(text.count(word) for word in negative_words)
-    pos_count = sum(text.count(word) for word in positive_words)
-    
-    if neg_count > pos_count and neg_count >= 1:
-        return 'Negative', '😡'
-    elif pos_count > neg_count and pos_count >= 1:
-        return 'Positive', '😊'
-    else:
-        return 'Neutral', '😐'
+# --- Model Readiness ---
+# The model is trained (first start) / loaded in the background by model_bootstrap.py; this page
+# waits a few seconds for a load, and explains a training run instead of blocking on it.
+MODEL_LOAD_WAIT = 15  # seconds
 
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text) 
-    return text
+bootstrap = get_bootstrap()
+if bootstrap.state == 'loading':
+    with st.spinner("Loading the AI model..."):
+        bootstrap.wait(MODEL_LOAD_WAIT)
+if not bootstrap.ready:
+    status = bootstrap.status()
+    if status['state'] == 'failed':
+        st.error(f"🚫 {status['message']} Retry from the Home page, or run _train_model.py manually.")
+    else:
+        st.info(f"⏳ {status['message']} ({status['seconds']:.0f}s so far) Agent Mode opens as soon as it is ready.")
+        if st.button("🔄 Check Again", type="primary"):
+            st.rerun()
+    st.stop()
 
 # --- Data and Model Loading ---
-@st.cache_data
+# Models are keyed on the artifact version (mtime/size) -> a retrain or _update_model.py run
+# is picked up on the next Analyze click without restarting the server. The copy the bootstrap
+# loaded at startup is reused (joblib/sklearn are only imported there).
+def load_models(model_version):
+    return bootstrap.load_models(model_version)
+
+# One LRU for ALL agent sessions in this server process (repeat complaints skip the model)
+@st.cache_resource
+def get_prediction_cache():
+    return PredictionCache(maxsize=10_000)
+
+current_dir = os.path.dirname(__file__)
+parent_dir = os.path.join(current_dir, '..')
+data_path_global = os.path.join(parent_dir, 'processed_data_for_dashboard.csv') # Seed data for the store
+
+# New tickets are appended to the shared ticket store (O(1) per ticket, no full-file rewrite)
+# (one store object per server process, shared with the Manager Dashboard)
+def get_ticket_store():
+    return get_store(os.path.join(parent_dir, DB_FILE), seed_csv=data_path_global)
+
 def load_data_and_models():
     try:
-        model = joblib.load('type_classifier_model.pkl')
-        vectorizer = joblib.load('tfidf_type_vectorizer.pkl')
-        
-        current_dir = os.path.dirname(__file__)
-        parent_dir = os.path.join(current_dir, '..')
-        data_path = os.path.join(parent_dir, 'processed_data_for_dashboard.csv')
-        df = pd.read_csv(data_path)
-        return model, vectorizer, df, data_path
+        load_models(artifact_version(MODEL_FILE))
+        return get_ticket_store()
     except Exception as e:
         st.error(f"Error loading files. Please run _train_model.py first. Error: {e}")
         st.stop()
         
-model, vectorizer, df_global, data_path_global = load_data_and_models()
+ticket_store = load_data_and_models()
+prediction_cache = get_prediction_cache()
+
+# Nearest-neighbour index over the historical tickets' TF-IDF vectors (persisted in the ticket store,
+# catches up on new tickets by itself). Rebuilt only when the vectorizer itself changes.
+SIMILAR_K = 5
+
+@st.cache_resource(max_entries=1)
+def get_similar_index(model_version):
+    _, vectorizer = load_models(model_version)
+    return SimilarComplaints(ticket_store, vectorizer)
+
+def find_similar_tickets(complaint_text):
+    try:
+        return get_similar_index(artifact_version(MODEL_FILE)).similar_tickets(complaint_text, SIMILAR_K)
+    except Exception as e:
+        print(f"WARNING: Similar complaint lookup failed. Error: {e}")
+        return None
+
+def predict_complaint_type(complaint_text):
+    cleaned_input = clean_text(complaint_text)
+    model_version = artifact_version(MODEL_FILE)
+
+    def _predict():
+        model, vectorizer = load_models(model_version)
+        input_vectorized = vectorizer.transform([cleaned_input])
+        return model.predict(input_vectorized)[0]
+
+    return prediction_cache.get_or_compute(cleaned_input, _predict, model_version)
 
 # --- Data Update Function (Same) ---
-def update_dashboard_data(df, new_status):
-    if 'Ticket_#' in df.columns:
-        max_ticket_num = pd.to_numeric(df['Ticket_#'], errors='coerce').max()
-        new_ticket = int(max_ticket_num) + 1 if pd.notna(max_ticket_num) else len(df) + 1000
-        new_ticket_str = str(new_ticket)
-    else:
-        new_ticket_str = str(len(df) + 1000)
-    
+def update_dashboard_data(store, new_status):
     new_row = {
         'Customer_Complaint': st.session_state.current_complaint,
         'Complaint_Type': st.session_state.prediction,
         'Status_Group': new_status,
-        'Ticket_#': new_ticket_str, 
+        'Ticket_#': None, # Allocated by the store inside the insert transaction
         'Date': pd.to_datetime('today').strftime('%d-%m-%Y'),
         'Date_month_year': pd.to_datetime('today').strftime('%d-%b-%y'),
         'Time': pd.to_datetime('now').strftime('%I:%M:%S %p'),
@@ -87,8 +125,9 @@ def update_dashboard_data(df, new_status):
         'Cleaned_Complaint': clean_text(st.session_state.current_complaint)
     }
     
-    df_global.loc[len(df_global)] = new_row
-    df_global.to_csv(data_path_global, index=False, encoding='utf-8')
+    # Through the process's single writer: grouped with other agents' writes into one commit,
+    # returns once the ticket is durably stored
+    return get_write_queue(store).insert_ticket(new_row)
 
 # --- UI Setup ---
 st.markdown("# 👤 Agent Mode: Smart Complaint Resolution System")
@@ -100,6 +139,7 @@ if 'current_complaint' not in st.session_state: st.session_state.current_complai
 if 'show_escalation_form' not in st.session_state: st.session_state.show_escalation_form = False
 if 'show_submission_page' not in st.session_state: st.session_state.show_submission_page = False
 if 'last_action_status' not in st.session_state: st.session_state.last_action_status = ""
+if 'last_ticket' not in st.session_state: st.session_state.last_ticket = None
 
 
 # ----------------- FINAL SUBMISSION PAGE (TOP SECTION) -----------------
@@ -129,6 +169,13 @@ if st.session_state.show_submission_page:
                 <p style='color: #888;'>*Agent Note: Manager dashboard has been updated.*</p>
             </div>
             """, unsafe_allow_html=True)
+
+    # Linked at filing time to a near-identical recent complaint (near_duplicates.py)
+    last_ticket = st.session_state.last_ticket or {}
+    if last_ticket.get('Incident_ID') is not None:
+        st.info(f"🧩 Ticket #{last_ticket['Ticket_#']} matches a complaint filed in the last "
+                f"{ticket_store.incidents.window_hours:g} hours "
+                f"({last_ticket['Incident_Similarity']:.0%} similar) and was grouped into its incident on the Manager Dashboard.")
             
     st.markdown("---")
     if st.button("➕ Start New Complaint Analysis", key='new_comp_btn', type="primary"):
@@ -150,16 +197,16 @@ if not st.session_state.analysis_done: # Only show input area if analysis hasn't
     if st.button("Analyze Complaint & Suggest Tier 1 Action", key='analyze_btn', type="primary"):
         if complaint_text:
             # Analysis Logic
-            cleaned_input = clean_text(complaint_text)
-            input_vectorized = vectorizer.transform([cleaned_input])
-            prediction = model.predict(input_vectorized)[0]
-            sentiment, emoji = analyze_sentiment(complaint_text)
+            prediction = predict_complaint_type(complaint_text) # Cached on cleaned text
+            sentiment = analyze_sentiment(complaint_text)
+            emoji = SENTIMENT_EMOJI[sentiment]
             
             st.session_state.prediction = prediction
             st.session_state.sentiment = sentiment
             st.session_state.sentiment_emoji = emoji
             st.session_state.analysis_done = True
             st.session_state.current_complaint = complaint_text
+            st.session_state.similar_tickets = find_similar_tickets(complaint_text)
             st.session_state.show_escalation_form = False
             
             st.rerun() 
@@ -217,6 +264,26 @@ if st.session_state.analysis_done:
         st.success(f"**AI Action Plan:** {suggestion_text}")
         st.info(f"**Agent's Suggested Response:** _{agent_line}_")
 
+    # --- SIMILAR PAST COMPLAINTS (what happened to tickets like this one) ---
+    similar_df = st.session_state.get('similar_tickets')
+    if similar_df is not None and not similar_df.empty:
+        st.subheader("3. Similar Past Complaints")
+        with st.container(border=True):
+            resolved = int((similar_df['Status_Group'] == 'Resolved').sum())
+            st.markdown(f"**{resolved} of {len(similar_df)}** most similar past tickets were resolved.")
+            st.dataframe(
+                similar_df[['Ticket_#', 'Date', 'Customer_Complaint', 'Complaint_Type', 'Status', 'Status_Group', 'Similarity']],
+                column_config={
+                    'Ticket_#': 'Ticket ID',
+                    'Customer_Complaint': st.column_config.TextColumn('Complaint', width='large'),
+                    'Complaint_Type': 'Category',
+                    'Status_Group': 'Outcome',
+                    'Similarity': st.column_config.ProgressColumn('Similarity', min_value=0.0, max_value=1.0, format='%.2f'),
+                },
+                hide_index=True,
+                use_container_width=True,
+            )
+
 
     # ----------------- FINAL ACTION BUTTONS & ESCALATION (BOTTOM ROW) -----------------
     st.markdown("#### Agent Action Confirmation:")
@@ -228,7 +295,7 @@ if st.session_state.analysis_done:
         with col_res:
             if st.button("✅ Solved & Closed (Tier 1)", key='solved_btn', type="primary", use_container_width=True):
                 # Solved Logic
-                update_dashboard_data(df_global, 'Resolved')
+                st.session_state.last_ticket = update_dashboard_data(ticket_store, 'Resolved')
                 
                 st.session_state.last_action_status = "Resolved"
                 st.session_state.show_submission_page = True 
@@ -260,7 +327,7 @@ if st.session_state.show_escalation_form:
                     st.error("Please fill in all required contact details.")
                 else:
                     # Escalation Submission Logic
-                    update_dashboard_data(df_global, 'Unresolved') # Log as Unresolved for now
+                    st.session_state.last_ticket = update_dashboard_data(ticket_store, 'Unresolved') # Log as Unresolved for now
                     
                     st.session_state.last_action_status = "Unresolved"
                     st.session_state.show_submission_page = True
@@ -268,4 +335,7 @@ if st.session_state.show_escalation_form:
 
 
 st.markdown("---")
+cache_stats = prediction_cache.stats()
+st.caption(f"Prediction cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+           f"({cache_stats['hit_rate']:.0%} hit rate, {cache_stats['size']} cached complaints)")
 st.caption("This professional demo utilizes AI Classification, Sentiment, and a Multi-Tier Resolution Flow.")
\ No newline at end of file
@@ -0,0 +1,123 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from model_artifacts import MODEL_FILE, PROCESSED_FILE, STATE_FILE, VECTORIZER_FILE
+
+# --- Login Page Cold-Start Benchmark + Budget Check ---
+# Each measurement runs in a FRESH Python process (nothing imported / cached yet), like a server
+# that was just started:
+#   import   -> time to import what Home.py imports; none of HEAVY_MODULES may be loaded by it
+#   warm     -> first render of Home.py (AppTest) with the model files present
+#   no-model -> first render of Home.py in a scratch copy WITHOUT the model files: training runs in
+#               the background, the login page must still render within the budget (used to take
+#               the whole training run). Also reports how long the bootstrap took to reach 'ready'.
+# Exits with code 1 when a budget is exceeded. The same budgets are enforced by tests/test_cold_start.py.
+# Usage: python _bench_cold_start.py                    (all scenarios, default budgets)
+#        python _bench_cold_start.py --skip-training    (no training run: import + warm only)
+
+HOME_IMPORTS = ['streamlit', 'model_bootstrap', 'user_store']
+HEAVY_MODULES = ['pandas', 'sklearn', 'scipy', 'joblib', 'plotly.express']
+IMPORT_BUDGET = 1.5  # seconds (streamlit alone is ~0.6s here)
+RENDER_BUDGET = 3.0  # seconds, first Home.py run incl. the AppTest harness
+READY_TIMEOUT = 600  # seconds to wait for background training in the no-model scenario
+MODEL_FILES = [MODEL_FILE, VECTORIZER_FILE, PROCESSED_FILE, STATE_FILE]
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_IMPORT_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+for name in {imports!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+_RENDER_CHILD = """
+import json, os, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.abspath('Home.py'), default_timeout=60).run()
+seconds = time.perf_counter() - start
+import model_bootstrap  # Same process -> the bootstrap Home.py started
+bootstrap = model_bootstrap.get_bootstrap()
+state_at_render = bootstrap.state
+bootstrap.wait({ready_timeout})
+print(json.dumps({{'seconds': seconds, 'state_at_render': state_at_render, 'state': bootstrap.state,
+                  'ready_s': bootstrap.elapsed(), 'error': bootstrap.error,
+                  'exceptions': [e.message for e in at.exception], 'rendered': len(at.text_input) >= 2}}))
+"""
+
+
+def _run_child(code, cwd, timeout):
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, timeout=timeout)
+    lines = [line for line in result.stdout.splitlines() if line.startswith('{')]
+    if result.returncode != 0 or not lines:
+        raise RuntimeError(f"Child process failed (code {result.returncode}): {result.stderr.strip()[-500:]}")
+    return json.loads(lines[-1])
+
+
+def _scratch_copy(src, dst, without=()):
+    # Code + data of the app, without the (optionally) listed artifacts and without the ticket db
+    for pattern in ['*.py', '*.csv', '*.pkl', '*.json', '*.toml']:
+        for path in glob.glob(os.path.join(src, pattern)):
+            if os.path.basename(path) not in without:
+                shutil.copy2(path, dst)
+    shutil.copytree(os.path.join(src, 'Pages'), os.path.join(dst, 'Pages'),
+                    ignore=shutil.ignore_patterns('__pycache__'))
+
+
+def measure_imports():
+    # Fresh process: seconds to import what Home.py imports + which heavy modules came along
+    return _run_child(_IMPORT_CHILD.format(imports=HOME_IMPORTS, heavy=HEAVY_MODULES), ROOT, 120)
+
+
+def measure_first_render(without=()):
+    # Fresh process in a scratch copy of the app (minus `without`): first Home.py render + bootstrap outcome
+    with tempfile.TemporaryDirectory() as tmp:
+        _scratch_copy(ROOT, tmp, without)
+        return _run_child(_RENDER_CHILD.format(ready_timeout=READY_TIMEOUT), tmp, READY_TIMEOUT + 120)
+
+
+def run_benchmark(skip_training=False, import_budget=IMPORT_BUDGET, render_budget=RENDER_BUDGET):
+    failures = []
+
+    imported = measure_imports()
+    print(f"import   | {imported['seconds']:.2f}s (budget {import_budget:.1f}s) | "
+          f"heavy modules loaded: {', '.join(imported['heavy']) or 'none'}")
+    if imported['seconds'] > import_budget:
+        failures.append(f"Home.py imports took {imported['seconds']:.2f}s (budget {import_budget:.1f}s)")
+    if imported['heavy']:
+        failures.append(f"Home.py imports pull in {', '.join(imported['heavy'])}")
+
+    scenarios = [('warm', ())] + ([] if skip_training else [('no-model', MODEL_FILES)])
+    for name, without in scenarios:
+        row = measure_first_render(without)
+        print(f"{name:<8} | first render {row['seconds']:.2f}s (budget {render_budget:.1f}s) | "
+              f"state at render: {row['state_at_render']} | {row['state']} after {row['ready_s']:.1f}s")
+        if row['seconds'] > render_budget:
+            failures.append(f"{name}: first render took {row['seconds']:.2f}s (budget {render_budget:.1f}s)")
+        if row['exceptions'] or not row['rendered']:
+            failures.append(f"{name}: login page did not render {row['exceptions']}")
+        if row['state'] != 'ready':
+            failures.append(f"{name}: model bootstrap ended '{row['state']}': {row['error']}")
+
+    for failure in failures:
+        print(f"ERROR: {failure}")
+    if not failures:
+        print("✅ Cold start within budget.")
+    return not failures
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure the login page cold start and check it against a budget.")
+    parser.add_argument('--skip-training', action='store_true', help="Skip the scenario that trains the model")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET)
+    parser.add_argument('--render-budget', type=float, default=RENDER_BUDGET)
+    args = parser.parse_args()
+
+    sys.exit(0 if run_benchmark(args.skip_training, args.import_budget, args.render_budget) else 1)
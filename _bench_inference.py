@@ -0,0 +1,76 @@
+import argparse
+import http.client
+import json
+import threading
+import time
+import pandas as pd
+
+# --- Latency / Throughput Benchmark for _inference_server.py ---
+# Fires real complaint texts at a running server from many concurrent clients.
+# Usage: python _inference_server.py &
+#        python _bench_inference.py --clients 32 --requests 200
+
+SAMPLE_FILE = "Comcast_telecom_complaints_data.csv"
+
+
+def _client(host, port, path, texts, n_requests, latencies, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    for i in range(n_requests):
+        body = json.dumps({'text': texts[i % len(texts)]})
+        start = time.perf_counter()
+        try:
+            conn.request('POST', path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except Exception as e:
+            errors.append(str(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run_benchmark(host='127.0.0.1', port=8502, path='/classify', clients=32, requests_per_client=200):
+    texts = pd.read_csv(SAMPLE_FILE)['Customer Complaint'].astype(str).tolist()
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(target=_client, args=(host, port, path, texts[i::clients] or texts,
+                                               requests_per_client, latencies, errors))
+        for i in range(clients)
+    ]
+
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat_ms = pd.Series(latencies) * 1000
+    report = {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'seconds': round(elapsed, 2),
+        'qps': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'p50_ms': round(lat_ms.quantile(0.50), 2) if len(lat_ms) else None,
+        'p95_ms': round(lat_ms.quantile(0.95), 2) if len(lat_ms) else None,
+        'p99_ms': round(lat_ms.quantile(0.99), 2) if len(lat_ms) else None,
+    }
+    return report
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the local inference server.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--endpoint', default='/classify', choices=['/classify', '/sentiment'])
+    parser.add_argument('--clients', type=int, default=32, help="Concurrent client threads")
+    parser.add_argument('--requests', type=int, default=200, help="Requests per client")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.host, args.port, args.endpoint, args.clients, args.requests)
+    print(json.dumps(report, indent=2))
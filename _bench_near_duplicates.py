@@ -0,0 +1,66 @@
+import argparse
+import random
+import statistics
+import time
+import tracemalloc
+import pandas as pd
+from featurize import clean_text
+from model_artifacts import PROCESSED_FILE
+from near_duplicates import NearDuplicateIndex
+
+# --- Near-Duplicate Lookup Benchmark (MinHash LSH index vs window size) ---
+# Streams N synthetic tickets (real complaints with a few random words appended, 50 zip codes,
+# one ticket every few seconds) through a NearDuplicateIndex and times observe() at the end of the
+# stream, i.e. with a full retention window. Lookup cost should stay flat as the window grows,
+# and memory should follow the window, not the stream length.
+# Usage: python _bench_near_duplicates.py --sizes 10000 100000
+
+
+def _stream(n, seed=0):
+    rng = random.Random(seed)
+    texts = pd.read_csv(PROCESSED_FILE, usecols=['Customer_Complaint'])['Customer_Complaint'].dropna().tolist()
+    words = [w for t in texts for w in t.split()]
+    start = pd.Timestamp('2015-04-01')
+    for i in range(n):
+        text = f"{rng.choice(texts)} {' '.join(rng.choices(words, k=rng.randint(0, 3)))}"
+        moment = start + pd.Timedelta(seconds=i * 5)
+        yield {'row_id': i + 1, 'Cleaned_Complaint': clean_text(text), 'Zip_code': 30300 + rng.randrange(50),
+               'Date': moment.strftime('%d-%m-%Y'), 'Time': moment.strftime('%I:%M:%S %p')}
+
+
+def run_benchmark(sizes, window_hours=72, samples=1000):
+    results = []
+    for size in sizes:
+        tickets = list(_stream(size + samples))
+        index = NearDuplicateIndex(window_hours=window_hours)
+        tracemalloc.start()
+        for ticket in tickets[:size]:
+            index.observe(ticket)
+        memory_mb = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+
+        latencies, linked = [], 0
+        for ticket in tickets[size:]:
+            start = time.perf_counter()
+            incident_id, _ = index.observe(ticket)
+            latencies.append((time.perf_counter() - start) * 1000)
+            linked += incident_id is not None
+        latencies.sort()
+        row = {'tickets': size, 'in_window': len(index), 'memory_mb': memory_mb,
+               'median_ms': statistics.median(latencies), 'p99_ms': latencies[int(len(latencies) * 0.99) - 1],
+               'linked_pct': linked / samples * 100}
+        results.append(row)
+        print(f"{size:>9,} tickets streamed | {row['in_window']:>7,} in window | index {memory_mb:.0f} MB | "
+              f"observe median {row['median_ms']:.3f} ms | p99 {row['p99_ms']:.3f} ms | "
+              f"linked {row['linked_pct']:.1f}%")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate detection vs stream / window size.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--window-hours', type=float, default=72)
+    parser.add_argument('--samples', type=int, default=1000, help="Timed tickets per size")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.window_hours, args.samples)
@@ -0,0 +1,71 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from _bench_similar import _bulk_fill
+from ticket_search import MAX_HITS
+from ticket_store import TicketStore
+
+# --- Desk Search Latency Benchmark (full-text index vs str.contains) ---
+# Fills a scratch store with N synthetic complaints, builds the search index, then times what the
+# desk does per search: the hit count for the pager + one 50-row page (best match first, and
+# newest first). A search covers its newest ticket_search.MAX_HITS matches (count shows "N+").
+# Baseline: case-insensitive str.contains over the complaint column of a loaded frame.
+# Usage: python _bench_search.py --sizes 100000 1000000
+
+QUERIES = ['data cap', '"data cap"', 'billing OR charges', 'comcast NOT xfinity', 'throttl*',
+           '(slow OR speed) AND modem', 'city:abingdon billing']
+
+
+def _time_ms(fn, samples):
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def _desk_search(store, query, sort):
+    store.count_tickets(search=query)
+    return store.query_tickets(['row_id', 'Ticket_#', 'Date', 'Customer_Complaint'], sort=sort, limit=50, search=query)
+
+
+def run_benchmark(sizes, samples=5):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TicketStore(os.path.join(tmp, 'bench.db'), seed_csv=None)
+        current = 0
+        for size in sorted(sizes):
+            _bulk_fill(store, current, size)  # Raw INSERTs (no index upkeep) -> index built in one pass below
+            current = size
+            conn = store.connection()
+            start = time.perf_counter()
+            conn.execute('BEGIN IMMEDIATE')
+            store.search.rebuild(conn)
+            conn.execute('COMMIT')
+            build_s = time.perf_counter() - start
+
+            frame = store.load_tickets(['Customer_Complaint'])
+            baseline_ms = _time_ms(lambda: frame['Customer_Complaint'].str.contains('data cap', case=False).sum(), 3)
+            print(f"{size:>10,} tickets | index build {build_s:.1f}s | str.contains('data cap') {baseline_ms:.0f} ms")
+            for query in QUERIES:
+                hits = store.count_tickets(search=query)
+                row = {'tickets': size, 'query': query, 'hits': f"{MAX_HITS:,}+" if hits > MAX_HITS else f"{hits:,}",
+                       'best_match_ms': _time_ms(lambda: _desk_search(store, query, 'relevance'), samples),
+                       'newest_ms': _time_ms(lambda: _desk_search(store, query, 'date'), samples)}
+                results.append(row)
+                print(f"    {query!r:<30} {row['hits']:>9} hits | count + page: best match {row['best_match_ms']:.1f} ms"
+                      f" | newest first {row['newest_ms']:.1f} ms")
+        store.close()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark desk search latency vs store size.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--samples', type=int, default=5, help="Timed searches per query")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.samples)
@@ -0,0 +1,33 @@
+import argparse
+import time
+import pandas as pd
+from sentiment import score_sentiments
+
+# --- Sentiment Engine Benchmark ---
+# Scores N complaints (real texts, made unique so nothing is de-duplicated) in Series mode.
+# Usage: python _bench_sentiment.py --rows 1000000
+
+SAMPLE_FILE = "Comcast_telecom_complaints_data.csv"
+
+
+def run_benchmark(rows=1_000_000, unique=True):
+    base = pd.read_csv(SAMPLE_FILE)['Customer Complaint'].astype(str)
+    texts = pd.concat([base] * (rows // len(base) + 1), ignore_index=True).iloc[:rows]
+    if unique:
+        texts = texts + ' #' + pd.Series(range(rows)).astype(str)
+
+    start = time.perf_counter()
+    labels = score_sentiments(texts)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Scored {rows:,} complaints in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)")
+    print(labels.value_counts().to_string())
+    return elapsed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark vectorized sentiment scoring.")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--allow-duplicates', action='store_true', help="Skip making every text unique")
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, unique=not args.allow_duplicates)
@@ -0,0 +1,91 @@
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+import joblib
+import pandas as pd
+from _bench_ticket_store import SAMPLE_TICKET
+from featurize import clean_text
+from model_artifacts import PROCESSED_FILE, VECTORIZER_FILE
+from similar_complaints import SimilarComplaints
+from ticket_store import _INSERT_SQL, _row_values, TicketStore
+
+# --- Similar-Complaints Query Latency Benchmark ---
+# Fills a scratch store with N synthetic complaints (real complaints with words shuffled in from
+# other complaints, so postings lists grow realistically), builds the index, then times top-5
+# queries with real complaints, and the incremental path (one new ticket, then a query).
+# Target: queries under 20 ms at millions of tickets.
+# Usage: python _bench_similar.py --sizes 100000 1000000
+
+
+def _synthetic_complaints(n, seed=0):
+    rng = random.Random(seed)
+    texts = pd.read_csv(PROCESSED_FILE, usecols=['Customer_Complaint'])['Customer_Complaint'].dropna().tolist()
+    words = [w for t in texts for w in t.split()]
+    for _ in range(n):
+        yield f"{rng.choice(texts)} {' '.join(rng.choices(words, k=rng.randint(0, 4)))}"
+
+
+def _bulk_fill(store, start, stop, batch=50_000):
+    conn = store.connection()
+    complaints = _synthetic_complaints(stop - start, seed=start)
+    for lo in range(start, stop, batch):
+        rows = []
+        for i in range(lo, min(lo + batch, stop)):
+            text = next(complaints)
+            rows.append(_row_values({**SAMPLE_TICKET, 'Ticket_#': str(100000 + i), 'Customer_Complaint': text,
+                                     'Cleaned_Complaint': clean_text(text)}))
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(_INSERT_SQL, rows)
+        conn.execute('COMMIT')
+
+
+def run_benchmark(sizes, samples=200):
+    vectorizer = joblib.load(VECTORIZER_FILE)
+    queries = list(_synthetic_complaints(samples, seed=-1))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TicketStore(os.path.join(tmp, 'bench.db'), seed_csv=None)
+        index = SimilarComplaints(store, vectorizer)
+        current = 0
+        for size in sorted(sizes):
+            _bulk_fill(store, current, size)
+            current = size
+            start = time.perf_counter()
+            index.sync()
+            build_s = time.perf_counter() - start
+
+            latencies = []
+            for text in queries:
+                start = time.perf_counter()
+                index.neighbours(text, k=5)
+                latencies.append((time.perf_counter() - start) * 1000)
+            latencies.sort()
+
+            incremental = []
+            for text in queries[:20]:
+                store.insert_ticket({**SAMPLE_TICKET, 'Customer_Complaint': text, 'Cleaned_Complaint': clean_text(text)})
+                start = time.perf_counter()
+                index.neighbours(text, k=5)
+                incremental.append((time.perf_counter() - start) * 1000)
+            current += 20
+
+            row = {'tickets': size, 'index_s': build_s, 'median_ms': statistics.median(latencies),
+                   'p99_ms': latencies[int(len(latencies) * 0.99) - 1],
+                   'incremental_ms': statistics.median(incremental)}
+            results.append(row)
+            print(f"{size:>12,} tickets | index {build_s:.1f}s | query median {row['median_ms']:.2f} ms | "
+                  f"p99 {row['p99_ms']:.2f} ms | new ticket + query {row['incremental_ms']:.2f} ms")
+        store.close()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark similar-complaint queries vs store size.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--samples', type=int, default=200, help="Timed queries per size")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.samples)
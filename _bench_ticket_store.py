@@ -0,0 +1,62 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from ticket_store import _INSERT_SQL, _row_values, TicketStore
+
+# --- Ticket Store Write-Latency Benchmark ---
+# Grows a scratch store to each size and times single-ticket inserts (same call Agent Mode makes).
+# Latency should stay flat as the store grows (the old CSV rewrite grew linearly).
+# Usage: python _bench_ticket_store.py --sizes 2000 100000 1000000 10000000
+
+SAMPLE_TICKET = {
+    'Customer_Complaint': 'Comcast Internet Speed', 'Complaint_Type': 'Internet Speed',
+    'Status_Group': 'Unresolved', 'Date': '22-04-2015', 'Date_month_year': '22-Apr-15',
+    'Time': '3:53:50 PM', 'Received_Via': 'Web AI', 'City': 'Abingdon', 'State': 'Maryland',
+    'Zip_code': 21009, 'Status': 'Open', 'Filing_on_Behalf_of_Someone': 'No',
+    'Cleaned_Complaint': 'comcast internet speed',
+}
+
+
+def _bulk_fill(store, start, stop, batch=50_000):
+    conn = store._conn()
+    for lo in range(start, stop, batch):
+        conn.execute('BEGIN IMMEDIATE')
+        conn.executemany(_INSERT_SQL, (_row_values({**SAMPLE_TICKET, 'Ticket_#': str(100000 + i)})
+                                       for i in range(lo, min(lo + batch, stop))))
+        conn.execute('COMMIT')
+
+
+def run_benchmark(sizes, samples=200):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TicketStore(os.path.join(tmp, 'bench.db'), seed_csv=None)
+        current = 0
+        for size in sorted(sizes):
+            _bulk_fill(store, current, size)
+            current = size
+
+            latencies = []
+            for _ in range(samples):
+                start = time.perf_counter()
+                store.insert_ticket(SAMPLE_TICKET)
+                latencies.append((time.perf_counter() - start) * 1000)
+            current += samples
+
+            latencies.sort()
+            row = {'rows': size, 'median_ms': statistics.median(latencies),
+                   'p99_ms': latencies[int(len(latencies) * 0.99) - 1]}
+            results.append(row)
+            print(f"{size:>12,} rows | insert median {row['median_ms']:.3f} ms | p99 {row['p99_ms']:.3f} ms")
+        store.close()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark per-ticket insert latency vs store size.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[2_000, 100_000, 1_000_000])
+    parser.add_argument('--samples', type=int, default=200, help="Timed inserts per size")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.samples)
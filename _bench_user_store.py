@@ -0,0 +1,76 @@
+import argparse
+import csv
+import os
+import statistics
+import tempfile
+import time
+import pandas as pd
+from user_store import HEADER, UserStore, hash_password
+
+# --- Login Latency Benchmark (user_store index vs re-reading the csv per login) ---
+# Writes a scratch registered_users.csv with N agents and times logins against it.
+# Filler agents are hashed with 1 PBKDF2 iteration (iterations are stored per record), so the file
+# builds in seconds; the agent that logs in uses the real HASH_ITERATIONS.
+# Usage: python _bench_user_store.py --users 1000 100000
+
+
+def _write_users(path, n_users):
+    salt = b'bench-salt-16byt'
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows([f'agent{i}', hash_password(f'pw{i}', iterations=1, salt=salt)] for i in range(n_users))
+
+
+def _old_login(path, username, password):
+    # What Home.py did before: pandas re-read + boolean mask over every row
+    df = pd.read_csv(path)
+    return not df[(df['Username'] == username) & (df['Password'] == password)].empty
+
+
+def _time_ms(fn, samples):
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def run_benchmark(sizes, samples=50):
+    results = []
+    for n_users in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'users.csv')
+            _write_users(path, n_users)
+            users = UserStore(path)
+
+            start = time.perf_counter()
+            users.register('bench_agent', 'correct horse')
+            first_ms = (time.perf_counter() - start) * 1000  # Includes building the index
+            register_ms = _time_ms(lambda: users.register(f'new{time.perf_counter_ns()}', 'x'), 5)
+
+            target = f'agent{n_users // 2}'
+            row = {
+                'users': n_users,
+                'first_load_ms': first_ms,
+                'lookup_ms': _time_ms(lambda: users.exists(target), samples),
+                'login_ms': _time_ms(lambda: users.verify('bench_agent', 'correct horse'), 10),
+                'register_ms': register_ms,
+                'old_login_ms': _time_ms(lambda: _old_login(path, target, 'pw'), 5),
+            }
+            assert users.verify('bench_agent', 'correct horse') and not users.verify('bench_agent', 'wrong')
+            results.append(row)
+            print(f"{n_users:>9,} users | index build {row['first_load_ms']:.0f} ms | lookup {row['lookup_ms']:.4f} ms | "
+                  f"login (hash check) {row['login_ms']:.1f} ms | register {row['register_ms']:.2f} ms | "
+                  f"old csv login {row['old_login_ms']:.1f} ms")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark agent login / registration latency vs headcount.")
+    parser.add_argument('--users', type=int, nargs='+', default=[1_000, 100_000])
+    parser.add_argument('--samples', type=int, default=50, help="Timed lookups per size")
+    args = parser.parse_args()
+
+    run_benchmark(args.users, args.samples)
@@ -0,0 +1,105 @@
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from _bench_ticket_store import SAMPLE_TICKET
+from ticket_store import TicketStore
+from write_queue import WriteQueue
+
+# --- Multi-Agent Write Stress Benchmark (single writer + group commit vs every agent committing) ---
+# N agent threads each file tickets and flip some of them to Resolved, all at once, on a scratch store.
+# Both modes are durable (synchronous=FULL: an acknowledged write has been fsynced).
+#   queue  -> every write goes through write_queue.WriteQueue (one commit per group)
+#   direct -> every agent runs its own transaction per write
+# Then checks that nothing was lost: every acknowledged ticket / status change is in the store.
+# Usage: python _bench_write_queue.py --agents 50 --writes 40
+
+
+def _agent(agent_id, n_writes, write, latencies, acks, errors):
+    # Agent Mode loop: file a ticket; every 4th one gets resolved afterwards (Manager save)
+    mine = []
+    try:
+        for i in range(n_writes):
+            ticket = {**SAMPLE_TICKET, 'Customer_Complaint': f'agent {agent_id} ticket {i}'}
+            start = time.perf_counter()
+            if i % 4 == 3 and mine:
+                result = write('status', ({mine.pop(0): 'Resolved'}, f'agent{agent_id}'))
+                acks['status'].append(result)
+            else:
+                result = write('insert', ticket)
+                mine.append(result['row_id'])
+                acks['insert'].append(result)
+            latencies.append((time.perf_counter() - start) * 1000)
+    except Exception as e:
+        errors.append(e)
+
+
+def _verify(store, acks):
+    conn = store._conn()
+    inserted = acks['insert']
+    rows = conn.execute("SELECT COUNT(*), COUNT(DISTINCT \"Ticket_#\") FROM tickets "
+                        "WHERE \"Customer_Complaint\" LIKE 'agent %'").fetchone()
+    audits = conn.execute("SELECT COUNT(*) FROM status_audit WHERE changed_by LIKE 'agent%'").fetchone()[0]
+    resolved = conn.execute("SELECT COUNT(*) FROM tickets WHERE \"Customer_Complaint\" LIKE 'agent %' "
+                            "AND \"Status_Group\" = 'Resolved'").fetchone()[0]
+    problems = []
+    if rows[0] != len(inserted):
+        problems.append(f"{len(inserted)} inserts acknowledged, {rows[0]} rows stored")
+    if rows[1] != rows[0] or len({t['Ticket_#'] for t in inserted}) != len(inserted):
+        problems.append("duplicate Ticket_# values")
+    if audits != sum(acks['status']) or resolved != sum(acks['status']):
+        problems.append(f"{sum(acks['status'])} status changes acknowledged, {audits} audited, {resolved} resolved")
+    return problems
+
+
+def run_benchmark(mode, n_agents=50, n_writes=40, max_batch=256, max_wait_ms=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TicketStore(os.path.join(tmp, 'bench.db'), seed_csv=None, synchronous='FULL')
+        if mode == 'queue':
+            writer = WriteQueue(store, max_batch=max_batch, max_wait_ms=max_wait_ms)
+            submit = {'insert': writer.submit_insert, 'status': lambda payload: writer.submit_status(*payload)}
+            write = lambda kind, payload: submit[kind](payload).result(60)
+        else:
+            writer = None
+            write = lambda kind, payload: store.write_batch([(kind, payload)])[0]
+
+        latencies, acks, errors = [], {'insert': [], 'status': []}, []
+        threads = [threading.Thread(target=_agent, args=(a, n_writes, write, latencies, acks, errors))
+                   for a in range(n_agents)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        problems = [f"{len(errors)} writes failed: {errors[0]!r}"] if errors else []
+        problems += _verify(store, acks)
+        latencies.sort()
+        row = {'mode': mode, 'writes': len(latencies), 'seconds': elapsed,
+               'writes_per_s': len(latencies) / elapsed, 'median_ms': statistics.median(latencies),
+               'p99_ms': latencies[int(len(latencies) * 0.99) - 1], 'problems': problems}
+        batches = f" | {writer.batches_run} commits" if writer else ''
+        print(f"{mode:>6} | {row['writes']:,} writes in {elapsed:.2f}s = {row['writes_per_s']:,.0f}/s | "
+              f"ack median {row['median_ms']:.1f} ms | p99 {row['p99_ms']:.1f} ms{batches}")
+        if problems:
+            print("ERROR: " + '; '.join(problems))
+        else:
+            print(f"✅ No lost writes: {len(acks['insert'])} tickets + {sum(acks['status'])} status changes stored")
+        store.close()
+    return row
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Stress-test concurrent agent writes (group commit vs direct).")
+    parser.add_argument('--agents', type=int, default=50)
+    parser.add_argument('--writes', type=int, default=40, help="Writes per agent")
+    parser.add_argument('--modes', nargs='+', default=['queue', 'direct'], choices=['queue', 'direct'])
+    parser.add_argument('--max-batch', type=int, default=256)
+    parser.add_argument('--max-wait-ms', type=float, default=5)
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        run_benchmark(mode, args.agents, args.writes, args.max_batch, args.max_wait_ms)
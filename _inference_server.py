@@ -0,0 +1,167 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import joblib
+from featurize import clean_texts
+from model_artifacts import MODEL_FILE, VECTORIZER_FILE
+from sentiment import analyze_sentiment, priority_level
+
+# --- Local Inference Server (IVR / web-form front ends) ---
+# Loads the classifier + vectorizer ONCE and serves:
+#   POST /classify   {"text": "..."} or {"texts": ["...", ...]}
+#   POST /sentiment  {"text": "..."} or {"texts": ["...", ...]}
+#   GET  /health
+# Concurrent /classify calls are grouped into micro-batches: one sparse transform + one
+# predict serves many callers.
+# Usage: python _inference_server.py --port 8502 --max-batch 64 --max-wait-ms 5
+
+
+class MicroBatcher:
+    # Collects requests until max_batch items are waiting OR max_wait_ms has passed since
+    # the first one arrived, then runs predict_fn once for the whole group.
+    def __init__(self, predict_fn, max_batch=64, max_wait_ms=5):
+        self.predict_fn = predict_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue = queue.Queue()
+        self.batches_run = 0
+        self.items_served = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, text):
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]  # Block until there is work
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = self.predict_fn(texts)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            self.batches_run += 1
+            self.items_served += len(batch)
+
+
+def make_predict_fn(model, vectorizer):
+    def predict(texts):
+        X = vectorizer.transform(clean_texts(texts))
+        return [str(p) for p in model.predict(X)]
+    return predict
+
+
+def _sentiment_payload(text):
+    sentiment = analyze_sentiment(text)
+    return {'sentiment': sentiment, 'priority': priority_level(sentiment)}
+
+
+def make_handler(batcher, request_timeout=10.0):
+    class InferenceHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive -> benchmark clients can reuse connections
+
+        def _send(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_texts(self):
+            length = int(self.headers.get('Content-Length', 0))
+            data = json.loads(self.rfile.read(length) or b'{}')
+            # Shape checks -> 400 (a list / string body or "texts": "abc" would otherwise be
+            # iterated / scored character by character)
+            if not isinstance(data, dict):
+                raise ValueError("Body must be a JSON object with 'text' or 'texts'.")
+            if 'texts' in data:
+                texts = data['texts']
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    raise ValueError("'texts' must be a list of strings.")
+                return texts, True
+            if 'text' in data:
+                if not isinstance(data['text'], str):
+                    raise ValueError("'text' must be a string.")
+                return [data['text']], False
+            raise ValueError("Body must contain 'text' or 'texts'.")
+
+        def do_GET(self):
+            if self.path == '/health':
+                self._send(200, {'status': 'ok', 'batches_run': batcher.batches_run,
+                                 'items_served': batcher.items_served})
+            else:
+                self._send(404, {'error': 'Not found'})
+
+        def do_POST(self):
+            try:
+                texts, many = self._read_texts()
+            except (ValueError, json.JSONDecodeError) as e:
+                self._send(400, {'error': str(e)})
+                return
+
+            try:
+                if self.path == '/classify':
+                    futures = [batcher.submit(t) for t in texts]
+                    results = [{'type': f.result(timeout=request_timeout)} for f in futures]
+                elif self.path == '/sentiment':
+                    results = [_sentiment_payload(t) for t in texts]
+                else:
+                    self._send(404, {'error': 'Not found'})
+                    return
+            except Exception as e:
+                self._send(500, {'error': str(e)})
+                return
+
+            self._send(200, {'results': results} if many else results[0])
+
+        def log_message(self, format, *args):
+            pass  # Per-request logging would dominate latency at high QPS
+
+    return InferenceHandler
+
+
+def build_server(host='127.0.0.1', port=8502, max_batch=64, max_wait_ms=5,
+                 model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE):
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    batcher = MicroBatcher(make_predict_fn(model, vectorizer), max_batch, max_wait_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(batcher))
+    server.daemon_threads = True
+    return server, batcher
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-batching HTTP inference server for complaint classification.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    parser.add_argument('--max-batch', type=int, default=64, help="Max requests per predict call")
+    parser.add_argument('--max-wait-ms', type=float, default=5, help="Max time a request waits for batch-mates")
+    args = parser.parse_args()
+
+    server, _ = build_server(args.host, args.port, args.max_batch, args.max_wait_ms)
+    print(f"INFO: Inference server listening on http://{args.host}:{args.port} "
+          f"(max_batch={args.max_batch}, max_wait_ms={args.max_wait_ms})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,150 @@
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import pandas as pd
+from featurize import clean_texts
+from model_artifacts import MODEL_FILE, VECTORIZER_FILE
+from sentiment import priority_levels, score_sentiments
+
+# --- Batch Scoring CLI ---
+# Streams a CSV / JSONL file of complaints in chunks and writes Type, Sentiment and Priority
+# for every row. Memory stays constant: only a few chunks are ever held at once.
+# Usage: python _score_batch.py complaints.csv scored.csv
+#        python _score_batch.py requests.jsonl scored.jsonl --text-col body --id-col request_id --workers 4
+
+# Tried in order when --text-col is not given
+TEXT_COLUMN_CANDIDATES = ['Customer_Complaint', 'Customer Complaint', 'complaint', 'text', 'body']
+SCORE_COLUMNS = ['Predicted_Type', 'Sentiment', 'Priority']
+
+_worker_model = None
+_worker_vectorizer = None
+
+
+def _file_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.json', '.ndjson')) else 'csv'
+
+
+def read_chunks(path, chunksize, fmt=None):
+    if _file_format(path, fmt) == 'jsonl':
+        return pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+    return pd.read_csv(path, chunksize=chunksize)
+
+
+def load_models(model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE):
+    global _worker_model, _worker_vectorizer
+    _worker_model = joblib.load(model_path)
+    _worker_vectorizer = joblib.load(vectorizer_path)
+
+
+def result_columns(with_id=False):
+    # Output header: 'id' first when --id-col is given
+    return (['id'] if with_id else []) + SCORE_COLUMNS
+
+
+def score_chunk(texts, ids=None):
+    # One sparse transform + one predict per chunk (never row by row)
+    texts = pd.Series(texts).astype(str).reset_index(drop=True)
+    if texts.empty:
+        # Header-only CSV -> one empty chunk (the vectorizer rejects 0 rows)
+        return pd.DataFrame(columns=result_columns(ids is not None))
+    X = _worker_vectorizer.transform(clean_texts(texts))
+    sentiments = score_sentiments(texts)
+    result = pd.DataFrame({
+        'Predicted_Type': _worker_model.predict(X),
+        'Sentiment': sentiments,
+        'Priority': priority_levels(sentiments),
+    })
+    if ids is not None:
+        result.insert(0, 'id', pd.Series(ids).reset_index(drop=True))
+    return result
+
+
+def write_chunk(result, path, first, fmt=None):
+    if _file_format(path, fmt) == 'jsonl':
+        with open(path, 'w' if first else 'a', encoding='utf-8') as f:
+            result.to_json(f, orient='records', lines=True, force_ascii=False)
+    else:
+        result.to_csv(path, mode='w' if first else 'a', header=first, index=False, encoding='utf-8')
+
+
+def _pick_text_column(columns, text_col=None):
+    if text_col:
+        if text_col not in columns:
+            raise ValueError(f"Column '{text_col}' not found. Available: {list(columns)}")
+        return text_col
+    for candidate in TEXT_COLUMN_CANDIDATES:
+        if candidate in columns:
+            return candidate
+    raise ValueError(f"No complaint text column found (tried {TEXT_COLUMN_CANDIDATES}). Use --text-col.")
+
+
+def score_file(input_path, output_path, chunksize=50_000, workers=1, text_col=None, id_col=None,
+               input_format=None, output_format=None):
+    start = time.time()
+    rows_done = 0
+    first = True
+
+    def _split(chunk):
+        col = _pick_text_column(chunk.columns, text_col)
+        ids = chunk[id_col] if id_col else None
+        return chunk[col], ids
+
+    def _write(result):
+        nonlocal rows_done, first
+        write_chunk(result, output_path, first, output_format)
+        first = False
+        rows_done += len(result)
+        elapsed = time.time() - start
+        print(f"INFO: {rows_done:,} rows scored ({rows_done / max(elapsed, 1e-9):,.0f} rows/sec)", file=sys.stderr)
+
+    chunks = read_chunks(input_path, chunksize, input_format)
+    if workers <= 1:
+        load_models()
+        for chunk in chunks:
+            _write(score_chunk(*_split(chunk)))
+    else:
+        # Bounded in-flight window keeps memory constant and output in input order
+        with ProcessPoolExecutor(max_workers=workers, initializer=load_models) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(score_chunk, *_split(chunk)))
+                if len(pending) >= workers * 2:
+                    _write(pending.popleft().result())
+            while pending:
+                _write(pending.popleft().result())
+
+    if first:
+        # Empty input -> still leave an (empty) output file behind, same header as score_chunk's
+        write_chunk(pd.DataFrame(columns=result_columns(bool(id_col))), output_path, True, output_format)
+
+    elapsed = time.time() - start
+    print(f"✅ Scored {rows_done:,} rows in {elapsed:.2f}s ({rows_done / max(elapsed, 1e-9):,.0f} rows/sec) "
+          f"-> {os.path.abspath(output_path)}", file=sys.stderr)
+    return rows_done
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Batch-score complaint files (CSV or JSONL) with the trained models.")
+    parser.add_argument('input', help="Input .csv or .jsonl file")
+    parser.add_argument('output', help="Output .csv or .jsonl file")
+    parser.add_argument('--chunksize', type=int, default=50_000, help="Rows per chunk")
+    parser.add_argument('--workers', type=int, default=1, help="Processes to spread chunks across")
+    parser.add_argument('--text-col', default=None, help="Column holding the complaint text")
+    parser.add_argument('--id-col', default=None, help="Column copied to the output as 'id'")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'], default=None)
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], default=None)
+    args = parser.parse_args()
+
+    try:
+        score_file(args.input, args.output, args.chunksize, args.workers, args.text_col, args.id_col,
+                   args.input_format, args.output_format)
+    except (ValueError, OSError) as e:
+        # Bad options / columns, or a missing / unreadable input or unwritable output path
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
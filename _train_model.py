@@ -1,11 +1,11 @@
-<<<<<<< HEAD
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-import joblib
-import re
 import os # <-- Zaroori: File Path check karne ke liye
+from model_artifacts import PROCESSED_FILE, save_model_artifacts, write_model_state
+from complaint_rules import label_complaint_types
+from featurize import (VECTORIZER_PARAMS, build_tfidf_features, feature_cache_key,
+                       load_feature_cache, save_feature_cache)
+from _train_streaming import make_stream_model
 
 FILE_NAME = "Comcast_telecom_complaints_data.csv"
 
@@ -14,48 +14,42 @@ df = pd.read_csv(FILE_NAME)
 df.columns = df.columns.str.replace(' ', '_')
 df['Customer_Complaint'] = df['Customer_Complaint'].astype(str)
 
-# Function to extract major category
-def get_complaint_type(text):
-    text = text.lower()
-    if 'bill' in text or 'charge' in text or 'fee' in text or 'pricing' in text:
-        return 'Billing/Charges'
-    elif 'speed' in text or 'slow' in text or 'throttle' in text:
-        return 'Internet Speed'
-    elif 'service' in text or 'disconnected' in text or 'network' in text or 'outage' in text:
-        return 'Service/Network'
-    elif 'support' in text or 'rude' in text or 'customer' in text or 'contact' in text:
-        return 'Customer Service'
-    else:
-        return 'Other/Technical'
-
-df['Complaint_Type'] = df['Customer_Complaint'].apply(get_complaint_type)
+# Rule-based labels (see complaint_rules.py) -> vectorized, no per-row apply
+df['Complaint_Type'] = label_complaint_types(df['Customer_Complaint'])
 
 # Simplify Status for Manager Dashboard (Resolved vs Unresolved)
 df['Status_Group'] = df['Status'].apply(lambda x: 'Resolved' if 'Solved' in x else 'Unresolved')
 
-# 2. Text Preprocessing Function
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text) 
-    return text
-
-df['Cleaned_Complaint'] = df['Customer_Complaint'].apply(clean_text)
-
-# 3. Classification Setup
-X = df['Cleaned_Complaint']
-y = df['Complaint_Type']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# 4. TF-IDF and Model Training
-tfidf_vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-X_train_tfidf = tfidf_vectorizer.fit_transform(X_train)
-
-model = LogisticRegression(max_iter=1000)
+# 2. Text Preprocessing + TF-IDF (shared featurize.py, cached on disk)
+# Cache key = CSV contents + vectorizer params + split -> classifier-only retrains skip all text work
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+feature_key = feature_cache_key(FILE_NAME, VECTORIZER_PARAMS, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+features = load_feature_cache(feature_key)
+
+if features is None:
+    # 3. Classification Setup (split on row index so the cached matrix lines up with labels later)
+    train_index, _ = train_test_split(df.index, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    features = build_tfidf_features(df['Customer_Complaint'], train_index, VECTORIZER_PARAMS)
+    save_feature_cache(feature_key, features)
+    print(f"INFO: Text features built and cached (key {feature_key}).")
+else:
+    print(f"INFO: Reusing cached text features (key {feature_key}).")
+
+df['Cleaned_Complaint'] = features['cleaned']
+
+# 4. Model Training
+tfidf_vectorizer = features['vectorizer']
+X_train_tfidf = features['X_train_tfidf']
+y_train = df.loc[features['train_index'], 'Complaint_Type']
+
+# Logistic regression trained by SGD (same model as _train_streaming.py): has partial_fit,
+# so _update_model.py can keep learning from new tickets without a full retrain
+model = make_stream_model(random_state=RANDOM_STATE)
 model.fit(X_train_tfidf, y_train)
 
 # 5. Saving all necessary files
-joblib.dump(model, 'type_classifier_model.pkl')
-joblib.dump(tfidf_vectorizer, 'tfidf_type_vectorizer.pkl')
+save_model_artifacts(model, tfidf_vectorizer)
 
 # --- FINAL FILE SAVING FIX (100% Guaranteed) ---
 # Current Working Directory check
@@ -63,72 +57,8 @@ current_path = os.getcwd()
 print(f"File saving location is: {current_path}") 
 
 # Saving the processed DataFrame for the Manager Dashboard with encoding fix
-df.to_csv('processed_data_for_dashboard.csv', index=False, encoding='utf-8')
-=======
-import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.linear_model import LogisticRegression
-import joblib
-import re
-import os # <-- Zaroori: File Path check karne ke liye
-
-FILE_NAME = "Comcast_telecom_complaints_data.csv"
-
-# 1. Data Cleaning
-df = pd.read_csv(FILE_NAME)
-df.columns = df.columns.str.replace(' ', '_')
-df['Customer_Complaint'] = df['Customer_Complaint'].astype(str)
-
-# Function to extract major category
-def get_complaint_type(text):
-    text = text.lower()
-    if 'bill' in text or 'charge' in text or 'fee' in text or 'pricing' in text:
-        return 'Billing/Charges'
-    elif 'speed' in text or 'slow' in text or 'throttle' in text:
-        return 'Internet Speed'
-    elif 'service' in text or 'disconnected' in text or 'network' in text or 'outage' in text:
-        return 'Service/Network'
-    elif 'support' in text or 'rude' in text or 'customer' in text or 'contact' in text:
-        return 'Customer Service'
-    else:
-        return 'Other/Technical'
-
-df['Complaint_Type'] = df['Customer_Complaint'].apply(get_complaint_type)
+df.to_csv(PROCESSED_FILE, index=False, encoding='utf-8')
 
-# Simplify Status for Manager Dashboard (Resolved vs Unresolved)
-df['Status_Group'] = df['Status'].apply(lambda x: 'Resolved' if 'Solved' in x else 'Unresolved')
-
-# 2. Text Preprocessing Function
-def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z\s]', '', text) 
-    return text
-
-df['Cleaned_Complaint'] = df['Customer_Complaint'].apply(clean_text)
-
-# 3. Classification Setup
-X = df['Cleaned_Complaint']
-y = df['Complaint_Type']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-# 4. TF-IDF and Model Training
-tfidf_vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
-X_train_tfidf = tfidf_vectorizer.fit_transform(X_train)
-
-model = LogisticRegression(max_iter=1000)
-model.fit(X_train_tfidf, y_train)
-
-# 5. Saving all necessary files
-joblib.dump(model, 'type_classifier_model.pkl')
-joblib.dump(tfidf_vectorizer, 'tfidf_type_vectorizer.pkl')
-
-# --- FINAL FILE SAVING FIX (100% Guaranteed) ---
-# Current Working Directory check
-current_path = os.getcwd()
-print(f"File saving location is: {current_path}") 
-
-# Saving the processed DataFrame for the Manager Dashboard with encoding fix
-df.to_csv('processed_data_for_dashboard.csv', index=False, encoding='utf-8')
->>>>>>> 7479d4846d1cc1ddd9cb9e041482f405c0be658c
+# High-water mark for _update_model.py: every row written above is already learned
+write_model_state(len(df), last_ticket=df['Ticket_#'].iloc[-1] if len(df) else None, source='_train_model.py')
 print("✅ All necessary files (Model, Vectorizer, Data) saved successfully.")
\ No newline at end of file
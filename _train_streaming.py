@@ -0,0 +1,94 @@
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from complaint_rules import COMPLAINT_TYPE_RULES, DEFAULT_COMPLAINT_TYPE, label_complaint_types
+from featurize import clean_texts, make_hashing_vectorizer
+# Same file names as the batch trainer -> User_Mode.py loads them exactly like before
+from model_artifacts import (MODEL_FILE, PROCESSED_FILE, VECTORIZER_FILE, save_model_artifacts,
+                             write_model_state)
+
+# --- Out-of-core Trainer ---
+# Same outputs as _train_model.py, but the CSV is read chunk by chunk and the model is
+# trained with partial_fit, so memory stays bounded no matter how big the export is.
+# Usage: python _train_streaming.py --csv big_export.csv --chunksize 200000
+
+FILE_NAME = "Comcast_telecom_complaints_data.csv"
+
+# partial_fit needs every class up front (a chunk may not contain all of them)
+ALL_CLASSES = np.array([label for label, _ in COMPLAINT_TYPE_RULES] + [DEFAULT_COMPLAINT_TYPE])
+
+
+def make_stream_model(random_state=42):
+    # log_loss -> logistic regression trained by SGD (keeps predict_proba available)
+    return SGDClassifier(loss='log_loss', alpha=1e-5, random_state=random_state)
+
+
+def prepare_chunk(chunk):
+    # Same column cleanup / labeling as the batch trainer, applied per chunk
+    chunk.columns = chunk.columns.str.replace(' ', '_')
+    chunk['Customer_Complaint'] = chunk['Customer_Complaint'].astype(str)
+    chunk['Complaint_Type'] = label_complaint_types(chunk['Customer_Complaint'])
+    chunk['Status_Group'] = np.where(chunk['Status'].astype(str).str.contains('Solved', regex=False),
+                                     'Resolved', 'Unresolved')
+    chunk['Cleaned_Complaint'] = clean_texts(chunk['Customer_Complaint'])
+    return chunk
+
+
+def train_streaming(csv_path=FILE_NAME, chunksize=100_000, epochs=1, processed_out=PROCESSED_FILE,
+                    model_out=MODEL_FILE, vectorizer_out=VECTORIZER_FILE):
+    vectorizer = make_hashing_vectorizer()
+    model = make_stream_model()
+    rows_seen, correct, scored = 0, 0, 0
+    last_ticket = None
+    start = time.time()
+
+    for epoch in range(epochs):
+        # Processed data is only written once (first pass), appended chunk by chunk
+        write_processed = processed_out and epoch == 0
+        for i, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunksize)):
+            chunk = prepare_chunk(chunk)
+            X = vectorizer.transform(chunk['Cleaned_Complaint'])
+            y = chunk['Complaint_Type'].to_numpy()
+
+            # Progressive validation: score each chunk BEFORE learning from it
+            if rows_seen > 0:
+                correct += int((model.predict(X) == y).sum())
+                scored += len(y)
+
+            model.partial_fit(X, y, classes=ALL_CLASSES)
+            rows_seen += len(chunk)
+            if len(chunk):
+                last_ticket = chunk['Ticket_#'].iloc[-1]
+
+            if write_processed:
+                chunk.to_csv(processed_out, mode='w' if i == 0 else 'a', header=(i == 0),
+                             index=False, encoding='utf-8')
+
+            print(f"INFO: epoch {epoch + 1}/{epochs} chunk {i + 1}: {rows_seen:,} rows seen")
+
+    save_model_artifacts(model, vectorizer, model_out, vectorizer_out)
+    if processed_out:
+        # High-water mark for _update_model.py (rows per pass == rows in the processed file)
+        write_model_state(rows_seen // epochs, last_ticket=last_ticket, source='_train_streaming.py')
+
+    elapsed = time.time() - start
+    accuracy = correct / scored if scored else float('nan')
+    print(f"INFO: Progressive validation accuracy: {accuracy:.3f} on {scored:,} rows")
+    print(f"File saving location is: {os.getcwd()}")
+    print(f"✅ Streaming training done: {rows_seen:,} rows in {elapsed:.1f}s ({rows_seen / max(elapsed, 1e-9):,.0f} rows/sec).")
+    return model, vectorizer
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Out-of-core complaint type trainer (chunked CSV + partial_fit).")
+    parser.add_argument('--csv', default=FILE_NAME, help="Raw complaint CSV (same columns as the Comcast export).")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows per chunk (bounds memory).")
+    parser.add_argument('--epochs', type=int, default=1, help="Passes over the CSV.")
+    parser.add_argument('--processed-out', default=PROCESSED_FILE,
+                        help="Where to write dashboard data ('' to skip).")
+    args = parser.parse_args()
+
+    train_streaming(args.csv, args.chunksize, args.epochs, args.processed_out)
@@ -0,0 +1,91 @@
+import argparse
+import sys
+import time
+import joblib
+import pandas as pd
+from complaint_rules import label_complaint_types
+from featurize import clean_texts
+from model_artifacts import (MODEL_FILE, VECTORIZER_FILE, artifact_version, read_model_state,
+                             save_model_artifacts, write_model_state)
+from ticket_store import get_store
+
+# --- Incremental Model Update ---
+# Learns ONLY from the tickets agents logged since the last model version
+# (ticket-store rows after the high-water mark in model_state.json; row_id == old CSV row number).
+# Labels come from complaint_rules (like _train_model.py), NOT from the stored Complaint_Type:
+# Agent Mode fills that in with the model's own prediction, so training on it would only
+# reinforce the model's mistakes.
+# Needs a model with partial_fit: the SGD model written by _train_model.py / _train_streaming.py.
+# (Models from older _train_model.py versions are LogisticRegression -> retrain once first.)
+# Usage: python _update_model.py              -> one update
+#        python _update_model.py --every 300  -> keep updating every 5 minutes
+
+
+class NotUpdatableModelError(RuntimeError):
+    pass
+
+
+def update_model_once(store=None, model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE):
+    store = store or get_store()
+    state = read_model_state()
+    if state is None or state.get('model_version') != list(artifact_version(model_path) or ()):
+        # No (or stale) high-water mark -> we can't tell which rows the model has seen.
+        # Start tracking from the current end of the data instead of re-learning old rows.
+        total_rows = store.max_row_id()
+        write_model_state(total_rows, source='_update_model.py (baseline)', model_path=model_path)
+        print(f"INFO: No valid high-water mark found. Baseline recorded at row {total_rows:,}; "
+              "tickets logged from now on will be learned.")
+        return 0
+
+    offset = state['row_offset']
+    # Only rows past the mark are read (row_id is the primary key -> index range scan)
+    new_rows = store.load_tickets(['row_id', 'Ticket_#', 'Customer_Complaint'], since_row_id=offset)
+    last_row_id = int(new_rows['row_id'].max()) if len(new_rows) else offset
+    new_rows = new_rows.dropna(subset=['Customer_Complaint'])
+    if new_rows.empty:
+        if last_row_id > offset:
+            write_model_state(last_row_id, source='_update_model.py', model_path=model_path)
+        print(f"INFO: No new tickets since row {offset:,}. Model unchanged.")
+        return 0
+
+    model = joblib.load(model_path)
+    if not hasattr(model, 'partial_fit'):
+        raise NotUpdatableModelError(f"{type(model).__name__} cannot be updated incrementally. "
+                                     "Retrain once with _train_model.py or _train_streaming.py (SGD model).")
+    vectorizer = joblib.load(vectorizer_path)
+
+    start = time.time()
+    X_new = vectorizer.transform(clean_texts(new_rows['Customer_Complaint']))
+    y_new = label_complaint_types(new_rows['Customer_Complaint']).to_numpy()
+
+    # Labels the model has never seen can't be added incrementally
+    known = pd.Series(y_new).isin(model.classes_).to_numpy()
+    if not known.all():
+        print(f"WARNING: Skipping {(~known).sum()} rows with unknown Complaint_Type labels.")
+    if known.any():
+        model.partial_fit(X_new[known], y_new[known])
+
+    save_model_artifacts(model, vectorizer, model_path, vectorizer_path)
+    new_offset = last_row_id
+    write_model_state(new_offset, last_ticket=new_rows['Ticket_#'].iloc[-1], source='_update_model.py',
+                      model_path=model_path)
+
+    print(f"✅ Model updated with {int(known.sum()):,} new tickets in {time.time() - start:.2f}s "
+          f"(high-water mark: row {new_offset:,}).")
+    return int(known.sum())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Update the complaint classifier from newly logged tickets "
+                                                 "(needs the SGD model from _train_model.py / _train_streaming.py).")
+    parser.add_argument('--every', type=int, default=0, help="Repeat every N seconds (0 = run once).")
+    args = parser.parse_args()
+
+    try:
+        update_model_once()
+        while args.every > 0:
+            time.sleep(args.every)
+            update_model_once()
+    except NotUpdatableModelError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
@@ -0,0 +1,52 @@
+import re
+import numpy as np
+import pandas as pd
+
+# --- Complaint Type Rules (Declarative Table) ---
+# Order matters: the FIRST category whose keywords appear in the complaint wins.
+# Add / reorder categories here instead of editing if/elif chains.
+COMPLAINT_TYPE_RULES = [
+    ('Billing/Charges', ['bill', 'charge', 'fee', 'pricing']),
+    ('Internet Speed', ['speed', 'slow', 'throttle']),
+    ('Service/Network', ['service', 'disconnected', 'network', 'outage']),
+    ('Customer Service', ['support', 'rude', 'customer', 'contact']),
+]
+DEFAULT_COMPLAINT_TYPE = 'Other/Technical'
+
+
+def _compile_rules(rules):
+    # One alternation pattern per category -> a single scan per category instead of one per keyword
+    return [(label, '|'.join(re.escape(k) for k in keywords)) for label, keywords in rules]
+
+
+_COMPILED_RULES = _compile_rules(COMPLAINT_TYPE_RULES)
+_SCALAR_RULES = [(label, re.compile(pattern)) for label, pattern in _COMPILED_RULES]
+
+
+# Single text version (kept for UI / ad-hoc use)
+def get_complaint_type(text):
+    text = str(text).lower()
+    for label, pattern in _SCALAR_RULES:
+        if pattern.search(text):
+            return label
+    return DEFAULT_COMPLAINT_TYPE
+
+
+# Batched version: labels a whole Series in one pass per category (no per-row Python calls)
+def label_complaint_types(texts, rules=None, default=DEFAULT_COMPLAINT_TYPE):
+    compiled = _COMPILED_RULES if rules is None else _compile_rules(rules)
+    # Missing texts -> 'nan' like the old astype(str) (pandas 3 keeps them NaN, which factorize codes as -1)
+    lowered = pd.Series(texts).astype(str).fillna('nan').str.lower()
+
+    # Complaints repeat a lot ("Comcast Data Cap") -> label each distinct text only once
+    codes, uniques = pd.factorize(lowered)
+    uniques = pd.Series(uniques, dtype=lowered.dtype)
+
+    # Plain string patterns (not re objects) so pandas can use its native string kernels
+    conditions = [uniques.str.contains(pattern, regex=True).to_numpy(dtype=bool) for _, pattern in compiled]
+    labels = [label for label, _ in compiled]
+
+    # np.select picks the first True condition -> same first-match-wins priority as the old if/elif
+    unique_labels = np.select(conditions, labels, default=default).astype(object) if conditions \
+        else np.full(len(uniques), default, dtype=object)
+    return pd.Series(unique_labels[codes], index=lowered.index, dtype=object)
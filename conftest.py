@@ -0,0 +1 @@
+# Lets pytest import the app's root-level modules (complaint_rules, ticket_store, ...) from tests/
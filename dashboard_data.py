@@ -0,0 +1,77 @@
+import pandas as pd
+from rollups import DAILY_ROLLUP, GEO_CUBE, GEO_STATE_CUBE
+from sentiment import score_sentiments
+
+# --- Processed Complaint Data (shared read path for the pages, backed by ticket_store) ---
+
+# Drill order of the geo cube (rollups.GEO_CUBE)
+GEO_LEVELS = ['state', 'city', 'zip_code']
+
+# Complaint Management Desk: one page of tickets at a time
+DESK_COLUMNS = ['row_id', 'Ticket_#', 'Date', 'Customer_Complaint', 'Complaint_Type', 'Status_Group',
+                'resolution_score']
+DESK_PAGE_SIZE = 50
+
+
+def data_version(store):
+    # Store write counter -> changes on every save_data / update_dashboard_data write.
+    # Pages pass this into their st.cache_* loaders so a rerun only re-reads after a real change.
+    return store.version()
+
+
+def load_kpi_rollups(store):
+    # Everything the KPI cards and charts need, summed from the rollup table (O(groups))
+    rollups = {
+        'status': store.rollup_counts(DAILY_ROLLUP, ['status_group']),
+        'type': store.rollup_counts(DAILY_ROLLUP, ['complaint_type']),
+        'state': store.rollup_counts(DAILY_ROLLUP, ['state']),
+        'daily': store.rollup_counts(DAILY_ROLLUP, ['day', 'status_group']),
+    }
+    rollups['daily']['day'] = pd.to_datetime(rollups['daily']['day'], format='%Y-%m-%d', errors='coerce')
+    return rollups
+
+
+def geo_drilldown(store, state=None, city=None, complaint_type=None):
+    # One level below the selection: all states -> cities of a state -> zip codes of a city.
+    # Answered from the geo cube (primary-key range scan), never from the ticket rows.
+    where = {}
+    if state:
+        where['state'] = state
+        if city:
+            where['city'] = city
+    level = GEO_LEVELS[len(where)]
+    if complaint_type:
+        where['complaint_type'] = complaint_type
+
+    cube = GEO_STATE_CUBE if level == 'state' else GEO_CUBE
+    counts = store.rollup_counts(cube, [level, 'status_group'], where)
+    table = counts.pivot_table(index=level, columns='status_group', values='n', aggfunc='sum', fill_value=0)
+    table.columns.name = None
+    table['Total'] = table.sum(axis=1)
+    table = table.reindex(columns=['Total', 'Resolved', 'Unresolved'], fill_value=0)
+    table['Resolution_Rate'] = (table['Resolved'] / table['Total'] * 100).round(1)
+    table = table.sort_values('Total', ascending=False).reset_index()
+    return table[table[level] != '']  # '' = location missing on the ticket
+
+
+def load_desk_page(store, status_group=None, complaint_type=None, sort='date', descending=True,
+                   page=1, page_size=DESK_PAGE_SIZE, search=None):
+    # Filter + sort + LIMIT/OFFSET run in SQLite on indexes; sentiment is scored for the page only.
+    # search = desk search-box text (full-text index, see ticket_search.py)
+    page_df = store.query_tickets(DESK_COLUMNS, status_group, complaint_type, sort, descending,
+                                  limit=page_size, offset=(page - 1) * page_size, search=search)
+    page_df.insert(4, 'Customer_Sentiment', score_sentiments(page_df['Customer_Complaint']).to_numpy())
+    return page_df
+
+
+def count_desk_tickets(store, status_group=None, complaint_type=None, search=None):
+    # Row count for the pager from the daily rollup (O(groups), no index scan);
+    # a search counts its hits in the full-text index instead
+    if search and search.strip():
+        return store.count_tickets(status_group, complaint_type, search)
+    where = {}
+    if status_group:
+        where['status_group'] = status_group
+    if complaint_type:
+        where['complaint_type'] = complaint_type
+    return int(store.rollup_counts(DAILY_ROLLUP, [], where)['n'].iloc[0])
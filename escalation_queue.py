@@ -0,0 +1,155 @@
+import heapq
+import threading
+from datetime import datetime
+import pandas as pd
+from sentiment import analyze_sentiment, priority_level, priority_levels, score_sentiments
+
+# --- Escalation Queue (manager backlog: which ticket to work next) ---
+# Persistent side: the `escalations` table in the ticket store holds every open (Unresolved)
+# ticket with its priority. TicketStore keeps it in step inside its write transactions
+# (enqueue on an Unresolved insert / re-open, dequeue on resolve), like the rollup tables.
+# In-memory side: EscalationQueue is a binary heap over that table (one per server process).
+# push / peek / re-prioritize are O(log n); stale heap entries are dropped lazily. Resolving goes
+# through the store like any status edit (the page resolves the ticket it showed, not the top at click time).
+
+# Order: priority (sentiment HIGH/MEDIUM), then complaint type, then age (oldest first)
+PRIORITY_RANK = {'HIGH': 0, 'MEDIUM': 1}
+# Outages hit the most customers -> first within the same priority
+TYPE_RANK = {'Service/Network': 0, 'Internet Speed': 1, 'Billing/Charges': 2, 'Customer Service': 3}
+DEFAULT_TYPE_RANK = len(TYPE_RANK)
+
+_TICKET_SQL = 'SELECT row_id, "Customer_Complaint", "Complaint_Type", "Date", "Time" FROM tickets'
+
+
+def _queued_at(dates, times):
+    # 'yyyy-mm-dd hh:mm:ss' from Date (dd-mm-yyyy) + Time (h:mm:ss AM/PM) -> sorts by age as text
+    moments = pd.to_datetime(dates.astype(str) + ' ' + times.astype(str), format='%d-%m-%Y %I:%M:%S %p', errors='coerce')
+    moments = moments.fillna(pd.to_datetime(dates, format='%d-%m-%Y', errors='coerce'))
+    return moments.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('9999-12-31 00:00:00')
+
+
+def _queued_at_one(date, time):
+    # Same as _queued_at for a single ticket (plain strptime: on the per-insert path)
+    for text, fmt in ((f'{date} {time}', '%d-%m-%Y %I:%M:%S %p'), (str(date), '%d-%m-%Y')):
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            pass
+    return '9999-12-31 00:00:00'
+
+
+class EscalationTable:
+    # Persistent queue membership + priority, written by TicketStore inside its transactions
+    table = 'escalations'
+
+    def create(self, conn):
+        conn.execute('CREATE TABLE IF NOT EXISTS escalations (row_id INTEGER PRIMARY KEY, priority TEXT NOT NULL, '
+                     'complaint_type TEXT, queued_at TEXT NOT NULL, seq INTEGER NOT NULL)')
+        # seq = change counter -> each process's heap pulls only what changed since it last looked
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_escalations_seq ON escalations(seq)')
+        conn.execute("INSERT OR IGNORE INTO store_meta VALUES ('escalation_seq', 0)")
+
+    def _next_seq(self, conn):
+        conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'escalation_seq'")
+        return conn.execute("SELECT value FROM store_meta WHERE key = 'escalation_seq'").fetchone()[0]
+
+    def enqueue(self, conn, row_id):
+        row = conn.execute(_TICKET_SQL + ' WHERE row_id = ?', (row_id,)).fetchone()
+        if row is None:
+            return
+        _, complaint, complaint_type, date, time = row
+        queued_at = _queued_at_one(date, time)
+        conn.execute('INSERT OR REPLACE INTO escalations VALUES (?, ?, ?, ?, ?)',
+                     (row_id, priority_level(analyze_sentiment(complaint)), complaint_type, queued_at,
+                      self._next_seq(conn)))
+
+    def dequeue(self, conn, row_id):
+        conn.execute('DELETE FROM escalations WHERE row_id = ?', (row_id,))
+
+    def reprioritize(self, conn, row_id, priority):
+        cursor = conn.execute('UPDATE escalations SET priority = ?, seq = ? WHERE row_id = ?',
+                              (priority, self._next_seq(conn), row_id))
+        return cursor.rowcount > 0
+
+    def rebuild(self, conn):
+        # Every Unresolved ticket, priority from the same sentiment rule Agent Mode shows
+        conn.execute('DELETE FROM escalations')
+        seq = self._next_seq(conn)
+        for chunk in pd.read_sql_query(_TICKET_SQL + ' WHERE "Status_Group" = \'Unresolved\'', conn, chunksize=100_000):
+            priorities = priority_levels(score_sentiments(chunk['Customer_Complaint']))
+            queued_at = _queued_at(chunk['Date'], chunk['Time'])
+            conn.executemany('INSERT INTO escalations VALUES (?, ?, ?, ?, ?)',
+                             zip(chunk['row_id'].tolist(), priorities.tolist(), chunk['Complaint_Type'].tolist(),
+                                 queued_at.tolist(), [seq] * len(chunk)))
+
+
+def sort_key(priority, complaint_type, queued_at, row_id):
+    return (PRIORITY_RANK.get(priority, len(PRIORITY_RANK)), TYPE_RANK.get(complaint_type, DEFAULT_TYPE_RANK),
+            queued_at, row_id)
+
+
+class EscalationQueue:
+    # Heap of [sort key, seq, row_id, info]; entries[row_id] = the live entry. An entry is stale once a
+    # newer one replaced it (re-prioritized) or its ticket left the table (resolved elsewhere).
+    def __init__(self, store):
+        self.store = store
+        self._heap = []
+        self._entries = {}
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        # Pull rows changed since last time (new escalations, re-prioritized ones): O(k log n)
+        changed = self.store.escalations_since(self._last_seq)
+        with self._lock:
+            bulk = len(changed) > len(self._heap)
+            columns = [changed[c].tolist() for c in ['row_id', 'priority', 'complaint_type', 'queued_at', 'seq']]
+            for row_id, priority, complaint_type, queued_at, seq in zip(*columns):
+                info = {'row_id': row_id, 'priority': priority, 'complaint_type': complaint_type, 'queued_at': queued_at}
+                entry = [sort_key(priority, complaint_type, queued_at, row_id), seq, row_id, info]
+                self._entries[row_id] = entry
+                if bulk:
+                    self._heap.append(entry)
+                else:
+                    heapq.heappush(self._heap, entry)
+            if len(changed):
+                self._last_seq = max(self._last_seq, int(changed['seq'].max()))
+            if bulk:
+                heapq.heapify(self._heap)  # First load / after a rebuild: O(n) instead of n pushes
+            # Too many stale entries -> compact
+            if len(self._heap) > 2 * len(self._entries) + 1000:
+                self._heap = [e for e in self._heap if self._entries.get(e[2]) is e]
+                heapq.heapify(self._heap)
+
+    def _drop_stale_top(self):
+        # Lazy deletion: only entries that reach the top are checked against the store
+        while self._heap:
+            entry = self._heap[0]
+            if self._entries.get(entry[2]) is entry and self.store.escalation_seq(entry[2]) == entry[1]:
+                return entry
+            heapq.heappop(self._heap)
+            if self._entries.get(entry[2]) is entry:
+                del self._entries[entry[2]]
+        return None
+
+    def peek(self, n=1):
+        # Next n tickets to work, in order, as {row_id, priority, complaint_type, queued_at}
+        # (pops to look past the top, then pushes back)
+        self.refresh()
+        with self._lock:
+            taken = []
+            while len(taken) < n:
+                entry = self._drop_stale_top()
+                if entry is None:
+                    break
+                taken.append(heapq.heappop(self._heap))
+            for entry in taken:
+                heapq.heappush(self._heap, entry)
+            return [entry[3] for entry in taken]
+
+    def reprioritize(self, row_id, priority):
+        # Persist the new priority, then push the new entry (the old one goes stale)
+        if not self.store.reprioritize_escalation(row_id, priority):
+            return False
+        self.refresh()
+        return True
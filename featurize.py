@@ -0,0 +1,112 @@
+import hashlib
+import json
+import os
+import re
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# --- Shared Text Featurization (used by training AND the Streamlit pages) ---
+
+# Same settings the classifier was always trained with
+VECTORIZER_PARAMS = {'max_features': 5000, 'stop_words': 'english'}
+FEATURE_CACHE_DIR = 'feature_cache'
+# Bump this if clean_text / clean_texts ever change, so old caches are not reused
+FEATURE_VERSION = 1
+
+# Python's \s (str patterns) == every char where str.isspace() is True.
+# Spelling it out keeps the vectorized path identical to re.sub even when pandas
+# runs the regex on a different engine (pyarrow/RE2 has a narrower \s).
+_WHITESPACE = ('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+               '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+_NON_LETTER_PATTERN = '[^a-zA-Z' + re.escape(_WHITESPACE) + ']'
+_NON_LETTER_RE = re.compile(_NON_LETTER_PATTERN)
+
+
+# Single text version (UI: one complaint at a time)
+def clean_text(text):
+    text = text.lower()
+    text = _NON_LETTER_RE.sub('', text)
+    return text
+
+
+# Batched version: whole Series at once with vectorized string ops
+def clean_texts(texts):
+    texts = pd.Series(texts).astype(str)
+    return texts.str.lower().str.replace(_NON_LETTER_PATTERN, '', regex=True)
+
+
+# --- On-disk Feature Cache ---
+def file_fingerprint(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def feature_cache_key(csv_path, vectorizer_params=None, **extra):
+    # Key = source data + vectorizer settings + anything else that shapes the matrix (e.g. split seed)
+    payload = {
+        'data': file_fingerprint(csv_path),
+        'vectorizer': vectorizer_params or VECTORIZER_PARAMS,
+        'extra': extra,
+        'version': FEATURE_VERSION,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _cache_path(key, cache_dir):
+    return os.path.join(cache_dir, key)
+
+
+def load_feature_cache(key, cache_dir=FEATURE_CACHE_DIR):
+    path = _cache_path(key, cache_dir)
+    meta_file = os.path.join(path, 'features.joblib')
+    matrix_file = os.path.join(path, 'X_train_tfidf.npz')
+    if not (os.path.exists(meta_file) and os.path.exists(matrix_file)):
+        return None
+    try:
+        features = joblib.load(meta_file)
+        features['X_train_tfidf'] = sparse.load_npz(matrix_file)
+        return features
+    except Exception as e:
+        # A broken cache should never break training -> just rebuild
+        print(f"WARNING: Ignoring unreadable feature cache {path}. Error: {e}")
+        return None
+
+
+def save_feature_cache(key, features, cache_dir=FEATURE_CACHE_DIR):
+    path = _cache_path(key, cache_dir)
+    os.makedirs(path, exist_ok=True)
+    meta = {k: v for k, v in features.items() if k != 'X_train_tfidf'}
+    sparse.save_npz(os.path.join(path, 'X_train_tfidf.npz'), sparse.csr_matrix(features['X_train_tfidf']))
+    joblib.dump(meta, os.path.join(path, 'features.joblib'))
+    return path
+
+
+def build_tfidf_features(raw_texts, train_index, vectorizer_params=None):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    cleaned = clean_texts(raw_texts)
+    vectorizer = TfidfVectorizer(**(vectorizer_params or VECTORIZER_PARAMS))
+    X_train_tfidf = vectorizer.fit_transform(cleaned.loc[train_index])
+    return {
+        'cleaned': cleaned,
+        'train_index': np.asarray(train_index),
+        'vectorizer': vectorizer,
+        'X_train_tfidf': X_train_tfidf,
+    }
+
+
+# --- Stateless Hashing Featurizer (streaming / out-of-core training) ---
+# No fitted vocabulary -> every chunk is transformed independently with bounded memory.
+# Exposes the same .transform([text]) API as the TF-IDF vectorizer, so pages load it the same way.
+HASHING_PARAMS = {'n_features': 2 ** 18, 'alternate_sign': False, 'norm': 'l2', 'stop_words': 'english'}
+
+
+def make_hashing_vectorizer(hashing_params=None):
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(**(hashing_params or HASHING_PARAMS))
@@ -0,0 +1,207 @@
+import threading
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from timeutil import EPOCH, ticket_time, to_seconds
+
+# --- Live Ticket Stream Aggregator (sliding windows + spike detection) ---
+# Consumes tickets as they are written (ticket_store listener, plus catch_up() for tickets written
+# by other processes) and keeps rolling counts per minute / hour / day by (complaint type, state).
+# Memory is bounded by the number of buckets x distinct keys; old buckets simply fall off.
+# Reads (summary / counts / alerts) never touch the ticket history.
+
+ALL_STATES = 'All States'
+# Not a state: Agent Mode files 'Not Provided'. Such tickets only count under ALL_STATES.
+PLACEHOLDER_STATES = {'', 'nan', 'none', 'unknown', 'not provided', 'n/a'}
+
+
+def ticket_state(ticket):
+    # None for a missing / placeholder State (like near_duplicates._zip skips zip 0)
+    state = ticket.get('State')
+    if not isinstance(state, str) or state.strip().lower() in PLACEHOLDER_STATES:
+        return None
+    return state
+
+
+class SlidingWindow:
+    # Ring of n_buckets time buckets (each a Counter of key -> count, key None = all tickets)
+    # + running totals, so "count over the whole window" is a lookup, not a sum.
+    def __init__(self, bucket_seconds, n_buckets):
+        self.bucket_seconds = bucket_seconds
+        self.n_buckets = n_buckets
+        self.buckets = deque()  # (bucket index, Counter), oldest first
+        self.totals = Counter()
+        self.head = None  # Newest bucket index seen
+
+    def _bucket(self, seconds):
+        return int(seconds // self.bucket_seconds)
+
+    def advance(self, seconds):
+        # Drop buckets that slid out of the window ending at `seconds`
+        index = self._bucket(seconds)
+        if self.head is None or index > self.head:
+            self.head = index
+        while self.buckets and self.buckets[0][0] <= self.head - self.n_buckets:
+            _, expired = self.buckets.popleft()
+            self.totals.subtract(expired)
+            for key in expired:
+                if self.totals[key] <= 0:
+                    del self.totals[key]
+
+    def add(self, seconds, keys):
+        index = self._bucket(seconds)
+        self.advance(seconds)
+        if index <= self.head - self.n_buckets:
+            return False  # Too old for this window
+        if not self.buckets or self.buckets[-1][0] < index:
+            self.buckets.append((index, Counter()))
+            bucket = self.buckets[-1][1]
+        else:
+            # Late ticket: find its bucket (or insert one) from the newest end
+            position = len(self.buckets) - 1
+            while position >= 0 and self.buckets[position][0] > index:
+                position -= 1
+            if position >= 0 and self.buckets[position][0] == index:
+                bucket = self.buckets[position][1]
+            else:
+                self.buckets.insert(position + 1, (index, Counter()))
+                bucket = self.buckets[position + 1][1]
+        for key in [None] + list(keys):
+            bucket[key] += 1
+            self.totals[key] += 1
+        return True
+
+    def current(self, key=None):
+        # Count in the newest (current) bucket
+        if not self.buckets or self.buckets[-1][0] != self.head:
+            return 0
+        return self.buckets[-1][1][key]
+
+    def history(self, key, n):
+        # Counts for the n buckets BEFORE the current one (zeros included) -> spike baseline
+        counts = [0] * n
+        for index, bucket in reversed(self.buckets):
+            age = self.head - index
+            if age > n:
+                break
+            if age >= 1:
+                counts[age - 1] = bucket[key]
+        return counts
+
+
+class LiveAggregator:
+    def __init__(self, baseline_hours=24, min_count=5, z_threshold=4.0, max_alerts=50):
+        self.minutes = SlidingWindow(60, 60)       # Last hour, per minute
+        self.hours = SlidingWindow(3600, 48)       # Last 2 days, per hour
+        self.days = SlidingWindow(86400, 30)       # Last 30 days, per day
+        self.baseline_hours = baseline_hours
+        self.min_count = min_count
+        self.z_threshold = z_threshold
+        self.alerts = deque(maxlen=max_alerts)
+        self._alerted = set()  # (key, hour bucket) already flagged
+        self._first_hour = None  # No spike calls until a full baseline has been observed
+        self._baselines = {}  # key -> (mean, threshold) for the current hour (history is fixed)
+        self._baseline_hour = None
+        self.last_row_id = 0   # Every row_id <= this has been observed...
+        self._seen_after = set()  # ...plus these (listeners can fire out of commit order)
+        self._lock = threading.Lock()  # Listener (writer threads) vs page reruns
+
+    # --- Ingestion ---
+    def observe(self, ticket, moment=None, now=None):
+        now = now or datetime.now()
+        # Future-dated tickets (bad Date) count as now: one of them must not move the window
+        # heads ahead and empty "this hour" / "today" for every real ticket
+        moment = min(moment or ticket_time(ticket) or now, now)
+        seconds = to_seconds(moment)
+        complaint_type = ticket.get('Complaint_Type') or 'Unknown'
+        state = ticket_state(ticket)
+        # Every ticket counts for (type, all states), and for (type, state) when it has a real state
+        keys = ([(complaint_type, state)] if state else []) + [(complaint_type, ALL_STATES)]
+        with self._lock:
+            if not self._mark_seen(ticket.get('row_id')):
+                return  # Already seen (listener + catch_up overlap)
+            for window in (self.minutes, self.hours, self.days):
+                window.add(seconds, keys)
+            hour = int(seconds // 3600)
+            if self._first_hour is None or hour < self._first_hour:
+                self._first_hour = hour
+            for key in keys:
+                self._check_spike(key)
+
+    def _mark_seen(self, row_id):
+        if row_id is None:
+            return True
+        row_id = int(row_id)
+        if row_id <= self.last_row_id or row_id in self._seen_after:
+            return False
+        self._seen_after.add(row_id)
+        while self.last_row_id + 1 in self._seen_after:
+            self.last_row_id += 1
+            self._seen_after.discard(self.last_row_id)
+        if len(self._seen_after) > 1000:  # A gap that never fills (e.g. deleted rows) -> skip it
+            self.last_row_id = min(self._seen_after)
+            self._seen_after = {i for i in self._seen_after if i > self.last_row_id}
+        return True
+
+    def catch_up(self, store, lookback_rows=None):
+        # Pull tickets written since the last one seen (e.g. by another process).
+        # lookback_rows bounds the first read: only the newest rows can fall inside the windows.
+        with self._lock:
+            if self.last_row_id == 0 and lookback_rows is not None:
+                self.last_row_id = max(store.max_row_id() - lookback_rows, 0)
+            since = self.last_row_id
+        new_rows = store.load_tickets(['row_id', 'Date', 'Time', 'Complaint_Type', 'State'], since_row_id=since)
+        for ticket in new_rows.to_dict('records'):
+            self.observe(ticket)
+        return len(new_rows)
+
+    # --- Spike detection ---
+    def _check_spike(self, key):
+        # Current hour vs the previous baseline_hours hours for the same key (mean + z * std)
+        count = self.hours.current(key)
+        if count < self.min_count or (key, self.hours.head) in self._alerted:
+            return
+        if self.hours.head - self._first_hour < self.baseline_hours:
+            return  # Still warming up: empty hours before the first ticket are not a baseline
+        if self._baseline_hour != self.hours.head:
+            self._baselines, self._baseline_hour = {}, self.hours.head
+        if key not in self._baselines:
+            history = self.hours.history(key, self.baseline_hours)
+            mean = sum(history) / len(history)
+            std = (sum((h - mean) ** 2 for h in history) / len(history)) ** 0.5
+            # Counts are roughly Poisson -> never trust a spread below sqrt(mean) (or 1)
+            self._baselines[key] = (mean, mean + self.z_threshold * max(std, mean ** 0.5, 1.0))
+        mean, threshold = self._baselines[key]
+        if count > threshold:
+            self._alerted.add((key, self.hours.head))
+            self.alerts.append({'complaint_type': key[0], 'state': key[1], 'count': count,
+                                'baseline': round(mean, 2), 'threshold': round(threshold, 2),
+                                'hour': (EPOCH + timedelta(hours=self.hours.head)).strftime('%d-%b-%Y %I:00 %p'),
+                                'hour_bucket': self.hours.head})
+            # Bounded: forget flags for hours that left the window
+            self._alerted = {k for k in self._alerted if k[1] > self.hours.head - self.hours.n_buckets}
+
+    # --- Reads (constant time) ---
+    def summary(self, now=None):
+        seconds = to_seconds(now or datetime.now())
+        with self._lock:
+            for window in (self.minutes, self.hours, self.days):
+                window.advance(seconds)
+            return {
+                'this_minute': self.minutes.current(),
+                'last_hour': self.minutes.totals[None],
+                'this_hour': self.hours.current(),
+                'today': self.days.current(),
+                'last_30_days': self.days.totals[None],
+            }
+
+    def top_keys(self, window='hours', n=5, all_states=False):
+        # Busiest (type, state) keys over a whole window
+        with self._lock:
+            totals = getattr(self, window).totals
+            keys = [(k, c) for k, c in totals.items() if k is not None and (k[1] == ALL_STATES) == all_states]
+        return sorted(keys, key=lambda item: item[1], reverse=True)[:n]
+
+    def recent_alerts(self, hours=2, now=None):
+        head = int(to_seconds(now or datetime.now()) // 3600)
+        with self._lock:
+            return [a for a in self.alerts if head - a['hour_bucket'] < hours]
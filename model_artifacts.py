@@ -0,0 +1,61 @@
+import json
+import os
+import time
+
+# --- Model Artifact Files (one place for every script/page) ---
+MODEL_FILE = 'type_classifier_model.pkl'
+VECTORIZER_FILE = 'tfidf_type_vectorizer.pkl'
+# Resolution model: P(ticket gets resolved) from the complaint text (resolution_scores.py)
+RESOLUTION_MODEL_FILE = 'log_reg_resolution_model.pkl'
+RESOLUTION_VECTORIZER_FILE = 'tfidf_vectorizer.pkl'
+PROCESSED_FILE = 'processed_data_for_dashboard.csv'
+# Sits next to the model: which data rows the current model has already learned from
+STATE_FILE = 'model_state.json'
+
+
+def _atomic_dump(obj, path):
+    # Write to a temp file and swap it in -> pages never load a half-written pickle
+    import joblib  # Lazy: the login page imports this module and never writes a model
+    tmp_path = f"{path}.tmp"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def save_model_artifacts(model, vectorizer, model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE):
+    _atomic_dump(vectorizer, vectorizer_path)
+    _atomic_dump(model, model_path)
+
+
+def artifact_version(path=MODEL_FILE):
+    # Cheap change detector: changes whenever the file is rewritten
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def read_model_state(path=STATE_FILE):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_model_state(row_offset, last_ticket=None, source='', path=STATE_FILE, model_path=MODEL_FILE, **extra):
+    # High-water mark: rows [0, row_offset) of PROCESSED_FILE are already in the model
+    version = artifact_version(model_path)
+    state = {
+        'row_offset': int(row_offset),
+        'last_ticket': None if last_ticket is None else str(last_ticket),
+        'source': source,
+        # Lets readers notice the model was replaced without this state file being updated
+        'model_version': None if version is None else list(version),
+        'updated_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        **extra,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+    return state
@@ -0,0 +1,137 @@
+import importlib
+import os
+import subprocess
+import sys
+import threading
+import time
+from model_artifacts import MODEL_FILE, PROCESSED_FILE, VECTORIZER_FILE, artifact_version
+
+# --- Startup: model artifacts in the background ---
+# Home.py used to run _train_model.py synchronously at import time when the model was missing,
+# so the first visitor's login page hung for the whole training run. Now the first page of a
+# server process starts ONE background thread that:
+#   1. trains (runs _train_model.py in a subprocess) if any artifact below is missing
+#   2. loads the model + vectorizer and imports the heavy modules the pages use
+# while the login page renders straight away. Pages read the state and wait / explain:
+#   pending -> [training ->] loading -> ready      (or failed, with the reason; retry with start(retry=True))
+# Agent Mode needs 'ready'; the Manager Dashboard only has to wait while training rewrites the seed CSV.
+
+TRAIN_SCRIPT = '_train_model.py'
+REQUIRED_FILES = [MODEL_FILE, VECTORIZER_FILE, PROCESSED_FILE]
+# Imported by the pages, not by the login page -> loaded here so the first page visit is warm
+WARM_MODULES = ['pandas', 'plotly.express']
+
+STATE_MESSAGES = {
+    'pending': "Starting up...",
+    'training': "Training the complaint classifier (first start on this machine)...",
+    'loading': "Loading the complaint classifier...",
+    'ready': "AI model ready.",
+    'failed': "AI model could not be prepared.",
+}
+
+
+class ModelBootstrap:
+    def __init__(self, model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE, required_files=None,
+                 train_command=None, warm_modules=None):
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.required_files = REQUIRED_FILES if required_files is None else required_files
+        self.train_command = train_command or [sys.executable, TRAIN_SCRIPT]
+        self.warm_modules = WARM_MODULES if warm_modules is None else warm_modules
+        self.state = 'pending'
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._models = None  # (artifact version, model, vectorizer)
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+
+    def start(self, retry=False):
+        # Idempotent: every page calls it, only the first call starts the thread
+        with self._lock:
+            if self._thread is None or (retry and self.state == 'failed'):
+                self.error, self.finished_at = None, None
+                self._done.clear()
+                self.started_at = time.monotonic()
+                # Decided here, not in the thread -> a page reading the state right after sees it
+                self.state = 'training' if self.missing_files() else 'loading'
+                self._thread = threading.Thread(target=self._run, name='model-bootstrap', daemon=True)
+                self._thread.start()
+        return self
+
+    def missing_files(self):
+        return [path for path in self.required_files if not os.path.exists(path)]
+
+    def _run(self):
+        try:
+            if self.state == 'training':
+                print(f"INFO: Missing {', '.join(self.missing_files())} -> running {' '.join(self.train_command[1:])} in the background.")
+                result = subprocess.run(self.train_command, capture_output=True, text=True)
+                if result.returncode != 0:
+                    tail = (result.stderr or result.stdout).strip().splitlines()[-1:] or ['no output']
+                    raise RuntimeError(f"{' '.join(self.train_command[1:])} exited with code {result.returncode}: {tail[0]}")
+                missing = self.missing_files()
+                if missing:
+                    raise RuntimeError(f"Training finished but {', '.join(missing)} is still missing.")
+                print("INFO: Background training finished.")
+            self.state = 'loading'
+            self.load_models(artifact_version(self.model_path))
+            for module in self.warm_modules:
+                try:
+                    importlib.import_module(module)
+                except ImportError as e:
+                    print(f"WARNING: Could not pre-import {module}. Error: {e}")
+            self.state = 'ready'
+        except Exception as e:
+            self.error = str(e)
+            self.state = 'failed'
+            print(f"ERROR: Model bootstrap failed. Error: {e}")
+        finally:
+            self.finished_at = time.monotonic()
+            self._done.set()
+
+    def load_models(self, model_version):
+        # (model, vectorizer) for this artifact version; the copy loaded at startup is reused,
+        # a newer version (retrain / _update_model.py) is loaded from disk
+        models = self._models
+        if models is None or models[0] != model_version:
+            import joblib
+            models = (model_version, joblib.load(self.model_path), joblib.load(self.vectorizer_path))
+            self._models = models
+        return models[1], models[2]
+
+    @property
+    def ready(self):
+        return self.state == 'ready'
+
+    @property
+    def training(self):
+        return self.state == 'training'
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def status(self):
+        message = STATE_MESSAGES[self.state]
+        if self.state == 'failed':
+            message = f"{message} {self.error}"
+        return {'state': self.state, 'message': message, 'seconds': self.elapsed()}
+
+
+_BOOTSTRAP = None
+_BOOTSTRAP_LOCK = threading.Lock()
+
+
+def get_bootstrap():
+    # One bootstrap per server process, started by whichever page is opened first
+    global _BOOTSTRAP
+    with _BOOTSTRAP_LOCK:
+        if _BOOTSTRAP is None:
+            _BOOTSTRAP = ModelBootstrap()
+        return _BOOTSTRAP.start()
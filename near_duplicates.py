@@ -0,0 +1,250 @@
+import zlib
+from collections import deque
+import numpy as np
+import pandas as pd
+from timeutil import ticket_time, to_seconds
+
+# --- Near-Duplicate Complaints (MinHash LSH at ingestion -> incidents) ---
+# Every new ticket gets a MinHash signature of its cleaned text (character 5-gram shingles).
+# Signatures are split into bands; a ticket is only compared with recent tickets that share a band
+# AND its zip code (dict lookups, no scan), and linked to them when the estimated Jaccard similarity
+# clears the threshold and the two were filed within window_hours of each other. Tickets without a
+# zip code (Agent Mode files 0 / 'Not Provided') are never linked.
+# Linked tickets form one incident (id = row_id of its first ticket), stored in the ticket_incidents
+# table inside the same insert transaction. Memory holds only the retention window (and at most
+# max_tickets signatures); older tickets fall off the left of the index.
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: ~100% recall at 0.8 similarity, ~5% at 0.4
+SHINGLE = 5
+WINDOW_HOURS = 72
+THRESHOLD = 0.8
+MAX_TICKETS = 100_000
+
+_rng = np.random.default_rng(20150422)
+_A = _rng.integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)  # Odd multipliers
+_B = _rng.integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+_INDEX_COLUMNS = ['row_id', 'Cleaned_Complaint', 'Customer_Complaint', 'Zip_code', 'Date', 'Time']
+
+
+def shingles(text):
+    text = ' '.join(str(text).split())
+    if len(text) <= SHINGLE:
+        return {text}
+    return {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+
+
+def minhash(text):
+    # NUM_PERM x (multiply-shift hash of each shingle's crc32), minimum per row
+    hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles(text)), dtype=np.uint64)
+    return ((np.outer(_A, hashes) + _B[:, None]) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def _clean(ticket):
+    text = ticket.get('Cleaned_Complaint')
+    if text is None or pd.isna(text):
+        from featurize import clean_text  # Only for tickets stored without a cleaned text
+        text = clean_text(str(ticket.get('Customer_Complaint') or ''))
+    return text
+
+
+def _zip(ticket):
+    # None for tickets without a real zip: Agent Mode files Zip_code 0 / 'Not Provided', and linking
+    # those would merge unrelated customers' complaints into one "zip 0" incident
+    value = ticket.get('Zip_code')
+    try:
+        zip_code = int(value)
+    except (TypeError, ValueError):
+        return None
+    return zip_code if zip_code > 0 else None
+
+
+class NearDuplicateIndex:
+    def __init__(self, window_hours=WINDOW_HOURS, threshold=THRESHOLD, max_tickets=MAX_TICKETS, bands=BANDS):
+        self.window = window_hours * 3600
+        self.threshold = threshold
+        self.max_tickets = max_tickets
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.entries = {}  # row_id -> (seconds, zip, signature, incident_id)
+        # hash of (zip, band, band values) -> row_id, or [row_id, ...] once shared (most buckets hold one
+        # ticket -> no list per bucket). Hash collisions only add candidates, which are then compared.
+        self.buckets = {}
+        self.order = deque()  # row_ids in arrival order (eviction from the left)
+        self.newest = None
+
+    def _keys(self, zip_code, signature):
+        return [hash((zip_code, band, signature[band * self.rows:(band + 1) * self.rows].tobytes()))
+                for band in range(self.bands)]
+
+    def _evict(self):
+        horizon = None if self.newest is None else self.newest - self.window
+        while self.order:
+            row_id = self.order[0]
+            seconds, zip_code, signature, _ = self.entries[row_id]
+            if len(self.order) <= self.max_tickets and (horizon is None or seconds >= horizon):
+                break
+            self.order.popleft()
+            del self.entries[row_id]
+            for key in self._keys(zip_code, signature):
+                bucket = self.buckets[key]
+                if isinstance(bucket, list):
+                    bucket.remove(row_id)
+                    if len(bucket) == 1:
+                        self.buckets[key] = bucket[0]
+                else:
+                    del self.buckets[key]
+
+    def prepare(self, ticket):
+        # (seconds, zip, signature), or None without a usable Date/Time or zip code (never linked)
+        moment, zip_code = ticket_time(ticket), _zip(ticket)
+        if moment is None or zip_code is None:
+            return None
+        return to_seconds(moment), zip_code, minhash(_clean(ticket))
+
+    def match(self, prepared):
+        # (incident_id, similarity) of the closest earlier ticket within the window, or (None, None)
+        seconds, zip_code, signature = prepared
+        candidates = set()
+        for key in self._keys(zip_code, signature):
+            bucket = self.buckets.get(key)
+            if isinstance(bucket, list):
+                candidates.update(bucket)
+            elif bucket is not None:
+                candidates.add(bucket)
+        best = None
+        for row_id in candidates:
+            other_seconds, _, other_signature, incident_id = self.entries[row_id]
+            if abs(seconds - other_seconds) > self.window:
+                continue
+            similarity = float((signature == other_signature).mean())
+            if similarity >= self.threshold and (best is None or (similarity, -row_id) > (best[1], -best[2])):
+                best = (incident_id, similarity, row_id)
+        return (best[0], best[1]) if best else (None, None)
+
+    def add(self, row_id, prepared, incident_id=None):
+        seconds, zip_code, signature = prepared
+        self.entries[row_id] = (seconds, zip_code, signature, incident_id or row_id)
+        for key in self._keys(zip_code, signature):
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                self.buckets[key] = row_id
+            elif isinstance(bucket, list):
+                bucket.append(row_id)
+            else:
+                self.buckets[key] = [bucket, row_id]
+        self.order.append(row_id)
+        self.newest = seconds if self.newest is None else max(self.newest, seconds)
+        self._evict()
+
+    def observe(self, ticket):
+        # Check + add in one go -> (incident_id, similarity) if it duplicates a recent ticket
+        prepared = self.prepare(ticket)
+        if prepared is None:
+            return None, None
+        incident_id, similarity = self.match(prepared)
+        self.add(int(ticket['row_id']), prepared, incident_id)
+        return incident_id, similarity
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class IncidentTable:
+    # Derived table of the ticket store: row_id -> incident_id for every ticket linked to an
+    # earlier near-duplicate (the first ticket of an incident has no row; its row_id IS the id).
+    table = 'ticket_incidents'
+    revision = 2  # 2: tickets without a zip code are no longer linked -> existing links are rebuilt once
+
+    def __init__(self, window_hours=WINDOW_HOURS, threshold=THRESHOLD, max_tickets=MAX_TICKETS):
+        self.params = {'window_hours': window_hours, 'threshold': threshold, 'max_tickets': max_tickets}
+        self.index = None  # Built lazily from the newest tickets (see _warm_start)
+        self.last_row_id = 0
+
+    @property
+    def window_hours(self):
+        return self.params['window_hours']
+
+    def create(self, conn):
+        conn.execute('CREATE TABLE IF NOT EXISTS ticket_incidents (row_id INTEGER PRIMARY KEY, '
+                     'incident_id INTEGER NOT NULL, similarity REAL NOT NULL)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_ticket_incidents_incident ON ticket_incidents(incident_id)')
+
+    def reset(self):
+        # After a rollback the in-memory index may hold tickets that were never stored
+        self.index = None
+
+    def _warm_start(self, conn, before_row_id, chunksize=1000):
+        # Newest tickets backwards until a whole chunk is older than the window (or max_tickets),
+        # then into the index oldest-first with the links already recorded for them
+        self.index = NearDuplicateIndex(**self.params)
+        cols = ', '.join(f't."{c}"' for c in _INDEX_COLUMNS)
+        cursor = conn.execute(f'SELECT {cols}, i.incident_id FROM tickets t LEFT JOIN ticket_incidents i '
+                              f'USING (row_id) WHERE t.row_id < ? ORDER BY t.row_id DESC LIMIT ?',
+                              (before_row_id, self.params['max_tickets']))
+        recent, newest = [], None
+        while True:
+            rows = cursor.fetchmany(chunksize)
+            prepared = [(dict(zip(_INDEX_COLUMNS, values)), incident_id) for *values, incident_id in rows]
+            prepared = [(t['row_id'], self.index.prepare(t), i) for t, i in prepared]
+            prepared = [p for p in prepared if p[1] is not None]
+            if newest is None and prepared:
+                newest = max(p[1][0] for p in prepared)
+            if not rows or (newest is not None and all(p[1][0] < newest - self.index.window for p in prepared)):
+                break
+            recent += prepared
+        for row_id, ticket, incident_id in reversed(recent):
+            self.index.add(row_id, ticket, incident_id)
+        self.last_row_id = before_row_id - 1
+
+    def _catch_up(self, conn, before_row_id):
+        # Tickets other processes stored since this index last looked, with their recorded links
+        # (plain cursor: this runs on every insert and is almost always empty)
+        if self.index is None:
+            self._warm_start(conn, before_row_id)
+            return
+        cols = ', '.join(f't."{c}"' for c in _INDEX_COLUMNS)
+        rows = conn.execute(f'SELECT {cols}, i.incident_id FROM tickets t LEFT JOIN ticket_incidents i '
+                            f'USING (row_id) WHERE t.row_id > ? AND t.row_id < ? ORDER BY t.row_id',
+                            (self.last_row_id, before_row_id))
+        for *values, incident_id in rows:
+            prepared = self.index.prepare(dict(zip(_INDEX_COLUMNS, values)))
+            if prepared is not None:
+                self.index.add(values[0], prepared, incident_id)
+        self.last_row_id = max(self.last_row_id, before_row_id - 1)
+
+    def link(self, conn, ticket):
+        # Inside the insert transaction, right after the ticket's INSERT -> (incident_id, similarity)
+        row_id = int(ticket['row_id'])
+        self._catch_up(conn, row_id)
+        incident_id, similarity = self.index.observe(ticket)
+        self.last_row_id = row_id
+        if incident_id is not None:
+            conn.execute('INSERT OR REPLACE INTO ticket_incidents VALUES (?, ?, ?)', (row_id, incident_id, similarity))
+        return incident_id, similarity
+
+    def rebuild(self, conn, chunksize=100_000):
+        # Replay every ticket in ingestion (row_id) order through a fresh index
+        conn.execute('DELETE FROM ticket_incidents')
+        self.index, self.last_row_id = NearDuplicateIndex(**self.params), 0
+        cols = ', '.join(f'"{c}"' for c in _INDEX_COLUMNS)
+        for chunk in pd.read_sql_query(f'SELECT {cols} FROM tickets ORDER BY row_id', conn, chunksize=chunksize):
+            links = []
+            for ticket in chunk.to_dict('records'):
+                incident_id, similarity = self.index.observe(ticket)
+                if incident_id is not None:
+                    links.append((ticket['row_id'], incident_id, similarity))
+                self.last_row_id = ticket['row_id']
+            conn.executemany('INSERT INTO ticket_incidents VALUES (?, ?, ?)', links)
+
+    def summary(self, conn, limit=20, min_tickets=2):
+        # Biggest incidents: first ticket + member counts (open = Unresolved)
+        return pd.read_sql_query(
+            'WITH members AS (SELECT incident_id, row_id FROM ticket_incidents '
+            '                 UNION SELECT incident_id, incident_id FROM ticket_incidents) '
+            'SELECT m.incident_id, r."Ticket_#", r."Customer_Complaint", r."City", r."Zip_code", '
+            '       COUNT(*) AS tickets, SUM(t."Status_Group" = \'Unresolved\') AS open_tickets, '
+            '       MIN(t.row_id) AS first_row_id, MAX(t.row_id) AS last_row_id '
+            'FROM members m JOIN tickets t ON t.row_id = m.row_id JOIN tickets r ON r.row_id = m.incident_id '
+            'GROUP BY m.incident_id HAVING COUNT(*) >= ? ORDER BY tickets DESC, last_row_id DESC LIMIT ?',
+            conn, params=(min_tickets, limit))
@@ -0,0 +1,54 @@
+import threading
+from collections import OrderedDict
+
+# --- Prediction Cache (LRU) ---
+# Keyed on the clean_text() output, so "Comcast Internet Speed!!" and "comcast internet speed"
+# share one entry. Tied to a model version: when the artifact changes, every entry is dropped.
+
+
+class PredictionCache:
+    def __init__(self, maxsize=10_000):
+        self.maxsize = maxsize
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # Shared by every Streamlit session in the server process
+
+    def get_or_compute(self, key, compute_fn, model_version=None):
+        with self._lock:
+            if model_version != self.model_version:
+                # New model on disk -> old predictions are no longer valid
+                self._entries.clear()
+                self.model_version = model_version
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock so one slow predict doesn't block other sessions
+        value = compute_fn()
+
+        with self._lock:
+            if model_version == self.model_version:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,113 @@
+import argparse
+import hashlib
+import time
+import joblib
+from featurize import clean_texts, file_fingerprint
+from model_artifacts import RESOLUTION_MODEL_FILE, RESOLUTION_VECTORIZER_FILE
+from ticket_store import DB_FILE, get_store
+
+# --- Backlog Resolution Scoring (pipeline stage) ---
+# Every open (Unresolved) ticket gets P(resolved) from log_reg_resolution_model.pkl +
+# tfidf_vectorizer.pkl, stored in the tickets.resolution_score column -> the desk sorts on it
+# with an index, nothing is computed while the page renders.
+# Incremental: a run only scores open tickets whose score is NULL (new tickets, re-opened tickets
+# that were never scored), found through the (Status_Group, resolution_score) index. A different
+# model (file content changed) clears every score first, so the whole backlog is re-scored.
+# Work is done in batches: one sparse transform + one predict_proba + one UPDATE transaction each.
+# Usage: python resolution_scores.py               -> one run + throughput report
+#        python resolution_scores.py --every 300   -> keep scoring new tickets every 5 minutes
+#        python resolution_scores.py --full        -> re-score the whole backlog
+
+BATCH_SIZE = 50_000
+RESOLVED_CLASS = 1  # Label the model was trained with for Resolved tickets
+
+
+def model_fingerprint(model_path=RESOLUTION_MODEL_FILE, vectorizer_path=RESOLUTION_VECTORIZER_FILE):
+    # Positive 60-bit integer (store_meta holds integers); changes with either file's content
+    digest = hashlib.sha256((file_fingerprint(model_path) + file_fingerprint(vectorizer_path)).encode())
+    return int(digest.hexdigest()[:15], 16) or 1
+
+
+class ResolutionScorer:
+    def __init__(self, model_path=RESOLUTION_MODEL_FILE, vectorizer_path=RESOLUTION_VECTORIZER_FILE):
+        self.model = joblib.load(model_path)
+        self.vectorizer = joblib.load(vectorizer_path)
+        self.fingerprint = model_fingerprint(model_path, vectorizer_path)
+        self._column = list(self.model.classes_).index(RESOLVED_CLASS)
+
+    def transform(self, cleaned_texts):
+        return self.vectorizer.transform(cleaned_texts)
+
+    def predict(self, X):
+        return self.model.predict_proba(X)[:, self._column]
+
+    def score_texts(self, cleaned_texts):
+        return self.predict(self.transform(cleaned_texts))
+
+
+def score_backlog(store=None, scorer=None, batch_size=BATCH_SIZE, full=False):
+    # One run of the stage -> report dict (counts + seconds per phase + throughput)
+    store = store or get_store()
+    scorer = scorer or ResolutionScorer()
+    report = {'rescored_all': False, 'scored': 0, 'batches': 0,
+              'read_s': 0.0, 'vectorize_s': 0.0, 'predict_s': 0.0, 'write_s': 0.0}
+    start = time.perf_counter()
+    if full or store.resolution_model() != scorer.fingerprint:
+        store.reset_resolution_scores(scorer.fingerprint)
+        report['rescored_all'] = True
+
+    last_row_id = 0
+    while True:
+        t0 = time.perf_counter()
+        batch = store.unscored_tickets(batch_size, after_row_id=last_row_id)
+        t1 = time.perf_counter()
+        report['read_s'] += t1 - t0
+        if batch.empty:
+            break
+        texts = batch['Cleaned_Complaint'].where(batch['Cleaned_Complaint'].notna(),
+                                                 clean_texts(batch['Customer_Complaint'].fillna('')))
+        X = scorer.transform(texts.astype(str))
+        t2 = time.perf_counter()
+        scores = scorer.predict(X)
+        t3 = time.perf_counter()
+        store.set_resolution_scores(batch['row_id'], scores)
+        report['vectorize_s'] += t2 - t1
+        report['predict_s'] += t3 - t2
+        report['write_s'] += time.perf_counter() - t3
+        report['scored'] += len(batch)
+        report['batches'] += 1
+        last_row_id = int(batch['row_id'].iloc[-1])
+
+    report['seconds'] = time.perf_counter() - start
+    report['tickets_per_s'] = report['scored'] / max(report['seconds'], 1e-9)
+    report['backlog'] = store.count_tickets(status_group='Unresolved')
+    return report
+
+
+def format_report(report):
+    scope = "whole backlog" if report['rescored_all'] else "new / unscored tickets"
+    lines = [f"✅ Scored {report['scored']:,} open tickets ({scope}) in {report['seconds']:.2f}s "
+             f"({report['tickets_per_s']:,.0f} tickets/sec, {report['batches']} batch(es)). "
+             f"Backlog: {report['backlog']:,} open tickets."]
+    if report['scored']:
+        phases = ['read', 'vectorize', 'predict', 'write']
+        lines.append('   ' + ' | '.join(f"{p} {report[p + '_s']:.2f}s "
+                                         f"({report['scored'] / max(report[p + '_s'], 1e-9):,.0f}/s)" for p in phases))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Score the open-ticket backlog with the resolution model.")
+    parser.add_argument('--db', default=DB_FILE)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--full', action='store_true', help="Re-score every open ticket, not just new ones")
+    parser.add_argument('--every', type=float, default=None, help="Repeat every N seconds")
+    args = parser.parse_args()
+
+    store, scorer = get_store(args.db), ResolutionScorer()
+    while True:
+        print(format_report(score_backlog(store, scorer, args.batch_size, args.full)))
+        if not args.every:
+            break
+        args.full = False
+        time.sleep(args.every)
@@ -0,0 +1,88 @@
+import pandas as pd
+
+# --- Pre-aggregated Ticket Counters (rollup tables inside the ticket store) ---
+# Each rollup is a SQLite table of (dimensions..., n). The ticket store adjusts it in the SAME
+# transaction as the write (+1 on insert, -1/+1 around a status change), so the counters can never
+# drift from the tickets table. Readers sum over groups -> O(groups) instead of O(rows).
+# rebuild() recomputes a table from scratch (python ticket_store.py rebuild-rollups).
+
+# dd-mm-yyyy -> yyyy-mm-dd (sortable, and what pd.to_datetime reads without a format)
+DAY_SQL = """substr("Date", 7, 4) || '-' || substr("Date", 4, 2) || '-' || substr("Date", 1, 2)"""
+MONTH_SQL = """substr("Date", 7, 4) || '-' || substr("Date", 4, 2)"""
+
+
+class Rollup:
+    def __init__(self, table, dimensions):
+        # dimensions = {column name: SQL expression over one tickets row}
+        self.table = table
+        self.dimensions = dimensions
+        names = ', '.join(dimensions)
+        # NULL never equals NULL in a primary key -> missing values count under ''
+        exprs = ', '.join(f"COALESCE({expr}, '')" for expr in dimensions.values())
+        self.schema_sql = (f'CREATE TABLE IF NOT EXISTS {table} ('
+                           + ''.join(f'{name} TEXT NOT NULL, ' for name in dimensions)
+                           + f'n INTEGER NOT NULL, PRIMARY KEY ({names})) WITHOUT ROWID')
+        self._apply_sql = (f'INSERT INTO {table} ({names}, n) SELECT {exprs}, ? FROM tickets WHERE row_id = ? '
+                           f'ON CONFLICT ({names}) DO UPDATE SET n = n + excluded.n')
+        self._prune_sql = (f'DELETE FROM {table} WHERE n = 0 AND ({names}) = '
+                           f'(SELECT {exprs} FROM tickets WHERE row_id = ?)')
+        self._rebuild_sql = (f'INSERT INTO {table} ({names}, n) SELECT {exprs}, COUNT(*) FROM tickets '
+                             f'GROUP BY {", ".join(str(i + 1) for i in range(len(dimensions)))}')
+
+    def create(self, conn):
+        conn.execute(self.schema_sql)
+
+    def apply(self, conn, row_id, sign=1):
+        # Counts the ticket's CURRENT row -> call with -1 before changing it and +1 after
+        conn.execute(self._apply_sql, (sign, row_id))
+        if sign < 0:
+            conn.execute(self._prune_sql, (row_id,))
+
+    def rebuild(self, conn):
+        conn.execute(f'DELETE FROM {self.table}')
+        conn.execute(self._rebuild_sql)
+
+    def counts(self, conn, by=(), where=None):
+        # SUM(n) grouped by some of the dimensions, optionally filtered on others (exact match)
+        by, where = list(by), dict(where or {})
+        unknown = [d for d in by + list(where) if d not in self.dimensions]
+        if unknown:
+            raise ValueError(f"Unknown {self.table} dimension(s): {unknown}")
+        sql = f'SELECT {"".join(f"{d}, " for d in by)}SUM(n) AS n FROM {self.table}'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(f'{d} = ?' for d in where)
+        if by:
+            sql += f' GROUP BY {", ".join(by)} ORDER BY n DESC'
+        df = pd.read_sql_query(sql, conn, params=tuple(where.values()))
+        df['n'] = df['n'].fillna(0).astype('int64')
+        return df
+
+
+# Dashboard KPIs + charts: day x state x complaint type x status
+DAILY_ROLLUP = Rollup('rollup_daily', {
+    'day': DAY_SQL,
+    'state': '"State"',
+    'complaint_type': '"Complaint_Type"',
+    'status_group': '"Status_Group"',
+})
+
+# Geographic cube for drill-downs: State -> City -> Zip, sliceable by type, status and month.
+# Primary key order = drill order, so "cities of one state" is an index range scan.
+GEO_CUBE = Rollup('rollup_geo', {
+    'state': '"State"',
+    'city': '"City"',
+    'zip_code': '"Zip_code"',
+    'complaint_type': '"Complaint_Type"',
+    'status_group': '"Status_Group"',
+    'month': MONTH_SQL,
+})
+
+# Coarser cuboid of the same cube for the top (all states) level -> no scan of every zip cell
+GEO_STATE_CUBE = Rollup('rollup_geo_state', {
+    'state': '"State"',
+    'complaint_type': '"Complaint_Type"',
+    'status_group': '"Status_Group"',
+    'month': MONTH_SQL,
+})
+
+ROLLUPS = [DAILY_ROLLUP, GEO_CUBE, GEO_STATE_CUBE]
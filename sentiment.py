@@ -0,0 +1,121 @@
+import re
+import numpy as np
+import pandas as pd
+
+# --- Customer Sentiment (lexicon based) ---
+NEGATIVE_WORDS = ['slow', 'not working', 'disconnected', 'high bill', 'overcharged', 'rude', 'unhappy', 'worst', 'bad', 'angry', 'terrible', 'frustrated']
+POSITIVE_WORDS = ['solved', 'fixed', 'thank', 'great', 'happy', 'good', 'satisfied', 'resolved']
+
+SENTIMENT_EMOJI = {'Negative': '😡', 'Positive': '😊', 'Neutral': '😐'}
+
+
+def _self_overlaps(word):
+    # e.g. 'aa' in 'aaa': str.count gives 1 but a lookahead scan would find 2
+    return any(word[:i] == word[-i:] for i in range(1, len(word)))
+
+
+def _prefix_free_layers(words):
+    # Words in one layer never start at the same position as each other (no word is a
+    # prefix of another), so a single lookahead scan counts every one of them exactly.
+    layers = []
+    for word in sorted(words, key=len, reverse=True):
+        for layer in layers:
+            if not any(other.startswith(word) or word.startswith(other) for other in layer):
+                layer.append(word)
+                break
+        else:
+            layers.append([word])
+    return layers
+
+
+class SentimentEngine:
+    # Compiles both lexicons into ONE matcher: every text is scanned once (per layer; the
+    # default lexicon needs a single layer) and each hit is credited to its polarity.
+    # Counting rules are the same as summing text.count(word) over the word lists.
+    def __init__(self, negative_words=None, positive_words=None):
+        self.negative_words = list(NEGATIVE_WORDS if negative_words is None else negative_words)
+        self.positive_words = list(POSITIVE_WORDS if positive_words is None else positive_words)
+
+        # word -> (negative weight, positive weight); a word listed in both counts for both
+        self._weights = {}
+        for word in self.negative_words:
+            neg, pos = self._weights.get(word.lower(), (0, 0))
+            self._weights[word.lower()] = (neg + 1, pos)
+        for word in self.positive_words:
+            neg, pos = self._weights.get(word.lower(), (0, 0))
+            self._weights[word.lower()] = (neg, pos + 1)
+        words = [w for w in self._weights if w]
+
+        # Rare case: self-overlapping words keep plain str.count semantics
+        self._count_words = [w for w in words if _self_overlaps(w)]
+        scan_words = [w for w in words if not _self_overlaps(w)]
+        self._patterns = [re.compile('(?=(' + '|'.join(re.escape(w) for w in layer) + '))')
+                          for layer in _prefix_free_layers(scan_words)]
+        # Cheap pre-filter for Series mode: a text matching none of the words is Neutral
+        self._any_word_pattern = '|'.join(re.escape(w) for w in words)
+
+    def counts(self, text):
+        text = str(text).lower()
+        neg_count = pos_count = 0
+        for pattern in self._patterns:
+            for word in pattern.findall(text):
+                neg, pos = self._weights[word]
+                neg_count += neg
+                pos_count += pos
+        for word in self._count_words:
+            n = text.count(word)
+            neg, pos = self._weights[word]
+            neg_count += n * neg
+            pos_count += n * pos
+        return neg_count, pos_count
+
+    def analyze(self, text):
+        neg_count, pos_count = self.counts(text)
+        if neg_count > pos_count and neg_count >= 1:
+            return 'Negative'
+        elif pos_count > neg_count and pos_count >= 1:
+            return 'Positive'
+        else:
+            return 'Neutral'
+
+    def score_series(self, texts):
+        # Vectorized mode for whole columns:
+        # 1) lowercase + ONE combined "any lexicon word?" scan over the Series (native string kernels)
+        # 2) exact per-text counts only for the texts that hit, each distinct text scanned once
+        # 3) labels for every row with np.select
+        lowered = pd.Series(texts).astype(str).str.lower()
+        neg = np.zeros(len(lowered), dtype=np.int64)
+        pos = np.zeros(len(lowered), dtype=np.int64)
+
+        if self._any_word_pattern:
+            has_hit = lowered.str.contains(self._any_word_pattern, regex=True).to_numpy(dtype=bool)
+            if has_hit.any():
+                codes, uniques = pd.factorize(lowered[has_hit])
+                counts = np.array([self.counts(t) for t in uniques], dtype=np.int64).reshape(-1, 2)
+                neg[has_hit] = counts[:, 0][codes]
+                pos[has_hit] = counts[:, 1][codes]
+
+        labels = np.select([(neg > pos) & (neg >= 1), (pos > neg) & (pos >= 1)],
+                           ['Negative', 'Positive'], default='Neutral').astype(object)
+        return pd.Series(labels, index=lowered.index, dtype=object)
+
+
+DEFAULT_ENGINE = SentimentEngine()
+
+
+def analyze_sentiment(text):
+    return DEFAULT_ENGINE.analyze(text)
+
+
+def score_sentiments(texts):
+    return DEFAULT_ENGINE.score_series(texts)
+
+
+# Same rule Agent Mode uses for its "Priority Level" card
+def priority_level(sentiment):
+    return 'HIGH' if sentiment == 'Negative' else 'MEDIUM'
+
+
+def priority_levels(sentiments):
+    sentiments = pd.Series(sentiments)
+    return sentiments.eq('Negative').map({True: 'HIGH', False: 'MEDIUM'})
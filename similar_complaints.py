@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+# --- Similar Past Complaints (nearest neighbours over the TF-IDF vectors) ---
+# Exact top-k cosine similarity over every stored ticket's Cleaned_Complaint vector.
+# The index is an inverted index = the TF-IDF matrix in CSC form (per term: sorted ticket positions
+# + weights), persisted next to the database (<db>_similar.npz) and loaded once per process.
+# A query reads only the postings lists of its own terms (CSC column slices, one sparse mat-vec)
+# and ranks only the tickets that can still make the top k -> no pass over every ticket's vector.
+# Incremental: tickets added since the last sync (any process) are vectorised into a small
+# "tail" matrix that is scanned directly; the tail is merged into the main index (and the file
+# re-saved) once it holds TAIL_LIMIT tickets, and is simply re-read after a restart.
+# A different vectorizer (retrain) or a store rebuild (seed import) re-indexes everything.
+
+TAIL_LIMIT = 20_000
+INDEX_CHUNK = 100_000
+
+
+def vectorizer_fingerprint(vectorizer):
+    # Same vocabulary + idf -> same vectors (a re-saved but unchanged vectorizer keeps the index)
+    digest = hashlib.sha256(json.dumps(vectorizer.get_params(), sort_keys=True, default=str).encode())
+    vocabulary = getattr(vectorizer, 'vocabulary_', None)
+    if vocabulary is not None:
+        digest.update(json.dumps(sorted((term, int(i)) for term, i in vocabulary.items())).encode())
+    idf = getattr(vectorizer, 'idf_', None)
+    if idf is not None:
+        digest.update(np.asarray(idf, dtype='float64').tobytes())
+    return digest.hexdigest()[:16]
+
+
+class SimilarityTable:
+    # Registered with TicketStore like the rollups / escalations, but holds no rows: rebuild() bumps
+    # a generation counter so every process drops its index (row_ids were rewritten).
+    table = 'similar_index'
+
+    def create(self, conn):
+        conn.execute("INSERT OR IGNORE INTO store_meta VALUES ('similar_generation', 0)")
+
+    def rebuild(self, conn):
+        conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'similar_generation'")
+
+
+def _top_k(scores, k):
+    if len(scores) <= k:
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+class SimilarComplaints:
+    def __init__(self, store, vectorizer, index_path=None):
+        self.store = store
+        self.vectorizer = vectorizer
+        self.fingerprint = vectorizer_fingerprint(vectorizer)
+        self.index_path = index_path or f"{os.path.splitext(store.path)[0]}_similar.npz"
+        self._lock = threading.Lock()
+        self._generation = None
+        self._reset()
+
+    def _reset(self):
+        from scipy import sparse  # scipy / sklearn only load once the index is used
+
+        n_terms = len(getattr(self.vectorizer, 'vocabulary_', None) or {}) or self.vectorizer.n_features
+        self._main = sparse.csc_matrix((0, n_terms), dtype=np.float32)
+        self._main_ids = np.zeros(0, dtype=np.int64)
+        self._tail = sparse.csr_matrix((0, n_terms), dtype=np.float32)
+        self._tail_ids = np.zeros(0, dtype=np.int64)
+        self.last_row_id = 0
+
+    # --- Persistence ---
+    def _load(self, generation):
+        from scipy import sparse
+
+        try:
+            with np.load(self.index_path) as f:
+                meta = json.loads(str(f['meta']))
+                if (meta['fingerprint'] != self.fingerprint or meta['generation'] != generation
+                        or meta['last_row_id'] > self.store.max_row_id()):
+                    return False
+                self._main = sparse.csc_matrix((f['data'], f['indices'], f['indptr']), shape=tuple(meta['shape']))
+                self._main_ids = f['row_ids']
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"WARNING: Ignoring unreadable similar-complaints index {self.index_path}. Error: {e}")
+            return False
+        self.last_row_id = meta['last_row_id']
+        return True
+
+    def _save(self):
+        meta = {'fingerprint': self.fingerprint, 'generation': self._generation,
+                'last_row_id': int(self._main_ids[-1]) if len(self._main_ids) else 0, 'shape': self._main.shape}
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, data=self._main.data, indices=self._main.indices, indptr=self._main.indptr,
+                     row_ids=self._main_ids, meta=np.array(json.dumps(meta)))
+        os.replace(tmp_path, self.index_path)
+
+    # --- Indexing ---
+    def _vectorize(self, chunk):
+        from scipy import sparse
+        from featurize import clean_texts
+
+        texts = chunk['Cleaned_Complaint'].where(chunk['Cleaned_Complaint'].notna(),
+                                                 clean_texts(chunk['Customer_Complaint'].fillna('')))
+        X = sparse.csr_matrix(self.vectorizer.transform(texts.astype(str)), dtype=np.float32)
+        X.eliminate_zeros()
+        return X
+
+    def _merge_tail(self):
+        from scipy import sparse
+
+        self._main = sparse.vstack([self._main, self._tail], format='csc', dtype=np.float32)
+        self._main.sort_indices()
+        self._main_ids = np.concatenate([self._main_ids, self._tail_ids])
+        self._tail = self._tail[:0]
+        self._tail_ids = self._tail_ids[:0]
+        self._save()
+
+    def sync(self):
+        # Vectorise tickets added since the last sync. Returns the number of tickets indexed.
+        from scipy import sparse
+
+        conn = self.store.connection()
+        with self._lock:
+            generation = conn.execute("SELECT value FROM store_meta WHERE key = 'similar_generation'").fetchone()[0]
+            if generation != self._generation:
+                self._reset()
+                self._generation = generation
+                self._load(generation)
+            if self.last_row_id >= self.store.max_row_id():
+                return 0  # Up to date (the usual case): one index lookup
+            matrices, row_ids = [self._tail], [self._tail_ids]
+            while True:
+                chunk = pd.read_sql_query('SELECT row_id, "Cleaned_Complaint", "Customer_Complaint" FROM tickets '
+                                          'WHERE row_id > ? ORDER BY row_id LIMIT ?', conn,
+                                          params=(self.last_row_id, INDEX_CHUNK))
+                if len(chunk):
+                    matrices.append(self._vectorize(chunk))
+                    row_ids.append(chunk['row_id'].to_numpy(dtype=np.int64))
+                    self.last_row_id = int(row_ids[-1][-1])
+                if len(chunk) < INDEX_CHUNK:
+                    break
+            indexed = sum(len(ids) for ids in row_ids[1:])
+            self._tail = sparse.vstack(matrices, format='csr', dtype=np.float32)
+            self._tail_ids = np.concatenate(row_ids)
+            # First build (or a big backlog) -> straight into the saved index
+            if len(self._tail_ids) >= TAIL_LIMIT or not len(self._main_ids):
+                self._merge_tail()
+            return indexed
+
+    def __len__(self):
+        return len(self._main_ids) + len(self._tail_ids)
+
+    # --- Queries ---
+    def _query_vector(self, text):
+        from scipy import sparse
+        from featurize import clean_texts
+
+        q = sparse.csr_matrix(self.vectorizer.transform(clean_texts([text])), dtype=np.float32)
+        q.eliminate_zeros()
+        return q
+
+    def _search_main(self, terms, weights, k):
+        # Exact scores of every ticket sharing a term with the query: only those terms' postings are
+        # read (CSC column slices) -> cost = their list lengths, one sparse mat-vec in C
+        scores = self._main[:, terms] @ weights
+        # Top k without sorting every ticket: the k best tickets of the rarest term give a lower bound
+        # for the k-th best score, then only tickets at or above it are ranked
+        rarest = terms[np.argmin(self._main.indptr[terms + 1] - self._main.indptr[terms])]
+        rows = self._main.indices[self._main.indptr[rarest]:self._main.indptr[rarest + 1]]
+        floor = np.sort(scores[rows])[-k] if len(rows) >= k else 0.0
+        positions = np.flatnonzero(scores >= floor) if floor > 0 else np.arange(len(scores))
+        top = positions[_top_k(scores[positions], k)]
+        return top, scores[top]
+
+    def neighbours(self, text, k=5, exclude_row_ids=()):
+        # [(row_id, cosine similarity)], most similar first
+        self.sync()
+        q = self._query_vector(text)
+        if not q.nnz:
+            return []
+        exclude = {int(r) for r in exclude_row_ids}
+        want = k + len(exclude)
+        hits = []
+        with self._lock:
+            if len(self._main_ids):
+                positions, scores = self._search_main(q.indices, q.data, want)
+                hits += zip(self._main_ids[positions].tolist(), scores.tolist())
+            if len(self._tail_ids):
+                tail_scores = (self._tail @ q.T).toarray().ravel()  # Small: scanned directly
+                top = _top_k(tail_scores, want)
+                hits += zip(self._tail_ids[top].tolist(), tail_scores[top].tolist())
+        hits = [(row_id, min(score, 1.0)) for row_id, score in hits if score > 0 and row_id not in exclude]
+        return sorted(hits, key=lambda hit: (-hit[1], -hit[0]))[:k]
+
+    def similar_tickets(self, text, k=5, columns=None, exclude_row_ids=()):
+        # Top-k past tickets as a frame (+ Similarity), most similar first
+        hits = self.neighbours(text, k, exclude_row_ids)
+        columns = columns or ['row_id', 'Ticket_#', 'Date', 'Customer_Complaint', 'Complaint_Type',
+                              'Status', 'Status_Group']
+        if not hits:
+            return pd.DataFrame(columns=columns + ['Similarity'])
+        df = self.store.get_tickets([row_id for row_id, _ in hits], columns)
+        df['Similarity'] = [score for _, score in hits]
+        return df
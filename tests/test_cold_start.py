@@ -0,0 +1,23 @@
+import pytest
+from _bench_cold_start import (HEAVY_MODULES, IMPORT_BUDGET, MODEL_FILES, RENDER_BUDGET, measure_first_render,
+                               measure_imports)
+
+# Cold-start budget of the login page (Home.py), measured in fresh processes by _bench_cold_start.py.
+# A regression (a heavy import creeping into Home.py, training back on the request path, ...) fails here.
+
+
+def test_home_imports_within_budget_and_light():
+    imported = measure_imports()
+    assert imported['heavy'] == [], f"Home.py imports pull in {imported['heavy']} (must stay lazy: {HEAVY_MODULES})"
+    assert imported['seconds'] <= IMPORT_BUDGET, f"imports took {imported['seconds']:.2f}s (budget {IMPORT_BUDGET}s)"
+
+
+@pytest.mark.parametrize('without', [(), MODEL_FILES], ids=['warm', 'no-model'])
+def test_first_render_within_budget(without):
+    # no-model: training runs in the background; the login page must not wait for it
+    row = measure_first_render(without)
+    assert not row['exceptions'] and row['rendered'], row['exceptions']
+    assert row['seconds'] <= RENDER_BUDGET, f"first render took {row['seconds']:.2f}s (budget {RENDER_BUDGET}s)"
+    assert row['state'] == 'ready', f"bootstrap ended {row['state']!r}: {row['error']}"
+    if without:
+        assert row['state_at_render'] == 'training'
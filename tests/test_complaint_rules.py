@@ -0,0 +1,54 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from complaint_rules import get_complaint_type, label_complaint_types
+
+# Parity check: the table-driven labeler must give exactly the labels of the original
+# row-by-row if/elif function from _train_model.py (copied below, unchanged).
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_FILE = os.path.join(ROOT, 'Comcast_telecom_complaints_data.csv')
+
+
+def legacy_complaint_type(text):
+    text = text.lower()
+    if 'bill' in text or 'charge' in text or 'fee' in text or 'pricing' in text:
+        return 'Billing/Charges'
+    elif 'speed' in text or 'slow' in text or 'throttle' in text:
+        return 'Internet Speed'
+    elif 'service' in text or 'disconnected' in text or 'network' in text or 'outage' in text:
+        return 'Service/Network'
+    elif 'support' in text or 'rude' in text or 'customer' in text or 'contact' in text:
+        return 'Customer Service'
+    else:
+        return 'Other/Technical'
+
+
+EDGE_CASES = ['', np.nan, None, 'nan', 'BILLING Issue', 'Slow SPEED and bill', 'CusTomer SERVICE',
+              'Throttled!!', 'Service outage + rude support', 'xyz', '   ', 'Coffee', 'Prices']
+
+
+def test_matches_legacy_labels_on_complaints_csv():
+    df = pd.read_csv(RAW_FILE)
+    df.columns = df.columns.str.replace(' ', '_')
+    texts = df['Customer_Complaint'].astype(str)  # What the old script labeled
+    expected = texts.apply(legacy_complaint_type)
+    labels = label_complaint_types(texts)
+    mismatches = texts[labels != expected]
+    assert mismatches.empty, f"{len(mismatches)} label(s) changed, e.g. {mismatches.head().tolist()}"
+    assert len(labels) == len(df) > 2000
+
+
+@pytest.mark.parametrize('text', EDGE_CASES)
+def test_edge_strings_match_legacy(text):
+    expected = legacy_complaint_type(str(text))
+    assert label_complaint_types(pd.Series([text])).tolist() == [expected]
+    assert get_complaint_type(text) == expected
+
+
+def test_keeps_index_and_order():
+    texts = pd.Series(['slow internet', 'extra fee', 'slow internet'], index=[10, 5, 7])
+    labels = label_complaint_types(texts)
+    assert labels.index.tolist() == [10, 5, 7]
+    assert labels.tolist() == ['Internet Speed', 'Billing/Charges', 'Internet Speed']
@@ -0,0 +1,27 @@
+from datetime import datetime
+from live_aggregator import ALL_STATES, LiveAggregator
+
+NOW = datetime(2026, 10, 17, 12, 30)
+
+
+def _ticket(row_id, state, date='17-10-2026', time='12:00:00 PM', complaint_type='Billing/Charges'):
+    return {'row_id': row_id, 'Date': date, 'Time': time, 'State': state, 'Complaint_Type': complaint_type}
+
+
+def test_placeholder_states_only_count_for_all_states():
+    live = LiveAggregator()
+    for row_id, state in enumerate(['Not Provided', None, float('nan'), '', 'Georgia'], start=1):
+        live.observe(_ticket(row_id, state), now=NOW)
+
+    keys = dict(live.top_keys('hours', n=10)) | dict(live.top_keys('hours', n=10, all_states=True))
+    assert keys == {('Billing/Charges', 'Georgia'): 1, ('Billing/Charges', ALL_STATES): 5}
+
+
+def test_future_dated_ticket_does_not_empty_the_current_windows():
+    live = LiveAggregator()
+    live.observe(_ticket(1, 'Georgia'), now=NOW)
+    live.observe(_ticket(2, 'Georgia', date='17-10-2099'), now=NOW)  # Typo'd year -> counted as now
+
+    summary = live.summary(now=NOW)
+    assert summary['this_hour'] == 2
+    assert summary['today'] == 2
@@ -0,0 +1,45 @@
+import os
+import pandas as pd
+import pytest
+from _score_batch import result_columns, score_file
+
+# Empty inputs must produce the same header as a scored chunk (incl. 'id' with --id-col).
+# Uses the trained model files in the repo root.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def _repo_root(monkeypatch):
+    monkeypatch.chdir(ROOT)  # The model paths are relative to the app directory
+
+
+def test_empty_csv_with_id_col_keeps_id_column(tmp_path):
+    input_path, output_path = tmp_path / 'empty.csv', tmp_path / 'scored.csv'
+    input_path.write_text('request_id,complaint\n', encoding='utf-8')
+
+    assert score_file(str(input_path), str(output_path), id_col='request_id') == 0
+
+    scored = pd.read_csv(output_path)
+    assert list(scored.columns) == ['id', 'Predicted_Type', 'Sentiment', 'Priority']
+    assert scored.empty
+
+
+def test_empty_jsonl_with_id_col_keeps_id_column(tmp_path):
+    input_path, output_path = tmp_path / 'empty.jsonl', tmp_path / 'scored.csv'
+    input_path.write_text('', encoding='utf-8')
+
+    assert score_file(str(input_path), str(output_path), id_col='request_id') == 0
+
+    assert list(pd.read_csv(output_path).columns) == result_columns(with_id=True)
+
+
+def test_scored_header_matches_empty_header(tmp_path):
+    input_path, output_path = tmp_path / 'one.csv', tmp_path / 'scored.csv'
+    input_path.write_text('request_id,complaint\nr1,my bill has an extra fee\n', encoding='utf-8')
+
+    assert score_file(str(input_path), str(output_path), id_col='request_id') == 1
+
+    scored = pd.read_csv(output_path)
+    assert list(scored.columns) == result_columns(with_id=True)
+    assert scored['id'].tolist() == ['r1']
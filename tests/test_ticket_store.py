@@ -0,0 +1,25 @@
+import ticket_store
+from ticket_store import TicketStore, get_store
+
+
+def test_get_store_uses_the_configured_incident_window(tmp_path, monkeypatch):
+    monkeypatch.setattr(ticket_store, '_default_store', None)
+    path = str(tmp_path / 'tickets.db')
+
+    assert get_store(path, seed_csv=None).incidents.window_hours == ticket_store.INCIDENT_WINDOW_HOURS
+    store = get_store(path, seed_csv=None, incident_window_hours=24)
+    assert store.incidents.window_hours == 24
+    assert get_store(path, seed_csv=None, incident_window_hours=24) is store  # Still one store per process
+
+    monkeypatch.setattr(ticket_store, 'INCIDENT_WINDOW_HOURS', 6)
+    assert get_store(path, seed_csv=None).incidents.window_hours == 6
+
+
+def test_batch_insert_takes_one_block_of_ticket_numbers(tmp_path):
+    store = TicketStore(str(tmp_path / 'tickets.db'), seed_csv=None)
+    store.insert_ticket({'Ticket_#': '5000', 'Customer_Complaint': 'given number', 'Status_Group': 'Resolved'})
+
+    batch = store.insert_tickets([{'Customer_Complaint': f'complaint {i}', 'Status_Group': 'Resolved'}
+                                  for i in range(3)])
+
+    assert [t['Ticket_#'] for t in batch] == ['5001', '5002', '5003']  # After the highest stored number
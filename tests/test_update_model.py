@@ -0,0 +1,48 @@
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import SGDClassifier
+from _update_model import update_model_once
+from complaint_rules import COMPLAINT_TYPE_RULES, DEFAULT_COMPLAINT_TYPE
+from ticket_store import TicketStore
+
+# Agent Mode stores the model's own prediction as Complaint_Type -> the incremental update must
+# learn from the rule labels (like _train_model.py), never from those predictions.
+
+CLASSES = [label for label, _ in COMPLAINT_TYPE_RULES] + [DEFAULT_COMPLAINT_TYPE]
+
+
+class RecordingModel(SGDClassifier):
+    # Remembers the labels of every partial_fit call (pickled along with the model)
+    def partial_fit(self, X, y, classes=None, sample_weight=None):
+        self.seen_labels = getattr(self, 'seen_labels', []) + list(y)
+        return super().partial_fit(X, y, classes=classes, sample_weight=sample_weight)
+
+
+def _ticket(text, predicted):
+    return {'Customer_Complaint': text, 'Complaint_Type': predicted, 'Date': '17-10-2026',
+            'Time': '10:00:00 AM', 'Received_Via': 'Web AI', 'City': 'Not Provided',
+            'State': 'Not Provided', 'Zip_code': 0, 'Status': 'Open', 'Status_Group': 'Unresolved'}
+
+
+def test_update_learns_rule_labels_not_stored_predictions(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # model_state.json is written to the working directory
+    model_path, vectorizer_path = str(tmp_path / 'model.pkl'), str(tmp_path / 'vectorizer.pkl')
+    texts = ['extra fee on my bill', 'internet speed is slow', 'service outage', 'rude support', 'cable box']
+    vectorizer = TfidfVectorizer().fit(texts)
+    model = RecordingModel(loss='log_loss', random_state=0)
+    model.partial_fit(vectorizer.transform(texts), np.array(CLASSES), classes=np.array(CLASSES))
+    model.seen_labels = []
+    joblib.dump(model, model_path)
+    joblib.dump(vectorizer, vectorizer_path)
+
+    store = TicketStore(str(tmp_path / 'tickets.db'), seed_csv=None)
+    store.insert_ticket(_ticket('old ticket', 'Other/Technical'))
+    assert update_model_once(store, model_path, vectorizer_path) == 0  # Baseline only
+
+    # Stored Complaint_Type = a (wrong) model prediction; the text says otherwise
+    store.insert_tickets([_ticket('extra fee on my bill', 'Internet Speed'),
+                          _ticket('internet speed is slow', 'Billing/Charges')])
+    assert update_model_once(store, model_path, vectorizer_path) == 2
+
+    assert joblib.load(model_path).seen_labels == ['Billing/Charges', 'Internet Speed']
@@ -0,0 +1,129 @@
+import re
+import sqlite3
+
+# --- Complaint Search (persisted inverted index in the ticket store) ---
+# An SQLite FTS5 index over each ticket's Cleaned_Complaint, Ticket_#, City and State. The index
+# reads its text from the tickets table ("external content"), so it stores only the postings,
+# lives in tickets.db, and gets one INSERT per new ticket inside the ticket's own write
+# transaction (a rolled-back insert leaves no trace). Status changes don't touch indexed columns.
+# Queries (the desk search box):
+#   data cap             both words, any order (implicit AND; words are stemmed: caps -> cap)
+#   "data cap"           phrase
+#   billing OR charges   either word;  comcast NOT xfinity;  (slow OR speed) AND modem
+#   city:atlanta  state:georgia  ticket:250635  complaint:"data cap"   one field only
+#   throttl*             prefix
+# Results are ranked with BM25 (a match in Ticket_# / City / State weighs more than one complaint word).
+# A search covers the newest MAX_HITS matching tickets: the index walks its postings newest-first
+# and stops there, so a common word costs the same at 100k or 10M tickets (~ms); BM25 is only
+# computed for "best match" pages.
+
+FIELDS = {'ticket': 'Ticket_#', 'complaint': 'Cleaned_Complaint', 'city': 'City', 'state': 'State'}
+COLUMNS = list(FIELDS.values())
+WEIGHTS = {'Ticket_#': 10.0, 'Cleaned_Complaint': 1.0, 'City': 3.0, 'State': 2.0}
+OPERATORS = {'AND', 'OR', 'NOT'}
+MAX_HITS = 2_000
+
+_QUOTED_COLUMNS = ', '.join(f'"{c}"' for c in COLUMNS)
+_INDEX_SQL = f'INSERT INTO ticket_search (rowid, {_QUOTED_COLUMNS}) VALUES (?, {", ".join("?" for _ in COLUMNS)})'
+_TOKEN_RE = re.compile(r'(\w+):"([^"]*)"?|"([^"]*)"?|(\()|(\))|([^\s()"]+)')
+
+
+class SearchSyntaxError(ValueError):
+    pass
+
+
+def _words(text):
+    # Same normalisation as featurize.clean_text (lowercase, punctuation dropped), digits kept
+    # for ticket ids: "Can't" -> "cant", "#250635" -> "250635"
+    return [w for w in (re.sub(r'[^a-z0-9]', '', word) for word in text.lower().split()) if w]
+
+
+def _phrase(words, prefix=False):
+    return '"' + ' '.join(words) + '"' + (' *' if prefix else '')
+
+
+def parse_query(text):
+    # Search-box text -> FTS5 MATCH expression. Every word ends up inside a quoted string,
+    # so user input can't inject FTS5 syntax; only AND / OR / NOT / ( ) / field: are operators.
+    parts, depth = [], 0
+    for field, field_text, phrase, open_paren, close_paren, word in _TOKEN_RE.findall(text):
+        if word and ':' in word and word.split(':', 1)[0].lower() in FIELDS:
+            field, field_text = word.split(':', 1)  # city:atlanta
+        if open_paren:
+            parts.append('(')
+            depth += 1
+        elif close_paren:
+            if depth == 0:
+                raise SearchSyntaxError("Unbalanced ')' in search.")
+            parts.append(')')
+            depth -= 1
+        elif field and field.lower() in FIELDS:
+            words = _words(field_text.rstrip('*'))
+            if words:
+                parts.append(f'{{"{FIELDS[field.lower()]}"}} : {_phrase(words, field_text.endswith("*"))}')
+        elif field or phrase:
+            words = _words(f'{field} {field_text}' if field else phrase)  # Unknown 'x:"..."' -> plain phrase
+            if words:
+                parts.append(_phrase(words))
+        elif word in OPERATORS:
+            parts.append(word)
+        else:
+            words = _words(word.rstrip('*'))
+            if words:
+                parts.append(_phrase(words, word.endswith('*') and len(words) == 1))
+    if depth:
+        raise SearchSyntaxError("Unbalanced '(' in search.")
+    # Operators with nothing to join (e.g. a word that was only punctuation) are dropped
+    cleaned = []
+    for part in parts:
+        if part in OPERATORS and (not cleaned or cleaned[-1] in OPERATORS or cleaned[-1] == '('):
+            if part == 'NOT' and not cleaned:
+                raise SearchSyntaxError("NOT needs a word before it (e.g. comcast NOT xfinity).")
+            continue
+        if part == ')' and cleaned and cleaned[-1] in OPERATORS:
+            cleaned.pop()
+        cleaned.append(part)
+    while cleaned and cleaned[-1] in OPERATORS:
+        cleaned.pop()
+    return ' '.join(cleaned)
+
+
+class SearchTable:
+    # Derived table of the ticket store (create / rebuild like the rollups), kept in step on insert
+    table = 'ticket_search'
+
+    def __init__(self):
+        self.available = True
+
+    def create(self, conn):
+        try:
+            conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search USING fts5({_QUOTED_COLUMNS}, content='tickets', "
+                         f"content_rowid='row_id', tokenize='porter unicode61')")
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: the store works, the desk just has no search box
+            print(f"WARNING: Complaint search disabled (SQLite has no FTS5). Error: {e}")
+            self.available = False
+
+    def add(self, conn, ticket):
+        if not self.available:
+            return
+        conn.execute(_INDEX_SQL, [ticket['row_id']] + [ticket.get(c) for c in COLUMNS])
+
+    def rebuild(self, conn):
+        # Re-reads every ticket's indexed columns (e.g. after the seed import)
+        if self.available:
+            conn.execute("INSERT INTO ticket_search (ticket_search) VALUES ('rebuild')")
+
+    def hits_sql(self, filter_clauses=(), relevance=False):
+        # Subquery: hit_id (+ relevance: lower = better, BM25 is negative) of the newest matching
+        # tickets. Params: the MATCH expression, the filter params, then the hit limit.
+        # CROSS JOIN keeps the index as the outer loop (SQLite would otherwise walk a filter index
+        # and run the MATCH once per ticket).
+        cols = 'ticket_search.rowid AS hit_id'
+        if relevance:
+            cols += f", bm25(ticket_search, {', '.join(str(WEIGHTS[c]) for c in COLUMNS)}) AS relevance"
+        sql = f'SELECT {cols} FROM ticket_search'
+        if filter_clauses:
+            sql += ' CROSS JOIN tickets ON tickets.row_id = ticket_search.rowid'
+        sql += ' WHERE ticket_search MATCH ?' + ''.join(f' AND {c}' for c in filter_clauses)
+        return sql + ' ORDER BY ticket_search.rowid DESC LIMIT ?'
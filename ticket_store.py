@@ -0,0 +1,602 @@
+import argparse
+import os
+import sqlite3
+import threading
+import pandas as pd
+from escalation_queue import EscalationTable
+from near_duplicates import WINDOW_HOURS, IncidentTable
+from rollups import DAY_SQL, ROLLUPS
+from similar_complaints import SimilarityTable
+from ticket_search import MAX_HITS, SearchSyntaxError, SearchTable, parse_query
+
+# --- Ticket Store (embedded SQLite in WAL mode) ---
+# New tickets are appended with a single-row INSERT -> O(1) per ticket instead of rewriting the
+# whole CSV. The processed CSV from _train_model.py is only the SEED: it is imported once when
+# the database is empty. Pages read pre-aggregated rollups and one desk page at a time, never every row.
+# KPI counters live in rollup tables (rollups.py) and open tickets in the escalations table
+# (escalation_queue.py), near-duplicate links in ticket_incidents (near_duplicates.py) and the
+# full-text search index in ticket_search (ticket_search.py); all are updated inside the same
+# write transactions. Open tickets' resolution_score column is filled in batches by
+# resolution_scores.py. The similar-complaints
+# index (similar_complaints.py) sits in a file next to the database and catches up by row_id.
+# Usage: python ticket_store.py compact
+#        python ticket_store.py rebuild-rollups
+#        python ticket_store.py --incident-window-hours 24 rebuild-rollups   (re-link with another window)
+#        python ticket_store.py export-csv snapshot.csv
+
+DB_FILE = 'tickets.db'
+SEED_CSV = 'processed_data_for_dashboard.csv'
+# Near-duplicate tickets filed within this many hours of each other are linked into one incident.
+# Stored links keep the window they were made with -> run rebuild-rollups after changing it.
+INCIDENT_WINDOW_HOURS = WINDOW_HOURS
+
+# Same columns (and order) as the processed CSV
+TICKET_COLUMNS = ['Ticket_#', 'Customer_Complaint', 'Date', 'Date_month_year', 'Time', 'Received_Via',
+                  'City', 'State', 'Zip_code', 'Status', 'Filing_on_Behalf_of_Someone', 'Complaint_Type',
+                  'Status_Group', 'Cleaned_Complaint']
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS tickets (
+    row_id INTEGER PRIMARY KEY AUTOINCREMENT, -- insertion order (== old CSV row number + 1)
+    ticket_num INTEGER,                       -- numeric Ticket_# (NULL if not numeric), indexed
+    "Ticket_#" TEXT NOT NULL,
+    "Customer_Complaint" TEXT,
+    "Date" TEXT,
+    "Date_month_year" TEXT,
+    "Time" TEXT,
+    "Received_Via" TEXT,
+    "City" TEXT,
+    "State" TEXT,
+    "Zip_code" INTEGER,
+    "Status" TEXT,
+    "Filing_on_Behalf_of_Someone" TEXT,
+    "Complaint_Type" TEXT,
+    "Status_Group" TEXT,
+    "Cleaned_Complaint" TEXT,
+    resolution_score REAL                     -- P(resolved) from resolution_scores.py (NULL = not scored yet)
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_ticket ON tickets("Ticket_#");
+CREATE INDEX IF NOT EXISTS idx_tickets_ticket_num ON tickets(ticket_num);
+-- Desk paging (query_tickets): filter column + ISO day expression, row_id breaks ties
+CREATE INDEX IF NOT EXISTS idx_tickets_day ON tickets((DAY_EXPR));
+CREATE INDEX IF NOT EXISTS idx_tickets_status_day ON tickets("Status_Group", (DAY_EXPR));
+CREATE INDEX IF NOT EXISTS idx_tickets_type_day ON tickets("Complaint_Type", (DAY_EXPR));
+CREATE INDEX IF NOT EXISTS idx_tickets_status_ticket ON tickets("Status_Group", ticket_num);
+CREATE TABLE IF NOT EXISTS status_audit (
+    audit_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    row_id INTEGER NOT NULL,
+    "Ticket_#" TEXT,
+    old_status_group TEXT,
+    new_status_group TEXT NOT NULL,
+    changed_by TEXT,
+    changed_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%S', 'now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_status_audit_row ON status_audit(row_id);
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+INSERT OR IGNORE INTO store_meta VALUES ('version', 0);
+-- Last Ticket_# handed out (see _allocate_ticket_numbers); 999 -> first generated number is 1000
+INSERT OR IGNORE INTO store_meta VALUES ('ticket_seq', 999);
+'''.replace('DAY_EXPR', DAY_SQL)
+
+# Columns added after the first release: ALTER TABLE on databases created before them
+_ADDED_COLUMNS = {'resolution_score': 'REAL'}
+_ADDED_INDEXES = '''
+-- Backlog scoring: unscored open tickets (score IS NULL) in row_id order, and the desk's score sort
+CREATE INDEX IF NOT EXISTS idx_tickets_status_score ON tickets("Status_Group", resolution_score);
+CREATE INDEX IF NOT EXISTS idx_tickets_score ON tickets(resolution_score);
+'''
+
+# Detailed Status written alongside a Status_Group change (same rule the dashboard always used)
+STATUS_FOR_GROUP = {'Resolved': 'Solved', 'Unresolved': 'Open'}
+
+# query_tickets sort keys -> ORDER BY expressions (each backed by an index above)
+SORT_KEYS = {'date': DAY_SQL, 'ticket': 'ticket_num', 'resolution': 'resolution_score',
+             'relevance': 'hits.relevance'}  # relevance: searches only
+
+_QUOTED_COLUMNS = ', '.join(f'"{c}"' for c in TICKET_COLUMNS)
+_INSERT_SQL = (f'INSERT INTO tickets (ticket_num, {_QUOTED_COLUMNS}) '
+               f'VALUES (?, {", ".join("?" for _ in TICKET_COLUMNS)})')
+
+
+def _ticket_num(ticket):
+    try:
+        return int(ticket)
+    except (TypeError, ValueError):
+        return None
+
+
+def _row_values(ticket):
+    values = [ticket.get(c) for c in TICKET_COLUMNS]
+    values = [None if (v is not None and pd.isna(v)) else v for v in values]
+    values = [v.item() if hasattr(v, 'item') else v for v in values]  # numpy scalars -> python
+    values[0] = str(values[0])
+    return [_ticket_num(values[0])] + values
+
+
+class TicketStore:
+    def __init__(self, path=DB_FILE, seed_csv=SEED_CSV, rollups=None, incidents=None, synchronous='NORMAL'):
+        self.path = path
+        self.seed_csv = seed_csv
+        self.synchronous = synchronous
+        self.rollups = list(ROLLUPS if rollups is None else rollups)
+        self.escalations = EscalationTable()
+        self.similar = SimilarityTable()
+        self.incidents = incidents or IncidentTable()  # get_store() passes INCIDENT_WINDOW_HOURS
+        self.search = SearchTable()
+        self._listeners = []  # Called with each new ticket AFTER its insert commits
+        self._local = threading.local()  # One connection per thread (Streamlit sessions are threads)
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    # --- Connection / setup ---
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None -> we issue BEGIN/COMMIT ourselves
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # NORMAL: durable at checkpoints, no fsync per ticket (write_queue.py uses FULL + group commit)
+            conn.execute(f'PRAGMA synchronous={self.synchronous}')
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def connection(self):
+        # This thread's connection, for indexes maintained outside the write path
+        # (similar_complaints.SimilarComplaints reads new tickets by row_id)
+        return self._conn()
+
+    def set_synchronous(self, level):
+        # Durability of the CALLING thread's connection only (e.g. FULL for a group-commit writer)
+        self._conn().execute(f'PRAGMA synchronous={level}')
+
+    def _ensure_schema(self, conn):
+        with self._init_lock:
+            if self._initialized:
+                return
+            conn.executescript(_SCHEMA)
+            self._add_columns(conn)
+            self._sync_ticket_seq(conn)  # Databases created before the sequence existed
+            self._ensure_derived_tables(conn)
+            self._initialized = True
+            if self.seed_csv and os.path.exists(self.seed_csv):
+                self._import_csv(conn, self.seed_csv, only_if_empty=True)
+
+    def _add_columns(self, conn):
+        existing = {row[1] for row in conn.execute('PRAGMA table_info(tickets)')}
+        for column, sql_type in _ADDED_COLUMNS.items():
+            if column not in existing:
+                try:
+                    conn.execute(f'ALTER TABLE tickets ADD COLUMN {column} {sql_type}')
+                except sqlite3.OperationalError as e:
+                    if 'duplicate column' not in str(e):  # Another process added it first
+                        raise
+        conn.executescript(_ADDED_INDEXES)
+
+    def _derived_tables(self):
+        # Tables computed from the tickets (rebuildable at any time)
+        return self.rollups + [self.escalations, self.similar, self.incidents, self.search]
+
+    def _ensure_derived_tables(self, conn):
+        # A derived table added to an existing database starts from a full rebuild (once)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for derived in self._derived_tables():
+                derived.create(conn)
+                # A derived table whose rules changed bumps its revision -> rebuilt once more
+                revision = getattr(derived, 'revision', 1)
+                key = f'rollup:{derived.table}' + (f':v{revision}' if revision > 1 else '')
+                if conn.execute('SELECT 1 FROM store_meta WHERE key = ?', (key,)).fetchone() is None:
+                    derived.rebuild(conn)
+                    conn.execute('INSERT INTO store_meta VALUES (?, 1)', (key,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _rebuild_derived_tables(self, conn):
+        for derived in self._derived_tables():
+            derived.rebuild(conn)
+
+    def _import_csv(self, conn, csv_path, chunksize=100_000, only_if_empty=False):
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Checked inside the write lock -> two processes starting together seed only once
+            if only_if_empty and conn.execute('SELECT EXISTS (SELECT 1 FROM tickets)').fetchone()[0]:
+                conn.execute('ROLLBACK')
+                return False
+            for chunk in pd.read_csv(csv_path, chunksize=chunksize, dtype={'Ticket_#': str}):
+                chunk = chunk.reindex(columns=TICKET_COLUMNS)
+                conn.executemany(_INSERT_SQL, (_row_values(r) for r in chunk.to_dict('records')))
+            self._sync_ticket_seq(conn)
+            self._rebuild_derived_tables(conn)  # One pass at the end instead of an update per row
+            self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return True
+
+    def _bump_version(self, conn):
+        conn.execute("UPDATE store_meta SET value = value + 1 WHERE key = 'version'")
+
+    # --- Ticket number sequence ---
+    def _allocate_ticket_numbers(self, conn, count):
+        # One counter UPDATE, no scan. Runs under the write lock (BEGIN IMMEDIATE), so numbers are
+        # unique across sessions AND processes; a rolled-back transaction gives its numbers back.
+        conn.execute("UPDATE store_meta SET value = value + ? WHERE key = 'ticket_seq'", (count,))
+        last = conn.execute("SELECT value FROM store_meta WHERE key = 'ticket_seq'").fetchone()[0]
+        return range(last - count + 1, last + 1)
+
+    def _sync_ticket_seq(self, conn, at_least=None):
+        # Keep the sequence ahead of every stored / explicitly given number (MAX is an index lookup)
+        if at_least is None:
+            at_least = conn.execute('SELECT COALESCE(MAX(ticket_num), 0) FROM tickets').fetchone()[0]
+        conn.execute("UPDATE store_meta SET value = MAX(value, ?) WHERE key = 'ticket_seq'", (at_least,))
+
+    # --- Write path ---
+    def _insert_tickets(self, conn, tickets):
+        # Inside an open write transaction: one block of numbers for the tickets without a
+        # Ticket_#, then the rows + their rollup / escalation updates
+        tickets = [dict(t) for t in tickets]
+        given = [n for n in (_ticket_num(t.get('Ticket_#')) for t in tickets if t.get('Ticket_#')) if n is not None]
+        if given:
+            self._sync_ticket_seq(conn, max(given))
+        missing = [t for t in tickets if not t.get('Ticket_#')]
+        if missing:
+            for ticket, number in zip(missing, self._allocate_ticket_numbers(conn, len(missing))):
+                ticket['Ticket_#'] = str(number)
+        for ticket in tickets:
+            cursor = conn.execute(_INSERT_SQL, _row_values(ticket))
+            ticket['row_id'] = cursor.lastrowid
+            for rollup in self.rollups:
+                rollup.apply(conn, ticket['row_id'], +1)
+            if ticket.get('Status_Group') == 'Unresolved':
+                self.escalations.enqueue(conn, ticket['row_id'])
+            # Near-duplicate of a recent ticket (same zip, similar text) -> linked to its incident
+            ticket['Incident_ID'], ticket['Incident_Similarity'] = self.incidents.link(conn, ticket)
+            self.search.add(conn, ticket)
+        return tickets
+
+    def insert_tickets(self, tickets):
+        # Batch insert in ONE transaction (one commit, one block of ticket numbers)
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            tickets = self._insert_tickets(conn, tickets)
+            self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            self.incidents.reset()  # Its in-memory index saw rows that were never stored
+            raise
+        for ticket in tickets:
+            self._notify(ticket)
+        return tickets
+
+    def insert_ticket(self, ticket):
+        # Ticket_# is allocated from the sequence inside the same write transaction, so two
+        # agents can never get the same number.
+        return self.insert_tickets([ticket])[0]
+
+    def add_listener(self, listener):
+        # In-process stream consumers (e.g. live_aggregator.LiveAggregator.observe).
+        # Other processes' tickets are not pushed -> consumers also poll by row_id.
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def _notify(self, ticket):
+        for listener in list(self._listeners):
+            try:
+                listener(dict(ticket))
+            except Exception as e:
+                # The ticket is already committed; a broken consumer must not fail the write
+                print(f"WARNING: ticket listener {listener!r} failed: {e}")
+
+    def _update_status_groups(self, conn, changes, changed_by=None):
+        # Inside an open write transaction; returns the number of rows really changed
+        changed = 0
+        for row_id, new_group in changes.items():
+            current = conn.execute('SELECT "Ticket_#", "Status_Group" FROM tickets WHERE row_id = ?',
+                                   (int(row_id),)).fetchone()
+            if current is None or current[1] == new_group:
+                continue
+            for rollup in self.rollups:
+                rollup.apply(conn, int(row_id), -1)  # Uncount the old status...
+            conn.execute('UPDATE tickets SET "Status_Group" = ?, "Status" = ? WHERE row_id = ?',
+                         (new_group, STATUS_FOR_GROUP.get(new_group, new_group), int(row_id)))
+            for rollup in self.rollups:
+                rollup.apply(conn, int(row_id), +1)  # ...and count the new one
+            if new_group == 'Unresolved':
+                self.escalations.enqueue(conn, int(row_id))  # Re-opened -> back in the queue
+            else:
+                self.escalations.dequeue(conn, int(row_id))
+            conn.execute('INSERT INTO status_audit (row_id, "Ticket_#", old_status_group, new_status_group, '
+                         'changed_by) VALUES (?, ?, ?, ?, ?)',
+                         (int(row_id), current[0], current[1], new_group, changed_by))
+            changed += 1
+        return changed
+
+    def update_status_groups(self, changes, changed_by=None):
+        # Delta save: changes = {row_id: 'Resolved' / 'Unresolved'}. Only those rows are touched
+        # (primary-key lookups) and every real change leaves an audit record. Returns rows changed.
+        return self.write_batch([('status', (changes, changed_by))])[0]
+
+    def write_batch(self, operations):
+        # Group commit: many writes, ONE transaction (one WAL commit / fsync for all of them).
+        # operations = [('insert', ticket) | ('status', (changes, changed_by)), ...]
+        # Returns one result per operation: the stored ticket dict / the number of rows changed.
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            results, inserted, changed = [], [], False
+            for kind, payload in operations:
+                if kind == 'insert':
+                    ticket = self._insert_tickets(conn, [payload])[0]
+                    inserted.append(ticket)
+                    results.append(ticket)
+                    changed = True
+                elif kind == 'status':
+                    count = self._update_status_groups(conn, *payload)
+                    results.append(count)
+                    changed = changed or count > 0
+                else:
+                    raise ValueError(f"Unknown write operation: {kind!r}")
+            if changed:
+                self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            self.incidents.reset()
+            raise
+        for ticket in inserted:
+            self._notify(ticket)
+        return results
+
+    # --- Read path ---
+    def version(self):
+        # Bumped by every committed write -> pages key their caches on it
+        return self._conn().execute("SELECT value FROM store_meta WHERE key = 'version'").fetchone()[0]
+
+    def rollup_counts(self, rollup, by=(), where=None):
+        # rollup = a Rollup from self.rollups (e.g. rollups.DAILY_ROLLUP)
+        return rollup.counts(self._conn(), by, where)
+
+    def reprioritize_escalation(self, row_id, priority):
+        # Manager override of an open ticket's queue priority ('HIGH' / 'MEDIUM')
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            changed = self.escalations.reprioritize(conn, int(row_id), priority)
+            if changed:
+                self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return changed
+
+    def escalations_since(self, seq):
+        return pd.read_sql_query('SELECT * FROM escalations WHERE seq > ? ORDER BY seq', self._conn(), params=(seq,))
+
+    def escalation_seq(self, row_id):
+        # None once the ticket has left the queue
+        row = self._conn().execute('SELECT seq FROM escalations WHERE row_id = ?', (int(row_id),)).fetchone()
+        return None if row is None else row[0]
+
+    def count_escalations(self):
+        return self._conn().execute('SELECT COUNT(*) FROM escalations').fetchone()[0]
+
+    def incident_summary(self, limit=20, min_tickets=2):
+        # Near-duplicate incidents (near_duplicates.py), biggest first
+        return self.incidents.summary(self._conn(), limit, min_tickets)
+
+    def incident_members(self, incident_id, status_group=None):
+        # row_ids of every ticket in one incident (its first ticket included)
+        sql = ('SELECT row_id FROM tickets WHERE (row_id = ? OR row_id IN '
+               '(SELECT row_id FROM ticket_incidents WHERE incident_id = ?))')
+        params = [int(incident_id), int(incident_id)]
+        if status_group:
+            sql += ' AND "Status_Group" = ?'
+            params.append(status_group)
+        return [row[0] for row in self._conn().execute(sql + ' ORDER BY row_id', params)]
+
+    def get_tickets(self, row_ids, columns=None):
+        # Specific tickets by row_id (primary-key lookups), in the order asked for
+        row_ids = [int(r) for r in row_ids]
+        cols = ', '.join(f'"{c}"' for c in (columns or ['row_id'] + TICKET_COLUMNS))
+        df = pd.read_sql_query(f'SELECT {cols} FROM tickets WHERE row_id IN ({", ".join("?" for _ in row_ids)})',
+                               self._conn(), params=row_ids)
+        if 'row_id' in df.columns:
+            df = df.set_index('row_id', drop=False).reindex(row_ids).reset_index(drop=True)
+        if 'Ticket_#' in df.columns:
+            df['Ticket_#'] = df['Ticket_#'].astype(str)
+        return df
+
+    def max_row_id(self):
+        return self._conn().execute('SELECT COALESCE(MAX(row_id), 0) FROM tickets').fetchone()[0]
+
+    def _filter_clauses(self, status_group=None, complaint_type=None):
+        clauses, params = [], []
+        if status_group:
+            clauses.append('"Status_Group" = ?')
+            params.append(status_group)
+        if complaint_type:
+            clauses.append('"Complaint_Type" = ?')
+            params.append(complaint_type)
+        return clauses, params
+
+    def _filter_sql(self, status_group=None, complaint_type=None):
+        clauses, params = self._filter_clauses(status_group, complaint_type)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def _search_hits(self, search, status_group=None, complaint_type=None, relevance=False, max_hits=MAX_HITS):
+        # Full-text hits subquery (ticket_search.py) with the desk filters applied inside it
+        if not self.search.available:
+            raise SearchSyntaxError("Search is not available (SQLite was built without FTS5).")
+        match = parse_query(search)
+        if not match:
+            raise SearchSyntaxError("Nothing to search for.")
+        clauses, params = self._filter_clauses(status_group, complaint_type)
+        return self.search.hits_sql(clauses, relevance), [match] + params + [int(max_hits)]
+
+    def _read_search(self, sql, params):
+        try:
+            return pd.read_sql_query(sql, self._conn(), params=params)
+        except pd.errors.DatabaseError as e:
+            if 'fts5' in str(e):  # e.g. "fts5: syntax error near ..." for an empty ( )
+                raise SearchSyntaxError(f"Can't read that search: {e.__cause__ or e}") from e
+            raise
+
+    def query_tickets(self, columns=None, status_group=None, complaint_type=None, sort='date',
+                      descending=True, limit=50, offset=0, search=None):
+        # One page of tickets, filtered and sorted inside SQLite (index walk, no full sort).
+        # search = desk search-box text: only its (newest MAX_HITS) matches; sort='relevance' = best match first
+        cols = ', '.join(f'"{c}"' for c in (columns or ['row_id'] + TICKET_COLUMNS))
+        direction = 'DESC' if descending else 'ASC'
+        if search and search.strip():
+            hits, params = self._search_hits(search, status_group, complaint_type, relevance=sort == 'relevance')
+            source = f'({hits}) hits CROSS JOIN tickets ON tickets.row_id = hits.hit_id'
+        else:
+            sort = 'date' if sort == 'relevance' else sort
+            where, params = self._filter_sql(status_group, complaint_type)
+            source = f'tickets{where}'
+        nulls = ' NULLS LAST' if sort == 'resolution' else ''  # Not scored yet -> bottom either way
+        sql = (f'SELECT {cols} FROM {source} ORDER BY {SORT_KEYS[sort]} {direction}{nulls}, tickets.row_id {direction} '
+               f'LIMIT ? OFFSET ?')
+        df = self._read_search(sql, params + [int(limit), int(offset)])
+        if 'Ticket_#' in df.columns:
+            df['Ticket_#'] = df['Ticket_#'].astype(str)
+        return df
+
+    def count_tickets(self, status_group=None, complaint_type=None, search=None):
+        # With a search: counts at most MAX_HITS + 1 matches (more than that = "MAX_HITS+" on the pager)
+        if search and search.strip():
+            hits, params = self._search_hits(search, status_group, complaint_type, max_hits=MAX_HITS + 1)
+            return int(self._read_search(f'SELECT COUNT(*) AS n FROM ({hits})', params)['n'].iloc[0])
+        where, params = self._filter_sql(status_group, complaint_type)
+        return self._conn().execute(f'SELECT COUNT(*) FROM tickets{where}', params).fetchone()[0]
+
+    def load_tickets(self, columns=None, since_row_id=None):
+        # columns may also include 'row_id' (insertion order / high-water mark)
+        cols = ', '.join(f'"{c}"' for c in (columns or TICKET_COLUMNS))
+        sql = f'SELECT {cols} FROM tickets'
+        params = ()
+        if since_row_id is not None:
+            sql += ' WHERE row_id > ?'
+            params = (since_row_id,)
+        df = pd.read_sql_query(sql + ' ORDER BY row_id', self._conn(), params=params)
+        if 'Ticket_#' in df.columns:
+            df['Ticket_#'] = df['Ticket_#'].astype(str)
+        return df
+
+    # --- Resolution scores (resolution_scores.py) ---
+    def resolution_model(self):
+        # Fingerprint of the model that wrote the current scores (0 = none yet)
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = 'resolution_model'").fetchone()
+        return 0 if row is None else row[0]
+
+    def reset_resolution_scores(self, model_fingerprint):
+        # New model -> every score is stale: clear them all, the next run re-scores the backlog
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('UPDATE tickets SET resolution_score = NULL WHERE resolution_score IS NOT NULL')
+            conn.execute("INSERT OR REPLACE INTO store_meta VALUES ('resolution_model', ?)", (int(model_fingerprint),))
+            self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def unscored_tickets(self, limit, after_row_id=0, columns=('row_id', 'Cleaned_Complaint', 'Customer_Complaint')):
+        # Open tickets without a score, oldest first (index range on (Status_Group, resolution_score))
+        cols = ', '.join(f'"{c}"' for c in columns)
+        return pd.read_sql_query(f'SELECT {cols} FROM tickets WHERE "Status_Group" = \'Unresolved\' AND '
+                                 f'resolution_score IS NULL AND row_id > ? ORDER BY row_id LIMIT ?',
+                                 self._conn(), params=(int(after_row_id), int(limit)))
+
+    def count_unscored(self):
+        return self._conn().execute('SELECT COUNT(*) FROM tickets WHERE "Status_Group" = \'Unresolved\' '
+                                    'AND resolution_score IS NULL').fetchone()[0]
+
+    def set_resolution_scores(self, row_ids, scores):
+        # One transaction per batch; a ticket changed meanwhile keeps the score (its text didn't change)
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.executemany('UPDATE tickets SET resolution_score = ? WHERE row_id = ?',
+                             zip(map(float, scores), map(int, row_ids)))
+            self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    # --- Maintenance ---
+    def compact(self):
+        # Fold the WAL back into the main file and reclaim free pages
+        conn = self._conn()
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def rebuild_rollups(self):
+        # Recovery: recompute every rollup table (and the escalations table) from the tickets table
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._rebuild_derived_tables(conn)
+            self._bump_version(conn)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def export_csv(self, csv_path):
+        # Snapshot in the processed-CSV layout (for tools that still read the CSV)
+        self.load_tickets().to_csv(csv_path, index=False, encoding='utf-8')
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_default_store = None
+
+
+def get_store(path=DB_FILE, seed_csv=SEED_CSV, incident_window_hours=None):
+    # One store object per process (both pages and the CLIs share it)
+    global _default_store
+    window_hours = INCIDENT_WINDOW_HOURS if incident_window_hours is None else incident_window_hours
+    if (_default_store is None or os.path.abspath(_default_store.path) != os.path.abspath(path)
+            or _default_store.incidents.window_hours != window_hours):
+        _default_store = TicketStore(path, seed_csv, incidents=IncidentTable(window_hours=window_hours))
+    return _default_store
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ticket store maintenance.")
+    parser.add_argument('--db', default=DB_FILE)
+    parser.add_argument('--incident-window-hours', type=float, default=INCIDENT_WINDOW_HOURS,
+                        help="Near-duplicate link window for new links / rebuild-rollups")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('compact', help="Checkpoint the WAL and VACUUM")
+    sub.add_parser('rebuild-rollups', help="Recompute the KPI rollup tables, escalation queue, incidents and search index")
+    export = sub.add_parser('export-csv', help="Write all tickets to a CSV snapshot")
+    export.add_argument('path', nargs='?', default=SEED_CSV)
+    args = parser.parse_args()
+
+    store = TicketStore(args.db, incidents=IncidentTable(window_hours=args.incident_window_hours))
+    if args.command == 'compact':
+        store.compact()
+        print(f"✅ Compacted {args.db} ({os.path.getsize(args.db):,} bytes).")
+    elif args.command == 'rebuild-rollups':
+        store.rebuild_rollups()
+        print(f"✅ Rebuilt {len(store.rollups)} rollup table(s), the escalation queue, incident links and search index "
+              f"({store.count_escalations():,} open) from {store.max_row_id():,} tickets.")
+    elif args.command == 'export-csv':
+        store.export_csv(args.path)
+        print(f"✅ Exported {store.max_row_id():,} tickets to {args.path}.")
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+# --- Ticket Event Time ---
+# Shared by the live aggregator (window buckets) and near-duplicate linking (time window).
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def ticket_time(ticket):
+    # Event time of a ticket from its Date (dd-mm-yyyy) + Time (h:mm:ss AM/PM) columns
+    try:
+        return datetime.strptime(f"{ticket.get('Date')} {ticket.get('Time')}", '%d-%m-%Y %I:%M:%S %p')
+    except (TypeError, ValueError):
+        try:
+            return datetime.strptime(str(ticket.get('Date')), '%d-%m-%Y')
+        except (TypeError, ValueError):
+            return None
+
+
+def to_seconds(moment):
+    # Naive local time -> seconds, so day buckets line up with local calendar days
+    return (moment - EPOCH).total_seconds()
@@ -0,0 +1,150 @@
+import csv
+import functools
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+
+# --- Agent Accounts (login + registration) ---
+# registered_users.csv stays the source of truth (Username,Password), but:
+#   * it is read ONCE into a dict (username -> password record) and only re-read when the file's
+#     size / mtime change (another server process registered someone) -> O(1) login lookups
+#   * registration appends one line instead of rewriting the whole file
+#   * passwords are stored as salted PBKDF2 hashes and checked with a constant-time compare.
+#     Old plain-text rows are hashed in place the first time the file is loaded.
+
+USER_FILE = 'registered_users.csv'
+HEADER = ['Username', 'Password']
+HASH_SCHEME = 'pbkdf2_sha256'
+HASH_ITERATIONS = 200_000  # Stored per record -> can be raised later without breaking old logins
+
+
+def hash_password(password, iterations=HASH_ITERATIONS, salt=None):
+    # 'pbkdf2_sha256$<iterations>$<salt hex>$<hash hex>'
+    salt = salt or secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    return f'{HASH_SCHEME}${iterations}${salt.hex()}${digest.hex()}'
+
+
+def check_password(password, record):
+    try:
+        scheme, iterations, salt, expected = record.split('$')
+        if scheme != HASH_SCHEME:
+            return False
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), bytes.fromhex(salt), int(iterations))
+    except (ValueError, AttributeError):
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def is_hashed(record):
+    return isinstance(record, str) and record.startswith(HASH_SCHEME + '$')
+
+
+# Checked when the username is unknown, so a miss costs as much as a wrong password
+# (response time doesn't tell which agent names exist). Made on the first miss, not at import
+# (one hash = ~0.1s on the login page's cold start).
+@functools.lru_cache(maxsize=1)
+def _dummy_record():
+    return hash_password(secrets.token_hex(8))
+
+
+class UserStore:
+    def __init__(self, path=USER_FILE):
+        self.path = path
+        self._users = {}
+        self._signature = None  # (size, mtime_ns) of the file the index was built from
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _refresh(self):
+        # Re-read only if the file changed since the index was built (call with the lock held)
+        signature = self._stat()
+        if signature is not None and signature == self._signature:
+            return
+        if signature is None:
+            # First run: create the file with just the header
+            with open(self.path, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(HEADER)
+            self._users, self._signature = {}, self._stat()
+            return
+
+        users, legacy = {}, False
+        with open(self.path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                username, record = row.get('Username'), row.get('Password')
+                if not username or username in users:
+                    continue  # First registration wins (two processes raced on the same name)
+                if not is_hashed(record):
+                    record, legacy = hash_password(record or ''), True
+                users[username] = record
+        self._users = users
+        if legacy:
+            self._rewrite()
+        self._signature = self._stat()
+
+    def _rewrite(self):
+        # One-off migration of plain-text passwords (temp file + atomic replace)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(HEADER)
+            writer.writerows(self._users.items())
+        os.replace(tmp_path, self.path)
+
+    def exists(self, username):
+        with self._lock:
+            self._refresh()
+            return username in self._users
+
+    def verify(self, username, password):
+        with self._lock:
+            self._refresh()
+            record = self._users.get(username)
+        # Hash check outside the lock: logins don't queue behind each other
+        matched = check_password(password, record or _dummy_record())
+        return matched and record is not None
+
+    def register(self, username, password):
+        # Append-only: one csv line, O(1) regardless of how many agents exist
+        record = hash_password(password)
+        with self._lock:
+            self._refresh()
+            if username in self._users:
+                return False
+            before = self._stat()
+            with open(self.path, 'a', newline='', encoding='utf-8') as f:
+                line_start = f.tell()
+                csv.writer(f).writerow([username, record])
+                line_end = f.tell()
+            self._users[username] = record
+            after = self._stat()
+            # Nobody else wrote in between -> the index is still exact, keep it without a re-read
+            if before == self._signature and after is not None and after[0] == before[0] + line_end - line_start:
+                self._signature = after
+            return True
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._users)
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_user_store(path=USER_FILE):
+    # One index per server process, shared by every session
+    global _default_store
+    with _default_lock:
+        if _default_store is None or os.path.abspath(_default_store.path) != os.path.abspath(path):
+            _default_store = UserStore(path)
+        return _default_store
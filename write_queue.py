@@ -0,0 +1,93 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from ticket_store import get_store
+
+# --- Single-Writer Queue (group commit for many agents writing at once) ---
+# Sessions enqueue ticket inserts and status changes instead of each opening its own write
+# transaction. One background writer drains the queue and commits everything waiting as ONE
+# transaction (every max_wait_ms or max_batch writes, whichever comes first) -> one fsync per group
+# instead of one per write, and no writers fighting over the SQLite write lock.
+# A caller's Future resolves only after its group has COMMITTED (durable acknowledgment).
+
+
+class WriteQueue:
+    def __init__(self, store, max_batch=256, max_wait_ms=5, durable=True):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.durable = durable
+        self.store = store
+        self._queue = queue.Queue()
+        self.batches_run = 0
+        self.items_served = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # --- Submitting ---
+    def submit_insert(self, ticket):
+        # Future -> the stored ticket (row_id + allocated Ticket_#)
+        future = Future()
+        self._queue.put((('insert', dict(ticket)), future))
+        return future
+
+    def submit_status(self, changes, changed_by=None):
+        # Future -> number of rows really changed
+        future = Future()
+        self._queue.put((('status', (dict(changes), changed_by)), future))
+        return future
+
+    def insert_ticket(self, ticket, timeout=30):
+        return self.submit_insert(ticket).result(timeout)
+
+    def update_status_groups(self, changes, changed_by=None, timeout=30):
+        return self.submit_status(changes, changed_by).result(timeout)
+
+    # --- Writer thread ---
+    def _run(self):
+        if self.durable:
+            # fsync on every commit of the writer's connection (= once per group): an acknowledged
+            # write survives a power loss, not just a crash of the process
+            self.store.set_synchronous('FULL')
+        while True:
+            batch = [self._queue.get()]  # Block until there is work
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+            self.batches_run += 1
+            self.items_served += len(batch)
+
+    def _commit(self, batch):
+        try:
+            results = self.store.write_batch([op for op, _ in batch])
+        except Exception as e:
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # The group rolled back as a whole -> commit one by one so a single bad write
+            # only fails its own caller
+            for item in batch:
+                self._commit([item])
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+_WRITE_QUEUE = None
+_WRITE_QUEUE_LOCK = threading.Lock()
+
+
+def get_write_queue(store=None):
+    # One writer per process, shared by every session (the pages call this)
+    global _WRITE_QUEUE
+    with _WRITE_QUEUE_LOCK:
+        if _WRITE_QUEUE is None:
+            _WRITE_QUEUE = WriteQueue(store or get_store())
+        return _WRITE_QUEUE